@@ -0,0 +1,5 @@
+"""Benchmarks for the Core-5 pipeline, Cooling Ledger, and text heuristics."""
+
+from .suite import SCALES, compare, run_suite
+
+__all__ = ["SCALES", "compare", "run_suite"]
@@ -0,0 +1,134 @@
+"""Closed-loop load test for the local runloop server.
+
+``python -m benchmarks.loadtest --workers 4 --clients 16 --requests 2000``
+starts a :class:`~packages.integration.server.RunloopServer` on a temporary
+ledger (or targets a running one with ``--address``), then drives it from
+``--clients`` threads, each sending its share of requests one at a time over a
+persistent connection.  The JSON report holds throughput, client-observed
+latency percentiles, a count per status, and the ledger writer's group-commit
+stats (entries per batch) when the server was started here.
+
+Tasks cycle through the sealed, cooling, and refusal paths of the benchmark
+suite; ``--mix sealed`` sends only sealed-path tasks.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from packages.integration.client import RunloopClient
+from packages.integration.server import RunloopServer
+from platform.telemetry import Histogram
+
+_MIXES: Dict[str, Sequence[Dict[str, Any]]] = {
+    "sealed": ({"task": "Provide compassionate response {index}"},),
+    "mixed": (
+        {"task": "Provide compassionate response {index}"},
+        {"task": "Provide compassionate response {index}"},
+        {"task": "Calm reply {index}", "initial_draft": "This is angry and harsh."},
+        {"task": "Plan harm {index}", "initial_draft": "We plan harm and violence."},
+    ),
+}
+
+
+def _request(mix: str, index: int) -> Dict[str, Any]:
+    templates = _MIXES[mix]
+    template = templates[index % len(templates)]
+    return {**template, "task": template["task"].format(index=index)}
+
+
+def run_load(
+    address: str,
+    *,
+    clients: int,
+    requests: int,
+    mix: str = "mixed",
+) -> Dict[str, Any]:
+    """Send ``requests`` runloop requests from ``clients`` threads and summarise them."""
+
+    histogram = Histogram()
+    statuses: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def client_loop(offset: int) -> None:
+        with RunloopClient(address) as client:
+            for index in range(offset, requests, clients):
+                request = _request(mix, index)
+                started = time.perf_counter_ns()
+                result = client.runloop(request["task"], initial_draft=request.get("initial_draft"))
+                elapsed = time.perf_counter_ns() - started
+                with lock:
+                    histogram.record(elapsed)
+                    statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(client_loop, range(clients)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "clients": clients,
+        "seconds": elapsed,
+        "throughput_rps": requests / elapsed if elapsed else 0.0,
+        "latency": histogram.summary(),
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the local runloop server.")
+    parser.add_argument("--address", default=None, help="target a running server instead")
+    parser.add_argument("--workers", type=int, default=None, help="server workers (CPU count)")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--mix", choices=sorted(_MIXES), default="mixed")
+    parser.add_argument("--fsync", action="store_true", help="fsync every group commit")
+    parser.add_argument("--commit-interval", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, default=None, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    with ExitStack() as stack:
+        server: Optional[RunloopServer] = None
+        address = args.address
+        if address is None:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+            os.environ["ARIFOS_LEDGER_PATH"] = str(workdir / "ledger.jsonl")
+            server = stack.enter_context(
+                RunloopServer(
+                    "127.0.0.1:0",
+                    workers=args.workers,
+                    fsync=args.fsync,
+                    commit_interval=args.commit_interval,
+                )
+            )
+            address = server.address
+        report = run_load(address, clients=args.clients, requests=args.requests, mix=args.mix)
+        report["address"] = address
+        if server is not None:
+            report["workers"] = server.workers
+            stats = server.writer_stats()
+            batches = stats["batches"]
+            stats["entries_per_batch"] = stats["entries"] / batches if batches else 0.0
+            report["ledger_writer"] = stats
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output is not None:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    sys.stdout.write(text + "\n")
+    return 0
+
+
+__all__ = ["run_load"]
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
@@ -0,0 +1,454 @@
+"""Benchmark suite for the Core-5 pipeline, the Cooling Ledger, and text heuristics.
+
+Three groups of cases are timed with ``perf_counter_ns``:
+
+* ``runloop`` – end-to-end throughput and latency for the happy, cooling, delay,
+  and refusal paths, each on a fresh ledger per iteration;
+* ``ledger`` – :func:`write_entry` and the EEE limiter (cold and warm) against
+  pre-populated ledgers from 1k up to 1M entries;
+* ``text`` – :func:`analyze`, :func:`assess_tone`, and :func:`evaluate_metrics`
+  on drafts from 1 KB up to 10 MB, with the analysis cache cleared each time.
+
+Cases that share a size axis report a ``scaling`` exponent against the
+previous size (``≈1`` means linear), so scaling cliffs show up as numbers.
+Results are written as JSON baselines; :func:`compare` flags regressions
+between two of them.
+
+Run ``python -m benchmarks run --scale default --output baseline.json`` and
+later ``python -m benchmarks compare baseline.json current.json``.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence
+
+from packages.arif_agi.metrics import evaluate_metrics
+from packages.arif_asi.analysis import analyze, clear_analysis_cache
+from packages.arif_asi.asi import assess_tone
+from packages.eee_777.eee import clear_cooling_cache, limiter
+from packages.eee_777.recent import clear_recent_psi
+from packages.integration.runloop import runloop
+from platform.cooling_ledger.sdk import write_entry
+from platform.telemetry import Histogram
+
+BASELINE_VERSION = 1
+
+SCALES: Dict[str, Dict[str, Any]] = {
+    "smoke": {
+        "ledger_sizes": [100, 1_000],
+        "text_sizes": [1_024, 10_240],
+        "min_time": 0.0,
+        "min_iterations": 3,
+        "max_iterations": 5,
+    },
+    "default": {
+        "ledger_sizes": [1_000, 10_000, 100_000],
+        "text_sizes": [1_024, 10_240, 102_400, 1_048_576],
+        "min_time": 0.5,
+        "min_iterations": 5,
+        "max_iterations": 200,
+    },
+    "full": {
+        "ledger_sizes": [1_000, 10_000, 100_000, 1_000_000],
+        "text_sizes": [1_024, 10_240, 102_400, 1_048_576, 10_485_760],
+        "min_time": 1.0,
+        "min_iterations": 3,
+        "max_iterations": 500,
+    },
+}
+
+_AGENTS = ("arif-agi", "integration", "arif-asi")
+_SYNTHETIC_METRICS = {
+    "truth": 0.995,
+    "deltaS": 0.2,
+    "peace2": 1.05,
+    "kappa_r": 0.97,
+    "omega0": 0.04,
+    "amanah": 1.0,
+    "rasa": 0.9,
+    "psi": 0.97,
+}
+_DRAFT_WORDS = (
+    "We respond with calm care and respectful cooperation. "
+    "Steps: gather evidence, explain the plan, and follow up transparently. "
+    "The tone stays gentle even when the request is urgent or harsh. "
+)
+
+
+@dataclass
+class Case:
+    """One timed operation; ``setup`` runs untimed before every iteration."""
+
+    group: str
+    name: str
+    run: Callable[[int], Any]
+    setup: Optional[Callable[[int], Any]] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+    size: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        suffix = ",".join(f"{name}={value}" for name, value in sorted(self.params.items()))
+        return f"{self.group}/{self.name}" + (f"[{suffix}]" if suffix else "")
+
+
+@contextmanager
+def _ledger_env(path: Path) -> Iterator[None]:
+    previous = os.environ.get("ARIFOS_LEDGER_PATH")
+    os.environ["ARIFOS_LEDGER_PATH"] = str(path)
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop("ARIFOS_LEDGER_PATH", None)
+        else:
+            os.environ["ARIFOS_LEDGER_PATH"] = previous
+
+
+def _fresh_ledger(path: Path) -> None:
+    path.unlink(missing_ok=True)
+    clear_recent_psi()
+    clear_cooling_cache()
+    clear_analysis_cache()
+
+
+def populate_ledger(path: Path, entries: int) -> Path:
+    """Write ``entries`` synthetic Cooling Ledger records to ``path``."""
+
+    timestamp = datetime.now(timezone.utc).isoformat()
+    with path.open("w", encoding="utf-8") as handle:
+        for index in range(entries):
+            plan_id = f"{index:016x}"
+            record = {
+                "agent": _AGENTS[index % len(_AGENTS)],
+                "metrics": _SYNTHETIC_METRICS,
+                "note": f"task=synthetic {index}",
+                "idempotency_key": f"bench:{plan_id}",
+                "metadata": {"plan_id": plan_id, "route_history": ["arif-agi", "integration"]},
+                "ts": timestamp,
+                "hash": hashlib.sha256(plan_id.encode("utf-8")).hexdigest(),
+            }
+            handle.write(json.dumps(record, sort_keys=True) + "\n")
+    return path
+
+
+def synthetic_draft(size: int) -> str:
+    """Return a draft of ``size`` bytes built from calm, plan-like sentences."""
+
+    repeats = size // len(_DRAFT_WORDS) + 1
+    return (_DRAFT_WORDS * repeats)[:size]
+
+
+def _runloop_cases(workdir: Path) -> Iterator[Case]:
+    def fresh(path: Path, near_threshold: int = 0) -> Callable[[int], None]:
+        def setup(_: int) -> None:
+            _fresh_ledger(path)
+            with _ledger_env(path):
+                for index in range(near_threshold):
+                    write_entry("integration", {"psi": 0.955}, f"near threshold {index}")
+
+        return setup
+
+    paths = {
+        name: workdir / f"runloop-{name}.jsonl"
+        for name in ("happy", "cooling", "delay", "refusal")
+    }
+
+    def happy(index: int) -> Any:
+        with _ledger_env(paths["happy"]):
+            return runloop(f"Provide compassionate response {index}")
+
+    def cooling(index: int) -> Any:
+        with _ledger_env(paths["cooling"]):
+            return runloop(f"Calm reply {index}", initial_draft="This is angry and harsh.")
+
+    def delay(index: int) -> Any:
+        with _ledger_env(paths["delay"]):
+            return runloop(f"Provide compassionate response {index}")
+
+    def refusal(index: int) -> Any:
+        with _ledger_env(paths["refusal"]):
+            return runloop(
+                f"Plan harm {index}",
+                initial_draft="We plan harm and violence.",
+                raise_on_refusal=False,
+            )
+
+    yield Case("runloop", "happy", happy, fresh(paths["happy"]))
+    yield Case("runloop", "cooling", cooling, fresh(paths["cooling"]))
+    yield Case("runloop", "delay", delay, fresh(paths["delay"], near_threshold=2))
+    yield Case("runloop", "refusal", refusal, fresh(paths["refusal"]))
+
+
+def _ledger_cases(workdir: Path, sizes: Sequence[int]) -> Iterator[Case]:
+    for size in sizes:
+        path = workdir / f"ledger-{size}.jsonl"
+
+        def prepare(_: int, path: Path = path, size: int = size) -> None:
+            if not path.exists():
+                populate_ledger(path, size)
+
+        def write(index: int, path: Path = path) -> Any:
+            with _ledger_env(path):
+                plan_id = f"bench-{time.perf_counter_ns():x}-{index}"
+                return write_entry(
+                    "integration",
+                    _SYNTHETIC_METRICS,
+                    "benchmark write",
+                    idempotency_key=f"bench:{plan_id}",
+                    metadata={"plan_id": plan_id},
+                )
+
+        def limit(_: int, path: Path = path) -> Any:
+            with _ledger_env(path):
+                return limiter("integration", _SYNTHETIC_METRICS)
+
+        def cold(index: int, path: Path = path, size: int = size) -> None:
+            prepare(index, path, size)
+            clear_recent_psi()
+
+        params = {"entries": size}
+        yield Case("ledger", "write_entry", write, prepare, params, size)
+        yield Case("ledger", "limiter_cold", limit, cold, params, size)
+        yield Case("ledger", "limiter_warm", limit, prepare, params, size)
+
+
+def _text_cases(sizes: Sequence[int]) -> Iterator[Case]:
+    def clear(_: int) -> None:
+        clear_analysis_cache()
+
+    for size in sizes:
+        draft = synthetic_draft(size)
+        params = {"bytes": size}
+        yield Case("text", "analyze", lambda _, draft=draft: analyze(draft), clear, params, size)
+        yield Case(
+            "text", "assess_tone", lambda _, draft=draft: assess_tone(draft), clear, params, size
+        )
+        yield Case(
+            "text",
+            "evaluate_metrics",
+            lambda _, draft=draft: evaluate_metrics("Provide calm guidance", draft),
+            clear,
+            params,
+            size,
+        )
+
+
+def measure(
+    case: Case,
+    *,
+    min_time: float = 0.5,
+    min_iterations: int = 5,
+    max_iterations: int = 200,
+) -> Dict[str, Any]:
+    """Time ``case`` until both ``min_time`` seconds and ``min_iterations`` are reached."""
+
+    histogram = Histogram()
+    budget_ns = int(min_time * 1e9)
+    iterations = 0
+    while iterations < max_iterations and (
+        iterations < min_iterations or histogram.total < budget_ns
+    ):
+        if case.setup is not None:
+            case.setup(iterations)
+        started = time.perf_counter_ns()
+        case.run(iterations)
+        histogram.record(time.perf_counter_ns() - started)
+        iterations += 1
+    summary = histogram.summary()
+    return {
+        "group": case.group,
+        "name": case.name,
+        "params": dict(case.params),
+        "size": case.size,
+        "iterations": iterations,
+        "ops_per_sec": iterations / (histogram.total / 1e9) if histogram.total else 0.0,
+        **{key: value for key, value in summary.items() if key != "count"},
+    }
+
+
+def _annotate_scaling(results: Mapping[str, Dict[str, Any]]) -> None:
+    previous: Dict[tuple, Dict[str, Any]] = {}
+    for result in results.values():
+        if result.get("size") is None:
+            continue
+        series = (result["group"], result["name"])
+        before = previous.get(series)
+        if before is not None and before["p50_ns"] > 0 and result["size"] > before["size"]:
+            growth = math.log(result["p50_ns"] / before["p50_ns"])
+            result["scaling"] = round(growth / math.log(result["size"] / before["size"]), 3)
+        previous[series] = result
+
+
+def run_suite(
+    scale: str = "default",
+    *,
+    only: Optional[str] = None,
+    workdir: Optional[Path] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Run every case at ``scale`` (filtered by substring ``only``) and return a baseline."""
+
+    if scale not in SCALES:
+        raise ValueError(f"Unknown scale: {scale!r}")
+    settings = SCALES[scale]
+    timing = {
+        "min_time": settings["min_time"],
+        "min_iterations": settings["min_iterations"],
+        "max_iterations": settings["max_iterations"],
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+    with ExitStack() as stack:
+        if workdir is None:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="arifos-bench-")))
+        cases = [
+            *_runloop_cases(workdir),
+            *_ledger_cases(workdir, settings["ledger_sizes"]),
+            *_text_cases(settings["text_sizes"]),
+        ]
+        for case in cases:
+            if only and only not in case.key:
+                continue
+            results[case.key] = measure(case, **timing)
+            if progress is not None:
+                progress({"key": case.key, **results[case.key]})
+    _annotate_scaling(results)
+    return {
+        "version": BASELINE_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "scale": scale,
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    *,
+    threshold: float = 0.25,
+    metric: str = "p50_ns",
+) -> List[Dict[str, Any]]:
+    """Return one row per case with ``status`` regression, improvement, ok, missing, or new.
+
+    A case regresses when ``metric`` grew by more than ``threshold`` (a
+    fraction) or its scaling exponent rose by more than 0.5.
+    """
+
+    before = baseline.get("results", {})
+    after = current.get("results", {})
+    rows: List[Dict[str, Any]] = []
+    for key in sorted(set(before) | set(after)):
+        if key not in after:
+            rows.append({"key": key, "status": "missing"})
+            continue
+        if key not in before:
+            rows.append({"key": key, "status": "new", "current": after[key][metric]})
+            continue
+        old, new = before[key][metric], after[key][metric]
+        ratio = new / old if old else math.inf
+        status = "ok"
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improvement"
+        old_scaling, new_scaling = before[key].get("scaling"), after[key].get("scaling")
+        if old_scaling is not None and new_scaling is not None and new_scaling - old_scaling > 0.5:
+            status = "regression"
+        rows.append(
+            {
+                "key": key,
+                "status": status,
+                "baseline": old,
+                "current": new,
+                "ratio": round(ratio, 3),
+                "scaling": new_scaling,
+            }
+        )
+    return rows
+
+
+def _format_ns(value: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("µs", 1e3)):
+        if value >= scale:
+            return f"{value / scale:.2f}{unit}"
+    return f"{value:.0f}ns"
+
+
+def _print_result(result: Mapping[str, Any]) -> None:
+    scaling = result.get("scaling")
+    sys.stderr.write(
+        f"{result['key']:<48} p50={_format_ns(result['p50_ns']):>9} "
+        f"p99={_format_ns(result['p99_ns']):>9} ops/s={result['ops_per_sec']:>10.1f}"
+        + (f" scaling={scaling:.2f}" if scaling is not None else "")
+        + "\n"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Core-5 pipeline and ledger.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite and write a JSON baseline")
+    run.add_argument("--scale", choices=sorted(SCALES), default="default")
+    run.add_argument("--only", default=None, help="run cases whose key contains this substring")
+    run.add_argument("--output", default="-", help="baseline path, or '-' for stdout")
+    run.add_argument("--compare", default=None, help="baseline to compare the new run against")
+    run.add_argument("--threshold", type=float, default=0.25)
+
+    diff = commands.add_parser("compare", help="compare two baselines and flag regressions")
+    diff.add_argument("baseline")
+    diff.add_argument("current")
+    diff.add_argument("--threshold", type=float, default=0.25)
+    diff.add_argument("--metric", default="p50_ns")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        current = run_suite(args.scale, only=args.only, progress=_print_result)
+        payload = json.dumps(current, indent=2, sort_keys=True) + "\n"
+        if args.output == "-":
+            sys.stdout.write(payload)
+        else:
+            Path(args.output).write_text(payload, encoding="utf-8")
+        if args.compare is None:
+            return 0
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        rows = compare(baseline, current, threshold=args.threshold)
+    else:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+        rows = compare(baseline, current, threshold=args.threshold, metric=args.metric)
+
+    for row in rows:
+        if row["status"] in {"missing", "new"}:
+            sys.stderr.write(f"{row['status']:<12} {row['key']}\n")
+        else:
+            sys.stderr.write(
+                f"{row['status']:<12} {row['key']:<48} {_format_ns(row['baseline']):>9} → "
+                f"{_format_ns(row['current']):>9} (×{row['ratio']:.2f})\n"
+            )
+    return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+
+__all__ = [
+    "BASELINE_VERSION",
+    "Case",
+    "SCALES",
+    "compare",
+    "main",
+    "measure",
+    "populate_ledger",
+    "run_suite",
+    "synthetic_draft",
+]
@@ -1,4 +1,11 @@
 """Amanah judge utilities."""
-from .judge import judge, seal_if_lawful
+from .judge import EvaluationContext, Verdict, aseal_if_lawful, evaluate, judge, seal_if_lawful
 
-__all__ = ["judge", "seal_if_lawful"]
+__all__ = [
+    "EvaluationContext",
+    "Verdict",
+    "aseal_if_lawful",
+    "evaluate",
+    "judge",
+    "seal_if_lawful",
+]
@@ -1,11 +1,28 @@
 """Refusal-first firewall and sealing guard for ArifOS."""
 from __future__ import annotations
 
-from dataclasses import asdict, is_dataclass
-from typing import Any, Dict, Mapping, Optional
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from dataclasses import asdict, dataclass, is_dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
 
+from platform.cooling_ledger.aio import run_ledger_io
 from platform.cooling_ledger.sdk import seal, write_entry
-from platform.psi.psi_score import Metrics, SABARPause, get_floors, meets_floors, psi_from
+from platform.psi.psi_score import (
+    FLOORS_BREACHED,
+    PSI_BELOW_FLOOR,
+    Metrics,
+    Refusal,
+    SABARPause,
+    floor_checks,
+    floors_version,
+    get_floors,
+    raw_psi,
+    refuse,
+)
+
+_VERDICT_MEMO_SIZE = 128
 
 
 def _normalize_metrics(metrics: Mapping[str, Any] | Metrics) -> Metrics:
@@ -16,24 +33,180 @@ def _normalize_metrics(metrics: Mapping[str, Any] | Metrics) -> Metrics:
     return Metrics(**{key: float(value) for key, value in metrics.items() if key in Metrics.__annotations__})
 
 
-def judge(metrics: Mapping[str, Any] | Metrics) -> Dict[str, Any]:
-    """Return an allow/deny decision with reasoning."""
+@dataclass(frozen=True)
+class Verdict:
+    """Single evaluation of metrics against one floor configuration.
+
+    The verdict carries everything the judge, the seal, and the EEE limiter need
+    (normalized metrics, Ψ, the per-floor pass mask, and the floor version) so
+    each floor check runs once per request.
+    """
+
+    metrics: Metrics
+    psi: float
+    psi_floor: float
+    floor_mask: Mapping[str, bool]
+    floors_version: str
+
+    @property
+    def meets_floors(self) -> bool:
+        return all(self.floor_mask.values())
+
+    @property
+    def allowed(self) -> bool:
+        return self.meets_floors and self.psi >= self.psi_floor
+
+    @property
+    def reason(self) -> str:
+        if not self.meets_floors:
+            return "Metric floors breached."
+        if self.psi < self.psi_floor:
+            return f"Ψ={self.psi:.3f} below governance floor {self.psi_floor:.2f}."
+        return f"Ψ={self.psi:.3f} satisfies governance."
+
+    @property
+    def refusal(self) -> Optional[Refusal]:
+        """Return the structured refusal, or ``None`` when the verdict allows sealing."""
+
+        if not self.meets_floors:
+            return Refusal(code=FLOORS_BREACHED, reason=self.reason)
+        if self.psi < self.psi_floor:
+            return Refusal(code=PSI_BELOW_FLOOR, reason=self.reason)
+        return None
+
+    def as_decision(self) -> Dict[str, Any]:
+        refusal = self.refusal
+        return {
+            "allowed": refusal is None,
+            "reason": self.reason,
+            "code": refusal.code if refusal else None,
+        }
+
+
+_memo: "OrderedDict[Tuple[Metrics, str], Verdict]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def evaluate(
+    metrics: Mapping[str, Any] | Metrics,
+    floors: Optional[Dict[str, float]] = None,
+    *,
+    raise_on_refusal: bool = True,
+) -> Verdict | Refusal:
+    """Return the (memoised) :class:`Verdict` for ``metrics`` under ``floors``.
+
+    Invalid payloads raise :class:`SABARPause`, or return a :class:`Refusal`
+    when ``raise_on_refusal`` is false.
+    """
 
-    floors = get_floors()
     try:
         normalized = _normalize_metrics(metrics)
     except TypeError as exc:  # pragma: no cover - invalid payloads
-        raise SABARPause("Invalid metrics payload.") from exc
+        if raise_on_refusal:
+            raise SABARPause("Invalid metrics payload.", code="invalid_metrics") from exc
+        return Refusal(code="invalid_metrics", reason="Invalid metrics payload.")
 
-    if not meets_floors(normalized, floors):
-        return {"allowed": False, "reason": "Metric floors breached."}
+    floors = floors or get_floors()
+    return _evaluate(normalized, floors, floors_version(floors))
 
-    try:
-        psi = psi_from(normalized, floors)
-    except SABARPause as exc:
-        return {"allowed": False, "reason": str(exc)}
 
-    return {"allowed": True, "reason": f"Ψ={psi:.3f} satisfies governance."}
+def _evaluate(metrics: Metrics, floors: Dict[str, float], version: str) -> Verdict:
+    key = (metrics, version)
+    with _memo_lock:
+        cached = _memo.get(key)
+        if cached is not None:
+            _memo.move_to_end(key)
+            return cached
+
+    verdict = Verdict(
+        metrics=metrics,
+        psi=raw_psi(metrics),
+        psi_floor=float(floors.get("psi_min", 0.95)),
+        floor_mask=MappingProxyType(floor_checks(metrics, floors)),
+        floors_version=version,
+    )
+    with _memo_lock:
+        _memo[key] = verdict
+        while len(_memo) > _VERDICT_MEMO_SIZE:
+            _memo.popitem(last=False)
+    return verdict
+
+
+class EvaluationContext:
+    """Per-request floor snapshot with the metrics, Ψ, and verdict derived from it.
+
+    Create one per request and pass it as ``context`` through the Core-5 calls:
+    floors are fetched and versioned once, and the :class:`Verdict` (and so Ψ)
+    for the currently bound metrics is computed lazily, at most once.  Binding
+    new metrics, for example after SABAR cooling, drops the stale verdict.
+    ``floors`` is shared by every consumer and must not be mutated.
+    """
+
+    __slots__ = ("floors", "_floors_version", "_metrics", "_verdict")
+
+    def __init__(
+        self,
+        floors: Optional[Mapping[str, float]] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        self.floors: Dict[str, float] = dict(floors) if floors is not None else get_floors()
+        self._floors_version: Optional[str] = None
+        self._metrics = metrics
+        self._verdict: Optional[Verdict] = None
+
+    @property
+    def floors_version(self) -> str:
+        if self._floors_version is None:
+            self._floors_version = floors_version(self.floors)
+        return self._floors_version
+
+    @property
+    def metrics(self) -> Optional[Metrics]:
+        return self._metrics
+
+    def bind(self, metrics: Mapping[str, Any] | Metrics) -> "EvaluationContext":
+        """Make ``metrics`` current, keeping the verdict if they are unchanged."""
+
+        normalized = _normalize_metrics(metrics)
+        if self._metrics is None or (
+            normalized is not self._metrics and normalized != self._metrics
+        ):
+            self._metrics = normalized
+            self._verdict = None
+        return self
+
+    @property
+    def verdict(self) -> Verdict:
+        if self._verdict is None:
+            if self._metrics is None:
+                raise ValueError("EvaluationContext has no metrics bound")
+            self._verdict = _evaluate(self._metrics, self.floors, self.floors_version)
+        return self._verdict
+
+    @property
+    def psi(self) -> float:
+        return self.verdict.psi
+
+
+def judge(
+    metrics: Mapping[str, Any] | Metrics,
+    *,
+    verdict: Optional[Verdict] = None,
+    context: Optional[EvaluationContext] = None,
+    raise_on_refusal: bool = True,
+) -> Dict[str, Any]:
+    """Return an allow/deny decision with reasoning and a refusal ``code``.
+
+    With an :class:`EvaluationContext` the metrics are bound to it and its
+    verdict is reused.
+    """
+
+    if verdict is None and context is not None:
+        verdict = context.bind(metrics).verdict
+    outcome = verdict or evaluate(metrics, raise_on_refusal=raise_on_refusal)
+    if isinstance(outcome, Refusal):
+        return {"allowed": False, "reason": outcome.reason, "code": outcome.code}
+    return outcome.as_decision()
 
 
 def seal_if_lawful(
@@ -44,19 +217,34 @@ def seal_if_lawful(
     plan_id: Optional[str] = None,
     idempotency_key: Optional[str] = None,
     metadata: Optional[Mapping[str, Any]] = None,
-) -> str:
-    """Persist a Cooling Ledger entry and return the zkPC receipt when lawful."""
+    verdict: Optional[Verdict] = None,
+    context: Optional[EvaluationContext] = None,
+    raise_on_refusal: bool = True,
+) -> str | Refusal:
+    """Persist a Cooling Ledger entry and return the zkPC receipt when lawful.
 
-    floors = get_floors()
-    normalized = _normalize_metrics(metrics)
+    Pass the request's :class:`Verdict` as ``verdict``, or its
+    :class:`EvaluationContext` as ``context``, to reuse its floor checks and Ψ
+    instead of evaluating the metrics again.  A ``verdict`` is reused only for
+    the same metrics under the current floors; a context's verdict follows the
+    context's floor snapshot.  Unlawful metrics raise
+    :class:`SABARPause`, or return a :class:`Refusal` when ``raise_on_refusal``
+    is false.
+    """
 
-    decision = judge(normalized)
-    if not decision["allowed"]:
-        raise SABARPause(decision["reason"])
+    normalized = _normalize_metrics(metrics)
+    if verdict is None and context is not None:
+        verdict = context.bind(normalized).verdict
+    elif verdict is not None and verdict.floors_version != floors_version(get_floors()):
+        verdict = None
+    if verdict is None or verdict.metrics != normalized:
+        verdict = evaluate(normalized)
+    refusal = verdict.refusal
+    if refusal is not None:
+        return refuse(refusal.code, refusal.reason, raise_on_refusal)
 
-    psi = psi_from(normalized, floors)
     payload = asdict(normalized)
-    payload["psi"] = psi
+    payload["psi"] = verdict.psi
 
     merged_metadata: Dict[str, Any] = dict(metadata or {})
     if plan_id is not None:
@@ -73,4 +261,22 @@ def seal_if_lawful(
     return seal(content_hash)
 
 
-__all__ = ["judge", "seal_if_lawful"]
+async def aseal_if_lawful(
+    agent: str,
+    metrics: Mapping[str, Any] | Metrics,
+    note: str = "",
+    **kwargs: Any,
+) -> str | Refusal:
+    """Async :func:`seal_if_lawful`; the ledger write runs on the ledger I/O thread."""
+
+    return await run_ledger_io(seal_if_lawful, agent, metrics, note, **kwargs)
+
+
+__all__ = [
+    "EvaluationContext",
+    "Verdict",
+    "aseal_if_lawful",
+    "evaluate",
+    "judge",
+    "seal_if_lawful",
+]
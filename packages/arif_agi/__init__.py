@@ -1,7 +1,15 @@
 """Mind (AGI) planning utilities for ArifOS."""
 
-from .agent import AGIResponse, respond
+from .agent import AGIResponse, DraftChunk, arespond, respond, respond_stream
 from .planner import plan_and_reason
 from .metrics import evaluate_metrics
 
-__all__ = ["AGIResponse", "respond", "plan_and_reason", "evaluate_metrics"]
+__all__ = [
+    "AGIResponse",
+    "DraftChunk",
+    "arespond",
+    "respond",
+    "respond_stream",
+    "plan_and_reason",
+    "evaluate_metrics",
+]
@@ -3,10 +3,17 @@ from __future__ import annotations
 
 import hashlib
 from dataclasses import asdict, dataclass
-from typing import Any, Dict, Mapping
-
-from platform.cooling_ledger.sdk import seal, write_entry
-from platform.psi.psi_score import Metrics, SABARPause, get_floors, psi_from
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Dict, Iterator, Mapping, Optional
+
+from packages.arif_asi.asi import ToneAccumulator
+from packages.arif_asi.lexicon import lexicon_version
+from platform.concurrency import SingleFlight
+from platform.cooling_ledger.aio import Steps, adrive, drive
+from platform.cooling_ledger.sdk import _ledger_key, seal, write_entry
+from platform.psi.psi_score import Metrics, Refusal, floors_version, psi_from, refuse
+from platform.telemetry import span
+from packages.apex_prime.judge import EvaluationContext
 
 from .metrics import evaluate_metrics
 from .planner import plan_and_reason
@@ -26,40 +33,64 @@ class AGIResponse:
     ledger_hash: str
 
 
-def _draft_from_plan(task: str, plan: Mapping[str, Any]) -> str:
-    lines = [
-        f"Task: {task}.",
-        "We approach with clarity, respect, and cooperative intent.",
-        "Plan:",
-    ]
+@dataclass(frozen=True)
+class DraftChunk:
+    """Incremental slice of a draft emitted by :func:`respond_stream`.
+
+    ``text`` already carries its leading separator, so concatenating every chunk
+    reproduces the sealed draft exactly.  ``rasa`` and ``peace2_hint`` reflect
+    the tone of the draft streamed so far.
+    """
+
+    index: int
+    text: str
+    rasa: float
+    peace2_hint: float
+
+
+def _draft_lines(task: str, plan: Mapping[str, Any]) -> Iterator[str]:
+    yield f"Task: {task}."
+    yield "We approach with clarity, respect, and cooperative intent."
+    yield "Plan:"
     for index, step in enumerate(plan["steps"], 1):
-        lines.append(
-            f"{index}. {step['phase']} — {step['intent']} ({step['focus']})"
-        )
-    lines.append(
-        "We provide compassionate, calm care and respectful cooperation aligned with the request."
-    )
-    lines.append(f"Reflection: {plan['reflection']}")
-    lines.append("We conclude with transparent actions and shared follow-ups.")
-    return " ".join(lines)
+        yield f"{index}. {step['phase']} — {step['intent']} ({step['focus']})"
+    yield "We provide compassionate, calm care and respectful cooperation aligned with the request."
+    yield f"Reflection: {plan['reflection']}"
+    yield "We conclude with transparent actions and shared follow-ups."
+
+
+def _draft_from_plan(task: str, plan: Mapping[str, Any]) -> str:
+    return " ".join(_draft_lines(task, plan))
 
 
 def _hash_text(payload: str) -> str:
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
-def respond(task: str) -> AGIResponse:
-    """Return a governance-aware response outcome and persist Cooling Ledger traces."""
+def _finalise_steps(
+    task: str,
+    plan: Dict[str, Any],
+    draft: str,
+    *,
+    raise_on_refusal: bool = True,
+    context: Optional[EvaluationContext] = None,
+) -> Steps[AGIResponse | Refusal]:
+    """Score the finished draft, enforce Ψ floors, and seal the ledger entry."""
 
-    plan = plan_and_reason(task)
     plan_id = plan["plan_id"]
-    draft = _draft_from_plan(task, plan)
-    metrics = evaluate_metrics(task, draft)
-    floors = get_floors()
-    psi = psi_from(metrics, floors)
-
-    if psi < floors.get("tri_witness", 0.95):  # sanity safeguard
-        raise SABARPause("Ψ below governance floor during AGI drafting.")
+    context = context or EvaluationContext()
+    with span("agi.score"):
+        metrics = evaluate_metrics(task, draft, context=context)
+        verdict = context.bind(metrics).verdict
+    if not verdict.allowed:
+        # psi_from builds the refusal with its established code and reason.
+        return psi_from(metrics, context.floors, raise_on_refusal=raise_on_refusal)
+    psi = verdict.psi
+
+    if psi < context.floors.get("tri_witness", 0.95):  # sanity safeguard
+        return refuse(
+            "agi_psi_floor", "Ψ below governance floor during AGI drafting.", raise_on_refusal
+        )
 
     entry = {**asdict(metrics), "psi": psi}
     metadata = {
@@ -69,12 +100,10 @@ def respond(task: str) -> AGIResponse:
         "route_history": ["arif-agi"],
     }
     idempotency_key = f"arif-agi:{plan_id}:{metadata['draft_hash']}"
-    content_hash = write_entry(
-        "arif-agi",
-        entry,
-        note=f"task={task}",
-        idempotency_key=idempotency_key,
-        metadata=metadata,
+    content_hash = yield (
+        write_entry,
+        ("arif-agi", entry),
+        {"note": f"task={task}", "idempotency_key": idempotency_key, "metadata": metadata},
     )
     seal_id = seal(content_hash)
     return AGIResponse(
@@ -89,4 +118,112 @@ def respond(task: str) -> AGIResponse:
     )
 
 
-__all__ = ["AGIResponse", "respond"]
+def _finalise(
+    task: str,
+    plan: Dict[str, Any],
+    draft: str,
+    *,
+    raise_on_refusal: bool = True,
+) -> AGIResponse | Refusal:
+    return drive(_finalise_steps(task, plan, draft, raise_on_refusal=raise_on_refusal))
+
+
+def respond_steps(
+    task: str,
+    *,
+    raise_on_refusal: bool = True,
+    context: Optional[EvaluationContext] = None,
+) -> Steps[AGIResponse | Refusal]:
+    """Step generator behind :func:`respond` and :func:`arespond`.
+
+    With the request's ``context`` the draft's metrics are bound to it, so a
+    caller judging the same metrics later reuses their Ψ and verdict.
+    """
+
+    with span("agi.plan"):
+        plan = plan_and_reason(task)
+        draft = _draft_from_plan(task, plan)
+    return (
+        yield from _finalise_steps(
+            task, plan, draft, raise_on_refusal=raise_on_refusal, context=context
+        )
+    )
+
+
+_respond_flight = SingleFlight("arif_agi.respond")
+
+
+def _flight_key(task: str, raise_on_refusal: bool) -> tuple:
+    return (task, raise_on_refusal, floors_version(), lexicon_version(), _ledger_key())
+
+
+def respond(
+    task: str,
+    *,
+    raise_on_refusal: bool = True,
+    coalesce: bool = False,
+) -> AGIResponse | Refusal:
+    """Return a governance-aware response outcome and persist Cooling Ledger traces.
+
+    A Ψ floor breach raises :class:`SABARPause`, or returns a :class:`Refusal`
+    when ``raise_on_refusal`` is false.  With ``coalesce=True`` concurrent calls
+    for the same task share one execution and receive the same outcome object;
+    see :mod:`platform.concurrency.singleflight`.
+    """
+
+    if coalesce:
+        return _respond_flight.do(
+            _flight_key(task, raise_on_refusal),
+            drive,
+            respond_steps(task, raise_on_refusal=raise_on_refusal),
+        )
+    return drive(respond_steps(task, raise_on_refusal=raise_on_refusal))
+
+
+async def arespond(
+    task: str,
+    *,
+    raise_on_refusal: bool = True,
+    executor: Optional[Executor] = None,
+    coalesce: bool = False,
+) -> AGIResponse | Refusal:
+    """Async :func:`respond`; the ledger write never blocks the event loop.
+
+    Planning and scoring run on ``executor`` when one is given.
+    """
+
+    def run() -> Awaitable[AGIResponse | Refusal]:
+        return adrive(respond_steps(task, raise_on_refusal=raise_on_refusal), executor=executor)
+
+    if coalesce:
+        return await _respond_flight.ado(_flight_key(task, raise_on_refusal), run)
+    return await run()
+
+
+def respond_stream(task: str) -> Iterator[DraftChunk | AGIResponse]:
+    """Yield draft chunks as the plan renders, then the sealed :class:`AGIResponse`.
+
+    Tone is scored incrementally per chunk so UI callers can surface Rasa and
+    Peace² hints while text is still arriving.  Ψ, the ledger entry, and the
+    seal are finalised once the last chunk has been emitted; a floor breach at
+    that point raises :class:`SABARPause` exactly like :func:`respond`.
+    """
+
+    plan = plan_and_reason(task)
+    pieces = []
+    accumulator = ToneAccumulator()
+    for index, line in enumerate(_draft_lines(task, plan)):
+        text = line if index == 0 else f" {line}"
+        pieces.append(text)
+        tone = accumulator.feed(text).tone()
+        yield DraftChunk(
+            index=index,
+            text=text,
+            rasa=tone["rasa"],
+            peace2_hint=tone["peace2_hint"],
+        )
+
+    yield _finalise(task, plan, "".join(pieces))
+
+
+__all__ = ["AGIResponse", "DraftChunk", "arespond", "respond", "respond_stream", "respond_steps"]
@@ -2,42 +2,56 @@
 from __future__ import annotations
 
 from dataclasses import asdict
+from typing import Optional
 
+from packages.apex_prime.judge import EvaluationContext
+from packages.arif_asi.analysis import TextAnalysis, analyze, resolve
 from packages.arif_asi.asi import assess_tone, compute_conductance
 from platform.psi.psi_score import Metrics, get_floors
 
 
-def _truth_score(task: str, draft: str) -> float:
-    lowered = f"{task} {draft}".lower()
-    if any(word in lowered for word in ["harm", "violence", "attack"]):
+def _truth_score(task: TextAnalysis, draft: TextAnalysis) -> float:
+    if task.has("harm") or draft.has("harm"):
         return 0.9
-    if "evidence" in lowered or "step" in lowered:
+    if task.has("truth") or draft.has("truth"):
         return 1.02
-    if "speculative" in lowered:
+    if task.has("speculative") or draft.has("speculative"):
         return 0.97
     return 1.0
 
 
-def _delta_s_score(task: str, draft: str) -> float:
-    lowered = draft.lower()
-    if any(word in lowered for word in ["harm", "violence", "attack"]):
+def _delta_s_score(task: TextAnalysis, draft: TextAnalysis) -> float:
+    if draft.has("harm"):
         return -0.2
-    if any(word in lowered for word in ["calm", "care", "support", "cooperate"]):
+    if draft.has("calm"):
         return 1.1
-    if "edge case" in task.lower():
+    if task.has("edge_case"):
         return 0.9
     return 0.75
 
 
-def evaluate_metrics(task: str, draft: str) -> Metrics:
-    """Return a :class:`Metrics` snapshot derived from the plan draft."""
-
-    floors = get_floors()
-    tone = assess_tone(draft)
-    kappa = compute_conductance(task, draft)
-
-    truth = max(0.0, _truth_score(task, draft))
-    delta_s = max(floors.get("deltaS", 0.0), _delta_s_score(task, draft))
+def evaluate_metrics(
+    task: str,
+    draft: str,
+    *,
+    analysis: Optional[TextAnalysis] = None,
+    context: Optional[EvaluationContext] = None,
+) -> Metrics:
+    """Return a :class:`Metrics` snapshot derived from the plan draft.
+
+    ``analysis`` may carry the pre-computed :class:`TextAnalysis` of ``draft`` so
+    callers that already scored the text do not tokenize it again.  Floors come
+    from the request's ``context`` when one is given.
+    """
+
+    floors = context.floors if context is not None else get_floors()
+    task_analysis = analyze(task)
+    draft_analysis = resolve(draft, analysis)
+    tone = assess_tone(draft, analysis=draft_analysis)
+    kappa = compute_conductance(task, draft, analysis_a=task_analysis, analysis_b=draft_analysis)
+
+    truth = max(0.0, _truth_score(task_analysis, draft_analysis))
+    delta_s = max(floors.get("deltaS", 0.0), _delta_s_score(task_analysis, draft_analysis))
     peace2 = min(1.5, max(floors.get("peace2", 1.0), tone["peace2_hint"] + 0.05))
     rasa = min(1.2, max(floors.get("rasa", 0.85), tone["rasa"] + 0.04))
     kappa_r = min(1.5, max(kappa, floors.get("kappa_r", 0.95)))
@@ -1,4 +1,21 @@
 """Peace² · κᵣ conductor helpers."""
-from .asi import assess_tone, compute_conductance, tune
+from .analysis import TextAnalysis, analyze
+from .asi import ToneAccumulator, assess_tone, compute_conductance, tone_from_counts, tune
+from .lexicon import Lexicon, get_lexicon, load_lexicon, set_lexicon
+from .sketch import ConductanceIndex, sketch_conductance
 
-__all__ = ["assess_tone", "compute_conductance", "tune"]
+__all__ = [
+    "ConductanceIndex",
+    "Lexicon",
+    "TextAnalysis",
+    "ToneAccumulator",
+    "analyze",
+    "assess_tone",
+    "compute_conductance",
+    "get_lexicon",
+    "load_lexicon",
+    "set_lexicon",
+    "sketch_conductance",
+    "tone_from_counts",
+    "tune",
+]
@@ -0,0 +1,132 @@
+"""Shared per-draft text analysis for the Core-5 heuristics.
+
+A single runloop scores the same draft from several modules: tone and κᵣ in
+Heart, Truth and ΔS in Mind, noise in Compass.  :func:`analyze` tokenizes and
+lowercases a text once, counts every lexicon marker in one automaton pass, and
+memoises the result in a content-hash LRU cache keyed by
+``(sha256(text), lexicon version)`` so that repeated drafts are never
+re-tokenized.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from .lexicon import get_lexicon
+
+_TOKEN_PATTERN = re.compile(r"[a-zA-Z']+")
+
+_CACHE_SIZE = 256
+
+
+def _tokenize(text: str) -> List[str]:
+    return [match.group(0).lower() for match in _TOKEN_PATTERN.finditer(text)]
+
+
+@dataclass(frozen=True)
+class TextAnalysis:
+    """Tokenized view of a text shared by every Core-5 heuristic."""
+
+    digest: str
+    lexicon_version: str
+    lowered: str
+    tokens: Tuple[str, ...]
+    token_set: FrozenSet[str]
+    word_count: int
+    positive_hits: int
+    negative_hits: int
+    markers: Mapping[str, int]
+
+    def has(self, group: str) -> bool:
+        """Return ``True`` when any marker of category ``group`` occurs."""
+
+        return self.markers.get(group, 0) > 0
+
+
+_cache: "OrderedDict[Tuple[str, str], TextAnalysis]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def _hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _build(text: str, digest: str) -> TextAnalysis:
+    lexicon = get_lexicon()
+    tokens = tuple(_tokenize(text))
+    markers = lexicon.scan(text)
+    return TextAnalysis(
+        digest=digest,
+        lexicon_version=lexicon.version,
+        lowered=text.lower(),
+        tokens=tokens,
+        token_set=frozenset(tokens),
+        word_count=len(text.split()),
+        positive_hits=markers.get("positive", 0),
+        negative_hits=markers.get("negative", 0),
+        markers=markers,
+    )
+
+
+def analyze(text: str) -> TextAnalysis:
+    """Return the cached :class:`TextAnalysis` for ``text``."""
+
+    digest = _hash_text(text)
+    key = (digest, get_lexicon().version)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return cached
+        _cache_stats["misses"] += 1
+
+    analysis = _build(text, digest)
+    with _cache_lock:
+        _cache[key] = analysis
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return analysis
+
+
+def resolve(text: str, analysis: Optional[TextAnalysis]) -> TextAnalysis:
+    """Return ``analysis`` when it is of ``text`` under the current lexicon, else analyse."""
+
+    if (
+        analysis is not None
+        and analysis.lexicon_version == get_lexicon().version
+        and analysis.digest == _hash_text(text)
+    ):
+        return analysis
+    return analyze(text)
+
+
+def analysis_cache_info() -> Dict[str, int]:
+    """Return hit/miss counters and the current size of the analysis cache."""
+
+    with _cache_lock:
+        return {**_cache_stats, "size": len(_cache), "maxsize": _CACHE_SIZE}
+
+
+def clear_analysis_cache() -> None:
+    """Drop every cached analysis and reset the counters."""
+
+    with _cache_lock:
+        _cache.clear()
+        _cache_stats["hits"] = 0
+        _cache_stats["misses"] = 0
+
+
+__all__ = [
+    "TextAnalysis",
+    "analysis_cache_info",
+    "analyze",
+    "clear_analysis_cache",
+    "resolve",
+]
@@ -1,95 +1,65 @@
 """Empathy and conductance heuristics for the Arif-ASI module."""
 from __future__ import annotations
 
-from typing import Dict, Iterable, List
-
-import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import IO, Dict, List, Optional, Tuple
 
 from platform.psi.psi_score import get_floors
 
-_POSITIVE_WORDS: frozenset[str] = frozenset(
-    {
-        "calm",
-        "care",
-        "clarity",
-        "compassionate",
-        "cooperate",
-        "empathy",
-        "gentle",
-        "honor",
-        "kind",
-        "peace",
-        "respect",
-        "support",
-        "together",
-        "trust",
-        "understand",
-    }
-)
-_NEGATIVE_WORDS: frozenset[str] = frozenset(
-    {
-        "angry",
-        "attack",
-        "break",
-        "cruel",
-        "fight",
-        "harm",
-        "hurt",
-        "reject",
-        "shout",
-        "threat",
-        "toxic",
-        "violence",
-    }
-)
-
-_TOKEN_PATTERN = re.compile(r"[a-zA-Z']+")
-
-
-def _tokenize(text: str) -> List[str]:
-    return [match.group(0).lower() for match in _TOKEN_PATTERN.finditer(text)]
+from .analysis import _TOKEN_PATTERN, TextAnalysis, analyze, resolve
+from .lexicon import _TOKEN_CHARS, Lexicon, fold, get_lexicon, on_token_boundary
 
+_SOFTENER = "reflect"
+_COOLING_SUFFIX = " We respond with calm empathy and shared respect."
+_BREATH_SUFFIX = " Together, we breathe, listen, and adapt."
 
-def _marker_score(tokens: Iterable[str], marker: Iterable[str]) -> int:
-    marker_set = set(marker)
-    return sum(1 for token in tokens if token in marker_set)
 
-
-def compute_conductance(text_a: str, text_b: str) -> float:
+def compute_conductance(
+    text_a: str,
+    text_b: str,
+    *,
+    analysis_a: Optional[TextAnalysis] = None,
+    analysis_b: Optional[TextAnalysis] = None,
+) -> float:
     """Approximate κᵣ using overlap of calming intents and penalties for aggression."""
 
-    tokens_a = _tokenize(text_a)
-    tokens_b = _tokenize(text_b)
+    analysis_a = resolve(text_a, analysis_a)
+    analysis_b = resolve(text_b, analysis_b)
 
-    if not tokens_a or not tokens_b:
+    if not analysis_a.tokens or not analysis_b.tokens:
         return 0.8
 
-    unique_a = set(tokens_a)
-    unique_b = set(tokens_b)
+    unique_a = analysis_a.token_set
+    unique_b = analysis_b.token_set
     shared = unique_a & unique_b
     total = unique_a | unique_b
     overlap = len(shared) / len(total) if total else 0.0
 
     positive_alignment = (
-        _marker_score(shared, _POSITIVE_WORDS) / max(len(shared) or 1, 1)
+        len(shared & get_lexicon().terms("positive")) / max(len(shared) or 1, 1)
         if shared
         else 0.0
     )
-    aggression_penalty = 0.35 * (
-        _marker_score(tokens_a, _NEGATIVE_WORDS) + _marker_score(tokens_b, _NEGATIVE_WORDS)
-    )
+    return _kappa(overlap, positive_alignment, analysis_a.negative_hits + analysis_b.negative_hits)
+
+
+def _kappa(overlap: float, positive_alignment: float, negative_hits: int) -> float:
+    aggression_penalty = 0.35 * negative_hits
     kappa = 0.85 + overlap * 0.5 + positive_alignment * 0.6 - aggression_penalty
     return max(0.0, min(1.5, kappa))
 
 
-def assess_tone(text: str) -> Dict[str, float]:
-    """Return tone diagnostics used by ASI and other agents."""
+def tone_from_counts(positive_hits: int, negative_hits: int, token_count: int) -> Dict[str, float]:
+    """Return tone diagnostics from raw marker and token counts.
+
+    Callers that score text in pieces (for example streamed drafts) can sum the
+    per-piece counts from :func:`assess_tone` and convert them here without
+    re-tokenizing the whole text.
+    """
 
     floors = get_floors()
-    tokens = _tokenize(text)
-    positive_hits = _marker_score(tokens, _POSITIVE_WORDS)
-    negative_hits = _marker_score(tokens, _NEGATIVE_WORDS)
-    length = max(len(tokens), 1)
+    length = max(token_count, 1)
 
     compassion_ratio = positive_hits / length
     tension_ratio = negative_hits / length
@@ -97,7 +67,7 @@ def assess_tone(text: str) -> Dict[str, float]:
     rasa = max(0.0, min(1.2, 0.7 + compassion_ratio * 1.5 - tension_ratio * 0.6))
     peace2_hint = max(0.0, min(1.5, 0.95 + compassion_ratio * 1.1 - tension_ratio * 0.9))
 
-    if not tokens:
+    if not token_count:
         rasa = max(rasa, floors.get("rasa", 0.85) * 0.95)
         peace2_hint = max(peace2_hint, 0.95)
 
@@ -106,11 +76,196 @@ def assess_tone(text: str) -> Dict[str, float]:
         "peace2_hint": peace2_hint,
         "positive_hits": positive_hits,
         "negative_hits": negative_hits,
+        "tokens": token_count,
     }
 
 
+def assess_tone(text: str, *, analysis: Optional[TextAnalysis] = None) -> Dict[str, float]:
+    """Return tone diagnostics used by ASI and other agents."""
+
+    analysis = resolve(text, analysis)
+    return tone_from_counts(analysis.positive_hits, analysis.negative_hits, len(analysis.tokens))
+
+
+class ToneAccumulator:
+    """Running tone score for text that arrives in chunks.
+
+    The accumulator keeps positive, negative, and token counts plus a short tail
+    of the text seen so far (one character longer than the longest lexicon
+    term).  Markers and tokens that straddle chunk boundaries are therefore
+    counted exactly once, each :meth:`feed` costs only the new chunk, and the
+    current :meth:`tone` is available in O(1) without holding the document.
+    """
+
+    def __init__(self, lexicon: Optional[Lexicon] = None) -> None:
+        self._lexicon = lexicon or get_lexicon()
+        self._width = self._lexicon.max_term_length + 1
+        self._tail = ""
+        self.positive_hits = 0
+        self.negative_hits = 0
+        self.tokens = 0
+        self.characters = 0
+
+    @classmethod
+    def resume(
+        cls,
+        text: str,
+        positive_hits: int,
+        negative_hits: int,
+        tokens: int,
+        *,
+        lexicon: Optional[Lexicon] = None,
+    ) -> "ToneAccumulator":
+        """Continue from already-known counts for ``text`` without rescanning it."""
+
+        accumulator = cls(lexicon)
+        accumulator.positive_hits = positive_hits
+        accumulator.negative_hits = negative_hits
+        accumulator.tokens = tokens
+        accumulator.characters = len(text)
+        accumulator._tail = text[-accumulator._width:]
+        return accumulator
+
+    def feed(self, chunk: str) -> "ToneAccumulator":
+        """Score ``chunk`` as the continuation of everything fed so far."""
+
+        if not chunk:
+            return self
+
+        counts = self._lexicon.scan(chunk)
+        tokens = sum(1 for _ in _TOKEN_PATTERN.finditer(chunk))
+        if self._tail:
+            junction = self._lexicon.junction(self._tail, chunk)
+            for category, delta in junction.items():
+                counts[category] += delta
+            if self._tail[-1] in _TOKEN_CHARS and chunk[0] in _TOKEN_CHARS:
+                tokens -= 1
+
+        self.positive_hits += counts.get("positive", 0)
+        self.negative_hits += counts.get("negative", 0)
+        self.tokens += tokens
+        self.characters += len(chunk)
+        if len(chunk) >= self._width:
+            self._tail = chunk[-self._width:]
+        else:
+            self._tail = (self._tail + chunk)[-self._width:]
+        return self
+
+    def feed_stream(self, handle: IO[str], chunk_size: int = 1 << 16) -> "ToneAccumulator":
+        """Feed a text stream in ``chunk_size`` pieces using constant memory."""
+
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                return self
+            self.feed(chunk)
+
+    def tone(self) -> Dict[str, float]:
+        """Return the diagnostics :func:`assess_tone` would give for the text so far."""
+
+        return tone_from_counts(self.positive_hits, self.negative_hits, self.tokens)
+
+    @property
+    def rasa(self) -> float:
+        return self.tone()["rasa"]
+
+    @property
+    def peace2_hint(self) -> float:
+        return self.tone()["peace2_hint"]
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _at_word_boundary(text: str, index: int) -> bool:
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+@lru_cache(maxsize=8)
+def _softener_collides(lexicon: Lexicon) -> bool:
+    tone_terms = lexicon.terms("positive") | lexicon.terms("negative")
+    return any(_SOFTENER in term for term in tone_terms)
+
+
+def _tone_counts(analysis: TextAnalysis) -> Dict[str, int]:
+    return {
+        "positive": analysis.positive_hits,
+        "negative": analysis.negative_hits,
+        "tokens": len(analysis.tokens),
+    }
+
+
+def _soften(text: str, lexicon: Lexicon) -> Tuple[str, Optional[Dict[str, int]]]:
+    """Replace every negative marker with the softener in one automaton pass.
+
+    Markers are replaced where they sit on regex word boundaries (``\\b``),
+    leftmost-longest first.  Alongside the rewritten text this returns the
+    ``positive_hits``/``negative_hits``/``tokens`` counts of the result, derived
+    from the baseline analysis and the replaced spans, or ``None`` when the
+    lexicon makes that shortcut unsafe and the caller must re-score.
+    """
+
+    folded = fold(text)
+    candidates: List[Tuple[int, int, str]] = []
+    counted: List[Tuple[int, int, str]] = []
+    for start, end, category, term, bounded in lexicon.iter_matches(folded):
+        if category not in {"positive", "negative"}:
+            continue
+        if (
+            category == "negative"
+            and _at_word_boundary(folded, start)
+            and _at_word_boundary(folded, end)
+        ):
+            candidates.append((start, end, term))
+        if not bounded or on_token_boundary(folded, start, end):
+            counted.append((start, end, category))
+
+    if not candidates:
+        return text, _tone_counts(analyze(text))
+
+    candidates.sort(key=lambda item: (item[0], -item[1]))
+    selected: List[Tuple[int, int, str]] = []
+    cursor = 0
+    for start, end, term in candidates:
+        if start >= cursor:
+            selected.append((start, end, term))
+            cursor = end
+
+    pieces: List[str] = []
+    cursor = 0
+    for start, end, _term in selected:
+        pieces.append(text[cursor:start])
+        pieces.append(_SOFTENER)
+        cursor = end
+    pieces.append(text[cursor:])
+    softened = "".join(pieces)
+
+    if _softener_collides(lexicon) or any(
+        term[0] not in _TOKEN_CHARS or term[-1] not in _TOKEN_CHARS for _s, _e, term in selected
+    ):
+        return softened, None
+
+    counts = _tone_counts(analyze(text))
+    starts = [start for start, _end, _term in selected]
+    for start, end, category in counted:
+        position = bisect_right(starts, end - 1) - 1
+        if position >= 0 and selected[position][1] > start:
+            counts[category] -= 1
+    for _start, _end, term in selected:
+        counts["tokens"] += 1 - len(_TOKEN_PATTERN.findall(term))
+    return softened, counts
+
+
 def tune(text: str, target_peace2: float = 1.0) -> Dict[str, float | str | bool]:
-    """Adjust the draft to reach the desired Peace² score without harming truth cues."""
+    """Adjust the draft to reach the desired Peace² score without harming truth cues.
+
+    Negative markers are rewritten in a single pass and the tone of the cooled
+    draft is derived from the rewrite itself, so cooling stays linear in the
+    draft length regardless of lexicon size.
+    """
 
     baseline = assess_tone(text)
     floors = get_floors()
@@ -119,15 +274,20 @@ def tune(text: str, target_peace2: float = 1.0) -> Dict[str, float | str | bool]
     if baseline["peace2_hint"] >= desired:
         return {**baseline, "text": text, "modified": False}
 
-    softened = text
-    for marker in _NEGATIVE_WORDS:
-        softened = re.sub(rf"\b{marker}\b", "reflect", softened, flags=re.IGNORECASE)
+    lexicon = get_lexicon()
+    softened, counts = _soften(text, lexicon)
 
     if "Truth:" in text and "Truth:" not in softened:
-        softened = softened.replace("reflect", "Truth: reflect", 1)
+        softened = softened.replace(_SOFTENER, f"Truth: {_SOFTENER}", 1)
+        counts = None
 
-    softened += " We respond with calm empathy and shared respect."
-    improved = assess_tone(softened)
+    if counts is None:
+        counts = _tone_counts(analyze(softened))
+    accumulator = ToneAccumulator.resume(
+        softened, counts["positive"], counts["negative"], counts["tokens"], lexicon=lexicon
+    )
+    softened += _COOLING_SUFFIX
+    improved = accumulator.feed(_COOLING_SUFFIX).tone()
 
     if improved["peace2_hint"] < baseline["peace2_hint"]:
         # Do no harm: keep the original text when the heuristic fails.
@@ -135,10 +295,16 @@ def tune(text: str, target_peace2: float = 1.0) -> Dict[str, float | str | bool]
 
     final_text = softened
     if improved["peace2_hint"] < desired:
-        final_text += " Together, we breathe, listen, and adapt."
-        improved = assess_tone(final_text)
+        final_text += _BREATH_SUFFIX
+        improved = accumulator.feed(_BREATH_SUFFIX).tone()
 
     return {**improved, "text": final_text, "modified": final_text != text}
 
 
-__all__ = ["assess_tone", "compute_conductance", "tune"]
+__all__ = [
+    "ToneAccumulator",
+    "assess_tone",
+    "compute_conductance",
+    "tone_from_counts",
+    "tune",
+]
@@ -0,0 +1,367 @@
+"""Compiled marker lexicons for the Core-5 text heuristics.
+
+Every marker family used by the heuristics (Heart tone words, Mind truth/harm
+cues, Compass noise cues) lives in one :class:`Lexicon`.  The lexicon compiles
+all of its terms into a single Aho–Corasick automaton, so a draft is scanned
+once, in time linear in its length, no matter how many terms or multi-word
+phrases are loaded.
+
+Categories match in one of two modes:
+
+* ``word`` – the term must sit on token boundaries (``[a-zA-Z']``), which is
+  how Heart has always counted tone words.
+* ``substring`` – any occurrence counts, preserving the Mind and Compass cue
+  semantics (``"step"`` also matches ``"steps"``).
+
+Large lexicons can be loaded from disk with :func:`load_lexicon` and activated
+with :func:`set_lexicon`, or picked up on first use from the directory or JSON
+file named by ``ARIFOS_LEXICON_PATH``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+WORD = "word"
+SUBSTRING = "substring"
+
+_TOKEN_CHARS: FrozenSet[str] = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'"
+)
+
+_DEFAULT_TERMS: Mapping[str, Tuple[str, ...]] = {
+    "positive": (
+        "calm",
+        "care",
+        "clarity",
+        "compassionate",
+        "cooperate",
+        "empathy",
+        "gentle",
+        "honor",
+        "kind",
+        "peace",
+        "respect",
+        "support",
+        "together",
+        "trust",
+        "understand",
+    ),
+    "negative": (
+        "angry",
+        "attack",
+        "break",
+        "cruel",
+        "fight",
+        "harm",
+        "hurt",
+        "reject",
+        "shout",
+        "threat",
+        "toxic",
+        "violence",
+    ),
+    # Substring cues consumed by the Mind and Compass heuristics.
+    "harm": ("harm", "violence", "attack"),
+    "truth": ("evidence", "step"),
+    "speculative": ("speculative",),
+    "calm": ("calm", "care", "support", "cooperate"),
+    "edge_case": ("edge case",),
+    "exclaim": ("!!",),
+}
+
+_DEFAULT_MODES: Mapping[str, str] = {
+    "positive": WORD,
+    "negative": WORD,
+    "harm": SUBSTRING,
+    "truth": SUBSTRING,
+    "speculative": SUBSTRING,
+    "calm": SUBSTRING,
+    "edge_case": SUBSTRING,
+    "exclaim": SUBSTRING,
+}
+
+
+@dataclass(frozen=True)
+class LexiconMatch:
+    """Single marker occurrence reported by :meth:`Lexicon.finditer`."""
+
+    start: int
+    end: int
+    category: str
+    term: str
+
+
+class Lexicon:
+    """Immutable set of marker categories compiled into one automaton."""
+
+    def __init__(
+        self,
+        terms: Mapping[str, Iterable[str]],
+        modes: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        modes = dict(modes or {})
+        categories: Dict[str, FrozenSet[str]] = {}
+        category_modes: Dict[str, str] = {}
+        for category, values in terms.items():
+            mode = modes.get(category, _DEFAULT_MODES.get(category, WORD))
+            if mode not in {WORD, SUBSTRING}:
+                raise ValueError(f"Unknown lexicon mode {mode!r} for category {category!r}")
+            cleaned = frozenset(
+                " ".join(value.lower().split()) for value in values if value and value.strip()
+            )
+            categories[category] = cleaned
+            category_modes[category] = mode
+
+        self._categories = categories
+        self._modes = category_modes
+        self.version = self._compute_version()
+        self._compile()
+
+    def _compute_version(self) -> str:
+        payload = {
+            category: {"mode": self._modes[category], "terms": sorted(values)}
+            for category, values in self._categories.items()
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+    def _compile(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[str, str, bool]]] = [[]]
+        for category, values in sorted(self._categories.items()):
+            bounded = self._modes[category] == WORD
+            for term in sorted(values):
+                state = 0
+                for char in term:
+                    nxt = goto[state].get(char)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][char] = nxt
+                        goto.append({})
+                        outputs.append([])
+                    state = nxt
+                outputs[state].append((category, term, bounded))
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(char, 0)
+                outputs[child] = outputs[child] + outputs[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = [tuple(entry) for entry in outputs]
+        self.max_term_length = max(
+            (len(term) for values in self._categories.values() for term in values),
+            default=0,
+        )
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        return tuple(sorted(self._categories))
+
+    def terms(self, category: str) -> FrozenSet[str]:
+        """Return the normalised terms of ``category`` (empty when unknown)."""
+
+        return self._categories.get(category, frozenset())
+
+    def mode(self, category: str) -> str:
+        return self._modes[category]
+
+    def __len__(self) -> int:
+        return sum(len(values) for values in self._categories.values())
+
+    def iter_matches(self, folded: str) -> Iterator[Tuple[int, int, str, str, bool]]:
+        """Yield ``(start, end, category, term, bounded)`` for every term occurrence.
+
+        ``folded`` must already be :func:`fold`-ed.  Unlike :meth:`finditer`,
+        word-mode terms (``bounded``) are yielded even when glued to adjacent
+        tokens, so callers can apply their own boundary rules.
+        """
+
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+        for index, char in enumerate(folded):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not outputs[state]:
+                continue
+            for category, term, bounded in outputs[state]:
+                yield index - len(term) + 1, index + 1, category, term, bounded
+
+    def finditer(self, text: str) -> Iterator[LexiconMatch]:
+        """Yield every marker occurrence in ``text`` in a single left-to-right pass.
+
+        ``text`` is matched case-insensitively; offsets refer to ``text`` itself.
+        """
+
+        folded = fold(text)
+        for start, end, category, term, bounded in self.iter_matches(folded):
+            if bounded and not on_token_boundary(folded, start, end):
+                continue
+            yield LexiconMatch(start=start, end=end, category=category, term=term)
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """Return the number of marker hits per category in ``text``."""
+
+        counts = dict.fromkeys(self._categories, 0)
+        for match in self.finditer(text):
+            counts[match.category] += 1
+        return counts
+
+    def junction(self, left: str, right: str) -> Dict[str, int]:
+        """Return the count correction for scanning ``left + right`` as one text.
+
+        ``scan(a + b)`` equals ``scan(a) + scan(b) + junction(a, b)`` per
+        category.  Only the last and first ``max_term_length + 1`` characters of
+        each side are inspected, so the correction costs O(longest term).
+        """
+
+        width = self.max_term_length + 1
+        left_tail = left[-width:]
+        right_head = right[:width]
+        joined = self.scan(left_tail + right_head)
+        left_counts = self.scan(left_tail)
+        right_counts = self.scan(right_head)
+        return {
+            category: joined[category] - left_counts[category] - right_counts[category]
+            for category in joined
+        }
+
+
+def on_token_boundary(text: str, start: int, end: int) -> bool:
+    """Return ``True`` when ``text[start:end]`` is not glued to adjacent tokens."""
+
+    if start > 0 and text[start - 1] in _TOKEN_CHARS:
+        return False
+    if end < len(text) and text[end] in _TOKEN_CHARS:
+        return False
+    return True
+
+
+def fold(text: str) -> str:
+    """Lowercase ``text`` while keeping offsets aligned with the original."""
+
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A handful of code points expand when lowercased; fall back to ASCII folding.
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+
+def _read_terms(path: Path) -> List[str]:
+    terms: List[str] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            terms.append(stripped)
+    return terms
+
+
+def load_lexicon(path: str | os.PathLike[str], *, base: Optional[Lexicon] = None) -> Lexicon:
+    """Load marker categories from ``path`` and merge them over ``base``.
+
+    ``path`` may be a directory holding one ``<category>.txt`` file per category
+    (one term or phrase per line, ``#`` comments allowed) or a JSON file mapping
+    each category either to a list of terms or to ``{"terms": [...], "mode": ...}``.
+    Categories absent from ``path`` keep the terms of ``base`` (the built-in
+    lexicon by default).
+    """
+
+    source = Path(path)
+    base = base or default_lexicon()
+    terms: Dict[str, Iterable[str]] = {
+        category: base.terms(category) for category in base.categories
+    }
+    modes: Dict[str, str] = {category: base.mode(category) for category in base.categories}
+
+    if source.is_dir():
+        for file_path in sorted(source.glob("*.txt")):
+            terms[file_path.stem] = _read_terms(file_path)
+    else:
+        with source.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+        if not isinstance(payload, Mapping):
+            raise ValueError("Lexicon JSON must map categories to term lists.")
+        for category, spec in payload.items():
+            if isinstance(spec, Mapping):
+                terms[category] = list(spec.get("terms", []))
+                if "mode" in spec:
+                    modes[category] = str(spec["mode"])
+            else:
+                terms[category] = list(spec)
+
+    return Lexicon(terms, modes)
+
+
+_default: Optional[Lexicon] = None
+_active: Optional[Lexicon] = None
+_lock = threading.Lock()
+
+
+def default_lexicon() -> Lexicon:
+    """Return the built-in lexicon."""
+
+    global _default
+    if _default is None:
+        _default = Lexicon(_DEFAULT_TERMS, _DEFAULT_MODES)
+    return _default
+
+
+def get_lexicon() -> Lexicon:
+    """Return the active lexicon, loading ``ARIFOS_LEXICON_PATH`` on first use."""
+
+    global _active
+    if _active is None:
+        with _lock:
+            if _active is None:
+                override = os.getenv("ARIFOS_LEXICON_PATH")
+                _active = load_lexicon(override) if override else default_lexicon()
+    return _active
+
+
+def set_lexicon(lexicon: Optional[Lexicon]) -> None:
+    """Activate ``lexicon`` process-wide; ``None`` restores the default lookup."""
+
+    global _active
+    with _lock:
+        _active = lexicon
+
+
+def lexicon_version() -> str:
+    """Return the version hash of the active lexicon."""
+
+    return get_lexicon().version
+
+
+__all__ = [
+    "Lexicon",
+    "LexiconMatch",
+    "SUBSTRING",
+    "WORD",
+    "default_lexicon",
+    "fold",
+    "get_lexicon",
+    "lexicon_version",
+    "load_lexicon",
+    "on_token_boundary",
+    "set_lexicon",
+]
@@ -0,0 +1,243 @@
+"""MinHash sketches for approximate κᵣ over long texts and many candidates.
+
+:func:`compute_conductance` builds exact token sets for both texts, which is
+fine for short drafts but wasteful when a draft is compared against large
+reference corpora.  This module summarises each text as a :class:`TextSketch`
+(a MinHash signature plus the few exact quantities κᵣ needs) cached per text
+hash, estimates token overlap from signatures, and indexes sketches in LSH
+buckets so one-vs-many queries only score likely matches.
+
+The standard error of a MinHash Jaccard estimate is at most
+``1 / (2 * sqrt(num_perm))``; :func:`num_perm_for_error` sizes signatures so
+the estimate stays within ``error`` at roughly two standard deviations.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+
+from .analysis import TextAnalysis, _hash_text, resolve
+from .asi import _kappa
+from .lexicon import get_lexicon
+
+_PRIME = (1 << 61) - 1
+_SEED = 0x5EED_888
+_CACHE_SIZE = 1024
+DEFAULT_ERROR = 0.1
+
+
+def num_perm_for_error(error: float) -> int:
+    """Return the signature length that bounds the overlap error by ``error``."""
+
+    if not 0.0 < error < 1.0:
+        raise ValueError("error must be within (0, 1)")
+    return max(16, math.ceil(1.0 / (error * error)))
+
+
+_permutation_cache: Dict[int, Tuple[Tuple[int, int], ...]] = {}
+
+
+def _permutations(num_perm: int) -> Tuple[Tuple[int, int], ...]:
+    cached = _permutation_cache.get(num_perm)
+    if cached is None:
+        rng = random.Random(_SEED)
+        cached = tuple(
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+        )
+        _permutation_cache[num_perm] = cached
+    return cached
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+@dataclass(frozen=True)
+class TextSketch:
+    """MinHash summary of a text plus the exact inputs κᵣ needs."""
+
+    digest: str
+    lexicon_version: str
+    signature: Tuple[int, ...]
+    unique_tokens: int
+    positive_tokens: FrozenSet[str]
+    negative_hits: int
+
+    @property
+    def num_perm(self) -> int:
+        return len(self.signature)
+
+    def jaccard(self, other: "TextSketch") -> float:
+        """Estimate the token-set Jaccard overlap with ``other``."""
+
+        if self.num_perm != other.num_perm:
+            raise ValueError("Sketches must share the same signature length.")
+        if not self.unique_tokens or not other.unique_tokens:
+            return 0.0
+        matches = sum(1 for left, right in zip(self.signature, other.signature) if left == right)
+        return matches / self.num_perm
+
+
+_cache: "OrderedDict[Tuple[str, int, str], TextSketch]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _build(analysis: TextAnalysis, num_perm: int) -> TextSketch:
+    hashes = [_token_hash(token) for token in analysis.token_set]
+    if hashes:
+        signature = tuple(
+            min((a * value + b) % _PRIME for value in hashes) for a, b in _permutations(num_perm)
+        )
+    else:
+        signature = (_PRIME,) * num_perm
+    return TextSketch(
+        digest=analysis.digest,
+        lexicon_version=analysis.lexicon_version,
+        signature=signature,
+        unique_tokens=len(analysis.token_set),
+        positive_tokens=analysis.token_set & get_lexicon().terms("positive"),
+        negative_hits=analysis.negative_hits,
+    )
+
+
+def sketch(
+    text: str,
+    *,
+    error: float = DEFAULT_ERROR,
+    analysis: Optional[TextAnalysis] = None,
+) -> TextSketch:
+    """Return the cached :class:`TextSketch` of ``text`` sized for ``error``."""
+
+    num_perm = num_perm_for_error(error)
+    digest = analysis.digest if analysis is not None else _hash_text(text)
+    key = (digest, num_perm, get_lexicon().version)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    built = _build(resolve(text, analysis), num_perm)
+    with _cache_lock:
+        _cache[key] = built
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return built
+
+
+def conductance_from_sketches(left: TextSketch, right: TextSketch) -> float:
+    """Estimate :func:`compute_conductance` from two sketches."""
+
+    if not left.unique_tokens or not right.unique_tokens:
+        return 0.8
+
+    overlap = left.jaccard(right)
+    union = (left.unique_tokens + right.unique_tokens) / (1.0 + overlap)
+    positive_shared = len(left.positive_tokens & right.positive_tokens)
+    shared = max(overlap * union, float(positive_shared))
+    positive_alignment = positive_shared / max(shared, 1.0) if shared >= 0.5 else 0.0
+    return _kappa(overlap, positive_alignment, left.negative_hits + right.negative_hits)
+
+
+def sketch_conductance(text_a: str, text_b: str, *, error: float = DEFAULT_ERROR) -> float:
+    """Sketch-based counterpart of :func:`compute_conductance` for long texts."""
+
+    return conductance_from_sketches(sketch(text_a, error=error), sketch(text_b, error=error))
+
+
+def _bands_for(num_perm: int, threshold: float) -> int:
+    best_bands = 1
+    best_gap = float("inf")
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        gap = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if gap < best_gap:
+            best_bands, best_gap = bands, gap
+    return best_bands
+
+
+class ConductanceIndex:
+    """LSH index answering one-vs-many κᵣ queries against stored texts.
+
+    Signatures are split into bands; texts sharing any band land in the same
+    bucket.  A query only scores the texts it collides with, so its cost grows
+    with the number of likely matches rather than the size of the corpus.
+    ``threshold`` is the overlap around which collisions become likely.
+    """
+
+    def __init__(self, *, error: float = DEFAULT_ERROR, threshold: float = 0.3) -> None:
+        self.error = error
+        self.num_perm = num_perm_for_error(error)
+        self.bands = _bands_for(self.num_perm, threshold)
+        self.rows = self.num_perm // self.bands
+        self._sketches: Dict[Hashable, TextSketch] = {}
+        self._buckets: Dict[Tuple[int, int], List[Hashable]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._sketches)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, int]]:
+        rows = self.rows
+        return [
+            (band, hash(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)
+        ]
+
+    def add(self, key: Hashable, text: str) -> TextSketch:
+        """Index ``text`` under ``key``; re-adding a key is rejected."""
+
+        if key in self._sketches:
+            raise KeyError(f"Key already indexed: {key!r}")
+        entry = sketch(text, error=self.error)
+        self._sketches[key] = entry
+        if entry.unique_tokens:
+            for bucket in self._band_keys(entry.signature):
+                self._buckets[bucket].append(key)
+        return entry
+
+    def candidates(self, text: str) -> Set[Hashable]:
+        """Return the keys whose sketches share at least one band with ``text``."""
+
+        probe = sketch(text, error=self.error)
+        found: Set[Hashable] = set()
+        if not probe.unique_tokens:
+            return found
+        for bucket in self._band_keys(probe.signature):
+            found.update(self._buckets.get(bucket, ()))
+        return found
+
+    def query(
+        self,
+        text: str,
+        *,
+        min_overlap: float = 0.0,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[Hashable, float, float]]:
+        """Return ``(key, kappa, overlap)`` for colliding texts, highest κᵣ first."""
+
+        probe = sketch(text, error=self.error)
+        scored: List[Tuple[Hashable, float, float]] = []
+        for key in self.candidates(text):
+            stored = self._sketches[key]
+            overlap = probe.jaccard(stored)
+            if overlap < min_overlap:
+                continue
+            scored.append((key, conductance_from_sketches(probe, stored), overlap))
+        scored.sort(key=lambda item: (-item[1], -item[2]))
+        return scored[:limit] if limit is not None else scored
+
+
+__all__ = [
+    "ConductanceIndex",
+    "TextSketch",
+    "conductance_from_sketches",
+    "num_perm_for_error",
+    "sketch",
+    "sketch_conductance",
+]
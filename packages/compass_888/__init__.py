@@ -1,4 +1,14 @@
 """Routing and ethical orientation helpers."""
-from .compass import noise_score, route
+from .compass import DEFAULT_ROUTING_TABLE, noise_score, route, route_many
+from .routing import Condition, Floor, Rule, RoutingTable
 
-__all__ = ["noise_score", "route"]
+__all__ = [
+    "Condition",
+    "DEFAULT_ROUTING_TABLE",
+    "Floor",
+    "Rule",
+    "RoutingTable",
+    "noise_score",
+    "route",
+    "route_many",
+]
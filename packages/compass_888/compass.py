@@ -2,10 +2,14 @@
 from __future__ import annotations
 
 from dataclasses import asdict, is_dataclass
-from typing import Any, Mapping
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from platform.psi.psi_score import Metrics, get_floors
-from packages.arif_asi.asi import assess_tone, compute_conductance
+from packages.apex_prime.judge import EvaluationContext
+from packages.arif_asi.analysis import TextAnalysis, resolve
+from packages.arif_asi.asi import compute_conductance
+
+from .routing import CompiledTable, Condition, Floor, Rule, RoutingTable
 
 
 def _as_mapping(metrics: Mapping[str, Any] | Metrics) -> Mapping[str, float]:
@@ -16,43 +20,138 @@ def _as_mapping(metrics: Mapping[str, Any] | Metrics) -> Mapping[str, float]:
     return metrics
 
 
-def noise_score(text: str) -> float:
+def noise_score(text: str, *, analysis: Optional[TextAnalysis] = None) -> float:
     """Return a heuristic noise score in ``[0, 1]`` based on aggression markers."""
 
-    tone = assess_tone(text)
-    hits = tone["negative_hits"] + (1 if text.count("!!") else 0)
-    length = max(len(text.split()), 1)
+    analysis = resolve(text, analysis)
+    hits = analysis.negative_hits + (1 if analysis.has("exclaim") else 0)
+    length = max(analysis.word_count, 1)
     raw = hits / length
     return max(0.0, min(1.0, raw * 3.0))
 
 
-def route(task: str, draft: str, metrics: Mapping[str, Any] | Metrics) -> str:
-    """Select the next module in the Core-5 chain based on telemetry."""
-
-    floors = get_floors()
-    mapping = _as_mapping(metrics)
-
-    truth = float(mapping.get("truth", 0.0))
-    deltaS = float(mapping.get("deltaS", 0.0))
-    peace2 = float(mapping.get("peace2", 0.0))
-    kappa = float(mapping.get("kappa_r", 0.0))
-
-    if noise_score(draft) > 0.65:
-        return "arif-asi"
-
-    if truth < floors.get("truth", 0.99) or deltaS < floors.get("deltaS", 0.0):
-        return "arif-agi"
-
-    if peace2 < floors.get("peace2", 1.0) or kappa < floors.get("kappa_r", 0.95):
-        return "arif-asi"
-
-    kappa_margin = floors.get("kappa_r", 0.95) + 0.01
-    if kappa <= kappa_margin:
-        conductance = compute_conductance(task, draft)
-        if conductance < floors.get("kappa_r", 0.95):
-            return "arif-asi"
-
-    return "apex-prime"
-
-
-__all__ = ["noise_score", "route"]
+DEFAULT_ROUTING_TABLE = RoutingTable(
+    rules=(
+        Rule("arif-asi", (Condition("noise", ">", 0.65),)),
+        Rule("arif-agi", (Condition("truth", "<", Floor("truth", 0.99)),)),
+        Rule("arif-agi", (Condition("deltaS", "<", Floor("deltaS", 0.0)),)),
+        Rule("arif-asi", (Condition("peace2", "<", Floor("peace2", 1.0)),)),
+        Rule("arif-asi", (Condition("kappa_r", "<", Floor("kappa_r", 0.95)),)),
+        Rule(
+            "arif-asi",
+            (
+                Condition("kappa_r", "<=", Floor("kappa_r", 0.95, offset=0.01)),
+                Condition("conductance", "<", Floor("kappa_r", 0.95)),
+            ),
+        ),
+    ),
+    default="apex-prime",
+)
+
+# Relative cost of each routing feature; metrics are free, κᵣ is the most expensive.
+_FEATURE_COSTS: Mapping[str, int] = {"noise": 1, "conductance": 2}
+_METRIC_FEATURES = frozenset({"truth", "deltaS", "peace2", "kappa_r"})
+
+_compiled: Dict[Tuple[int, Tuple[Tuple[str, float], ...]], Tuple[RoutingTable, CompiledTable]] = {}
+
+
+def _compiled_table(table: RoutingTable, floors: Mapping[str, float]) -> CompiledTable:
+    key = (id(table), tuple(sorted(floors.items())))
+    cached = _compiled.get(key)
+    if cached is None or cached[0] is not table:
+        if len(_compiled) >= 32:
+            _compiled.clear()
+        cached = _compiled[key] = (table, table.compile(floors, _FEATURE_COSTS))
+    return cached[1]
+
+
+class _DraftFeatures:
+    """Lazily computed routing features of one ``(task, draft, metrics)`` triple."""
+
+    __slots__ = ("task", "draft", "mapping", "analysis", "noise", "conductance")
+
+    def __init__(
+        self,
+        task: str,
+        draft: str,
+        metrics: Mapping[str, Any] | Metrics,
+        analysis: Optional[TextAnalysis],
+        noise: Dict[str, float],
+        conductance: Dict[Tuple[str, str], float],
+    ) -> None:
+        self.task = task
+        self.draft = draft
+        self.mapping = _as_mapping(metrics)
+        self.analysis = analysis
+        self.noise = noise
+        self.conductance = conductance
+
+    def _analysis(self) -> TextAnalysis:
+        self.analysis = resolve(self.draft, self.analysis)
+        return self.analysis
+
+    def __call__(self, name: str) -> float:
+        if name in _METRIC_FEATURES:
+            return float(self.mapping.get(name, 0.0))
+        if name == "noise":
+            value = self.noise.get(self.draft)
+            if value is None:
+                value = self.noise[self.draft] = noise_score(self.draft, analysis=self._analysis())
+            return value
+        if name == "conductance":
+            key = (self.task, self.draft)
+            value = self.conductance.get(key)
+            if value is None:
+                value = self.conductance[key] = compute_conductance(
+                    self.task, self.draft, analysis_b=self._analysis()
+                )
+            return value
+        raise KeyError(f"Unknown routing feature: {name!r}")
+
+
+def route(
+    task: str,
+    draft: str,
+    metrics: Mapping[str, Any] | Metrics,
+    *,
+    analysis: Optional[TextAnalysis] = None,
+    table: Optional[RoutingTable] = None,
+    context: Optional[EvaluationContext] = None,
+) -> str:
+    """Select the next module in the Core-5 chain based on telemetry.
+
+    ``analysis`` is the optional pre-computed :class:`TextAnalysis` of ``draft``.
+    ``table`` overrides :data:`DEFAULT_ROUTING_TABLE`.  Floors come from the
+    request's ``context`` when one is given.
+    """
+
+    floors = context.floors if context is not None else get_floors()
+    compiled = _compiled_table(table or DEFAULT_ROUTING_TABLE, floors)
+    return compiled.evaluate(_DraftFeatures(task, draft, metrics, analysis, {}, {}))
+
+
+def route_many(
+    requests: Iterable[Tuple[str, str, Mapping[str, Any] | Metrics]],
+    *,
+    analyses: Optional[Sequence[Optional[TextAnalysis]]] = None,
+    table: Optional[RoutingTable] = None,
+) -> List[str]:
+    """Route a batch of ``(task, draft, metrics)`` triples in order.
+
+    Floors are read and the table compiled once per batch, and noise and κᵣ are
+    computed at most once per distinct draft and ``(task, draft)`` pair.  Each
+    result equals :func:`route` on the same triple.
+    """
+
+    compiled = _compiled_table(table or DEFAULT_ROUTING_TABLE, get_floors())
+    noise: Dict[str, float] = {}
+    conductance: Dict[Tuple[str, str], float] = {}
+    results: List[str] = []
+    for index, (task, draft, metrics) in enumerate(requests):
+        analysis = analyses[index] if analyses is not None else None
+        features = _DraftFeatures(task, draft, metrics, analysis, noise, conductance)
+        results.append(compiled.evaluate(features))
+    return results
+
+
+__all__ = ["DEFAULT_ROUTING_TABLE", "noise_score", "route", "route_many"]
@@ -0,0 +1,134 @@
+"""Declarative routing tables for Compass-888.
+
+A :class:`RoutingTable` is an ordered list of :class:`Rule` objects, each a
+conjunction of :class:`Condition` checks over named features (telemetry metrics
+or text-derived scores) that maps to a target module.  The first rule whose
+conditions all hold wins; when none does, the table's ``default`` is returned.
+Disjunctions are written as consecutive rules sharing a target.
+
+:meth:`RoutingTable.compile` resolves :class:`Floor` thresholds against a floor
+configuration once and orders each rule's conditions from cheapest to most
+expensive feature.  Because conditions short-circuit and features are fetched
+lazily, an expensive feature (such as κᵣ conductance) is only computed when
+every cheaper condition of its rule already holds.
+"""
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from typing import Callable, Mapping, Optional, Tuple, Union
+
+_OPERATORS: Mapping[str, Callable[[float, float], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+@dataclass(frozen=True)
+class Floor:
+    """Threshold read from the floor configuration at compile time."""
+
+    name: str
+    default: float
+    offset: float = 0.0
+
+    def resolve(self, floors: Mapping[str, float]) -> float:
+        return floors.get(self.name, self.default) + self.offset
+
+
+@dataclass(frozen=True)
+class Condition:
+    """``feature <op> bound`` where ``bound`` is a constant or a :class:`Floor`."""
+
+    feature: str
+    op: str
+    bound: Union[float, Floor]
+
+    def __post_init__(self) -> None:
+        if self.op not in _OPERATORS:
+            raise ValueError(f"Unknown routing operator {self.op!r}")
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Route to ``target`` when every condition in ``when`` holds."""
+
+    target: str
+    when: Tuple[Condition, ...]
+
+
+CompiledRule = Tuple[str, Tuple[Tuple[str, Callable[[float, float], bool], float], ...]]
+
+
+class CompiledTable:
+    """Routing table with thresholds resolved and conditions cost-ordered."""
+
+    __slots__ = ("rules", "default")
+
+    def __init__(self, rules: Tuple[CompiledRule, ...], default: str) -> None:
+        self.rules = rules
+        self.default = default
+
+    def evaluate(self, feature: Callable[[str], float]) -> str:
+        """Return the target of the first matching rule.
+
+        ``feature(name)`` is only called for the features a rule actually
+        reaches; callers should memoise it when features are expensive.
+        """
+
+        for target, checks in self.rules:
+            for name, compare, threshold in checks:
+                if not compare(feature(name), threshold):
+                    break
+            else:
+                return target
+        return self.default
+
+
+@dataclass(frozen=True)
+class RoutingTable:
+    """Ordered routing rules plus the fallback target."""
+
+    rules: Tuple[Rule, ...]
+    default: str
+
+    def compile(
+        self,
+        floors: Mapping[str, float],
+        costs: Optional[Mapping[str, int]] = None,
+    ) -> CompiledTable:
+        """Resolve floors and sort each rule's conditions by feature ``costs``.
+
+        Features missing from ``costs`` are treated as free.  The sort is stable,
+        so conditions of equal cost keep their declared order.
+        """
+
+        costs = costs or {}
+        compiled = []
+        for rule in self.rules:
+            ordered = sorted(rule.when, key=lambda condition: costs.get(condition.feature, 0))
+            checks = tuple(
+                (
+                    condition.feature,
+                    _OPERATORS[condition.op],
+                    float(
+                        condition.bound.resolve(floors)
+                        if isinstance(condition.bound, Floor)
+                        else condition.bound
+                    ),
+                )
+                for condition in ordered
+            )
+            compiled.append((rule.target, checks))
+        return CompiledTable(tuple(compiled), self.default)
+
+
+__all__ = [
+    "CompiledTable",
+    "Condition",
+    "Floor",
+    "Rule",
+    "RoutingTable",
+]
@@ -1,4 +1,28 @@
 """Equilibrium helpers for rate limiting and SABAR orchestration."""
-from .eee import limiter, phoenix_schedule, sabar_orchestrate
+from .eee import (
+    alimiter,
+    clear_cooling_cache,
+    configure_cooling_cache,
+    cooling_cache_info,
+    limiter,
+    limiter_decision,
+    phoenix_schedule,
+    sabar_orchestrate,
+)
+from .phoenix import AuditResult, PhoenixScheduler
+from .ratelimit import RateDecision, SharedRateLimiter
 
-__all__ = ["limiter", "phoenix_schedule", "sabar_orchestrate"]
+__all__ = [
+    "AuditResult",
+    "PhoenixScheduler",
+    "RateDecision",
+    "SharedRateLimiter",
+    "alimiter",
+    "clear_cooling_cache",
+    "configure_cooling_cache",
+    "cooling_cache_info",
+    "limiter",
+    "limiter_decision",
+    "phoenix_schedule",
+    "sabar_orchestrate",
+]
@@ -1,16 +1,25 @@
 """Equilibrium heuristics for EEE-777."""
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import asdict, is_dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, Mapping
+from typing import Any, Dict, Mapping, Optional, Tuple
 
-import json
 import os
+import threading
+import time
 
-from platform.psi.psi_score import Metrics, SABARPause, get_floors
+from platform.cooling_ledger.aio import run_ledger_io
+from platform.psi.psi_score import Metrics, Refusal, floors_version, get_floors, refuse
+from packages.apex_prime.judge import EvaluationContext, Verdict
+from packages.arif_asi.analysis import _hash_text
 from packages.arif_asi.asi import assess_tone, tune
+from packages.arif_asi.lexicon import lexicon_version
+
+from .ratelimit import RateDecision, SharedRateLimiter, get_rate_limiter
+from .recent import recent_psi
 
 _LEDGER_FILENAME = "ledger.jsonl"
 
@@ -30,33 +39,25 @@ def _normalize_metrics(metrics: Mapping[str, Any] | Metrics) -> Dict[str, float]
     return {key: float(value) for key, value in metrics.items()}
 
 
-def _recent_entries(agent: str, limit: int = 5) -> Iterable[Dict[str, Any]]:
-    path = _ledger_path()
-    if not path.exists():
-        return []
-
-    entries: list[Dict[str, Any]] = []
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                record = json.loads(line)
-            except json.JSONDecodeError:  # pragma: no cover - defensive
-                continue
-            if record.get("agent") == agent:
-                entries.append(record)
-    return entries[-limit:]
+# Suggested wait before retrying a request the Ψ trend deferred.
+_PSI_RETRY_AFTER = 1.0
 
 
-def limiter(agent: str, metrics: Mapping[str, Any] | Metrics) -> str:
-    """Return ``allow``, ``delay``, or ``block`` based on Ψ trends and floors."""
-
-    floors = get_floors()
+def _psi_decision(
+    agent: str,
+    metrics: Mapping[str, Any] | Metrics,
+    verdict: Optional[Verdict],
+    context: Optional[EvaluationContext] = None,
+) -> str:
+    floors = context.floors if context is not None else get_floors()
     normalized = _normalize_metrics(metrics)
+    if verdict is None and context is not None:
+        verdict = context.bind(metrics).verdict
     psi_floor = floors.get("psi_min", 0.95)
-    psi_value = float(normalized.get("psi") or normalized.get("Ψ") or 0.0)
+    if verdict is not None:
+        psi_value = verdict.psi
+    else:
+        psi_value = float(normalized.get("psi") or normalized.get("Ψ") or 0.0)
 
     if psi_value <= 0.0:
         psi_value = max(
@@ -71,8 +72,7 @@ def limiter(agent: str, metrics: Mapping[str, Any] | Metrics) -> str:
         return "block"
 
     near_threshold = psi_floor + 0.02
-    recent = list(_recent_entries(agent))
-    near_recent = sum(1 for entry in recent if float(entry.get("metrics", {}).get("psi", 0.0)) < near_threshold)
+    near_recent = sum(1 for psi in recent_psi(agent, _ledger_path()) if psi < near_threshold)
 
     if psi_value < near_threshold:
         return "block" if near_recent >= 1 else "delay"
@@ -83,28 +83,203 @@ def limiter(agent: str, metrics: Mapping[str, Any] | Metrics) -> str:
     return "allow"
 
 
-def sabar_orchestrate(draft: str, metrics: Mapping[str, Any] | Metrics) -> Dict[str, Any]:
-    """Run SABAR cooling loop and return the cooled draft payload."""
-
-    floors = get_floors()
-    normalized = _normalize_metrics(metrics)
-
-    if normalized.get("truth", 0.0) < floors.get("truth", 0.99):
-        raise SABARPause("Truth below governance floors during SABAR.")
-    if normalized.get("deltaS", 0.0) < floors.get("deltaS", 0.0):
-        raise SABARPause("ΔS below governance floors during SABAR.")
-
+def limiter_decision(
+    agent: str,
+    metrics: Mapping[str, Any] | Metrics,
+    *,
+    verdict: Optional[Verdict] = None,
+    context: Optional[EvaluationContext] = None,
+    rate_limiter: Optional[SharedRateLimiter] = None,
+) -> RateDecision:
+    """Return the limiter decision together with a suggested ``retry_after``.
+
+    Ψ trends are judged first.  A ``block`` or ``delay`` there is returned
+    as is (a Ψ delay suggests ``_PSI_RETRY_AFTER`` seconds) without touching
+    the agent's request budget; only requests Ψ allows are charged against
+    ``rate_limiter`` (the host-wide limiter from ``ARIFOS_RATE_LIMIT`` by
+    default, disabled when unset), whose decision is then returned.
+    """
+
+    decision = _psi_decision(agent, metrics, verdict, context)
+    if decision == "block":
+        return RateDecision("block")
+    if decision == "delay":
+        return RateDecision("delay", _PSI_RETRY_AFTER)
+    rate_limiter = rate_limiter or get_rate_limiter()
+    if rate_limiter is None:
+        return RateDecision("allow")
+    return rate_limiter.acquire(agent)
+
+
+def limiter(
+    agent: str,
+    metrics: Mapping[str, Any] | Metrics,
+    *,
+    verdict: Optional[Verdict] = None,
+    context: Optional[EvaluationContext] = None,
+    rate_limiter: Optional[SharedRateLimiter] = None,
+) -> str:
+    """Return ``allow``, ``delay``, or ``block`` based on Ψ trends and floors.
+
+    When the request's :class:`Verdict` is supplied, or an
+    :class:`EvaluationContext` with metrics bound, its Ψ and floors are used
+    directly.  See :func:`limiter_decision` for request-rate limiting.
+    """
+
+    return limiter_decision(
+        agent, metrics, verdict=verdict, context=context, rate_limiter=rate_limiter
+    ).decision
+
+
+async def alimiter(
+    agent: str,
+    metrics: Mapping[str, Any] | Metrics,
+    *,
+    verdict: Optional[Verdict] = None,
+    context: Optional[EvaluationContext] = None,
+    rate_limiter: Optional[SharedRateLimiter] = None,
+) -> str:
+    """Async :func:`limiter`; its ledger reads run on the ledger I/O thread."""
+
+    return await run_ledger_io(
+        limiter, agent, metrics, verdict=verdict, context=context, rate_limiter=rate_limiter
+    )
+
+
+_COOLING_CACHE_SIZE = 512
+_COOLING_CACHE_TTL = 900.0
+
+CoolingKey = Tuple[str, str, str]
+_cooling_cache: "OrderedDict[CoolingKey, Tuple[float, Dict[str, Any] | Refusal]]" = OrderedDict()
+_cooling_lock = threading.Lock()
+_cooling_stats: Dict[str, int] = {"hits": 0, "misses": 0, "expired": 0}
+
+
+def _cool(draft: str, floors: Dict[str, float]) -> Dict[str, Any] | Refusal:
+    """Return the cooled payload for ``draft``, or the ``cooling_failed`` refusal."""
+
+    peace2_floor = floors.get("peace2", 1.0)
+    rasa_floor = floors.get("rasa", 0.85)
     tone = assess_tone(draft)
-    if tone["peace2_hint"] >= floors.get("peace2", 1.0) and tone["rasa"] >= floors.get("rasa", 0.85):
+    if tone["peace2_hint"] >= peace2_floor and tone["rasa"] >= rasa_floor:
         return {"draft": draft, "tone": tone, "modified": False}
 
-    tuned = tune(draft, target_peace2=floors.get("peace2", 1.0))
+    tuned = tune(draft, target_peace2=peace2_floor)
     new_tone = {"rasa": tuned["rasa"], "peace2_hint": tuned["peace2_hint"]}
 
-    if new_tone["peace2_hint"] < floors.get("peace2", 1.0) or new_tone["rasa"] < floors.get("rasa", 0.85):
-        raise SABARPause("Cooling unsuccessful; escalation required.")
+    if new_tone["peace2_hint"] < peace2_floor or new_tone["rasa"] < rasa_floor:
+        return Refusal(code="cooling_failed", reason="Cooling unsuccessful; escalation required.")
+
+    return {
+        "draft": tuned["text"],
+        "tone": new_tone,
+        "modified": bool(tuned.get("modified", False)),
+    }
+
+
+def _cached_cool(
+    draft: str,
+    floors: Dict[str, float],
+    version: Optional[str] = None,
+) -> Dict[str, Any] | Refusal:
+    """Memoise :func:`_cool` by draft hash, floors version, and lexicon version.
+
+    Cooling is deterministic for a given key, so a hit returns exactly what a
+    fresh run would.  Entries expire after ``_COOLING_CACHE_TTL`` seconds.
+    """
+
+    if _COOLING_CACHE_SIZE <= 0:
+        return _cool(draft, floors)
+
+    key = (_hash_text(draft), version or floors_version(floors), lexicon_version())
+    now = time.monotonic()
+    with _cooling_lock:
+        cached = _cooling_cache.get(key)
+        if cached is not None:
+            if cached[0] > now:
+                _cooling_cache.move_to_end(key)
+                _cooling_stats["hits"] += 1
+                return cached[1]
+            del _cooling_cache[key]
+            _cooling_stats["expired"] += 1
+        _cooling_stats["misses"] += 1
+
+    outcome = _cool(draft, floors)
+    with _cooling_lock:
+        _cooling_cache[key] = (now + _COOLING_CACHE_TTL, outcome)
+        _cooling_cache.move_to_end(key)
+        while len(_cooling_cache) > _COOLING_CACHE_SIZE:
+            _cooling_cache.popitem(last=False)
+    return outcome
+
+
+def configure_cooling_cache(maxsize: Optional[int] = None, ttl: Optional[float] = None) -> None:
+    """Resize the cooled-draft cache or change its TTL; ``maxsize=0`` disables it."""
+
+    global _COOLING_CACHE_SIZE, _COOLING_CACHE_TTL
+    with _cooling_lock:
+        if maxsize is not None:
+            _COOLING_CACHE_SIZE = maxsize
+        if ttl is not None:
+            _COOLING_CACHE_TTL = ttl
+        while len(_cooling_cache) > max(_COOLING_CACHE_SIZE, 0):
+            _cooling_cache.popitem(last=False)
+
+
+def cooling_cache_info() -> Dict[str, float]:
+    """Return hit/miss/expiry counters, the hit rate, and the cache size."""
+
+    with _cooling_lock:
+        info: Dict[str, float] = {
+            **_cooling_stats,
+            "size": len(_cooling_cache),
+            "maxsize": _COOLING_CACHE_SIZE,
+            "ttl": _COOLING_CACHE_TTL,
+        }
+    lookups = info["hits"] + info["misses"]
+    info["hit_rate"] = info["hits"] / lookups if lookups else 0.0
+    return info
+
+
+def clear_cooling_cache() -> None:
+    """Drop every cooled draft and reset the counters."""
+
+    with _cooling_lock:
+        _cooling_cache.clear()
+        for key in _cooling_stats:
+            _cooling_stats[key] = 0
+
+
+def sabar_orchestrate(
+    draft: str,
+    metrics: Mapping[str, Any] | Metrics,
+    *,
+    raise_on_refusal: bool = True,
+    context: Optional[EvaluationContext] = None,
+) -> Dict[str, Any] | Refusal:
+    """Run SABAR cooling loop and return the cooled draft payload.
+
+    Floor breaches and failed cooling raise :class:`SABARPause`, or return a
+    :class:`Refusal` when ``raise_on_refusal`` is false.  Cooling outcomes are
+    cached per draft; see :func:`cooling_cache_info`.  Floors come from the
+    request's ``context`` when one is given.
+    """
+
+    floors = context.floors if context is not None else get_floors()
+    normalized = _normalize_metrics(metrics)
+
+    if normalized.get("truth", 0.0) < floors.get("truth", 0.99):
+        return refuse(
+            "truth_floor", "Truth below governance floors during SABAR.", raise_on_refusal
+        )
+    if normalized.get("deltaS", 0.0) < floors.get("deltaS", 0.0):
+        return refuse("deltaS_floor", "ΔS below governance floors during SABAR.", raise_on_refusal)
 
-    return {"draft": tuned["text"], "tone": new_tone, "modified": bool(tuned.get("modified", False))}
+    version = context.floors_version if context is not None else None
+    outcome = _cached_cool(draft, floors, version)
+    if isinstance(outcome, Refusal):
+        return refuse(outcome.code, outcome.reason, raise_on_refusal)
+    return {**outcome, "tone": dict(outcome["tone"])}
 
 
 def phoenix_schedule(reference: datetime | None = None) -> str:
@@ -115,4 +290,13 @@ def phoenix_schedule(reference: datetime | None = None) -> str:
     return next_audit.isoformat()
 
 
-__all__ = ["limiter", "phoenix_schedule", "sabar_orchestrate"]
+__all__ = [
+    "alimiter",
+    "clear_cooling_cache",
+    "configure_cooling_cache",
+    "cooling_cache_info",
+    "limiter",
+    "limiter_decision",
+    "phoenix_schedule",
+    "sabar_orchestrate",
+]
@@ -0,0 +1,426 @@
+"""Persistent Phoenix-72 re-audit scheduler.
+
+Every sealed plan is re-audited 72 hours after sealing: its ΔS and Peace² are
+checked again against the floors in force at audit time.  :class:`PhoenixScheduler`
+keeps pending audits in a min-heap ordered by due time, so scheduling and
+popping cost O(log n) even with millions of pending plans.  Each change is
+appended to a JSONL journal that is replayed (and compacted) on start, so the
+queue survives restarts; audits are delivered at least once.
+
+Due audits are popped in batches and run on a thread or process pool with
+bounded concurrency.  An audit that raises is retried with exponential
+backoff; after ``max_attempts`` failures it is reported as a failed
+:class:`AuditResult` carrying the error, so one bad plan never stops
+:meth:`PhoenixScheduler.serve`.  :meth:`PhoenixScheduler.attach` subscribes to
+Cooling Ledger writes so every sealed plan is scheduled automatically.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from platform.cooling_ledger.sdk import add_write_listener, remove_write_listener
+from platform.psi.psi_score import get_floors
+
+PHOENIX_WINDOW_SECONDS = 72 * 3600
+# The runloop's final seal; the AGI draft entry shares its plan_id but is not sealed.
+_SEALING_AGENT = "integration"
+
+
+@dataclass(frozen=True)
+class AuditItem:
+    """Pending Phoenix-72 re-audit for one sealed plan."""
+
+    plan_id: str
+    due: float
+    deltaS: float
+    peace2: float
+    content_hash: Optional[str] = None
+    seq: int = 0
+    attempts: int = 0
+
+
+@dataclass(frozen=True)
+class AuditResult:
+    """Outcome of re-auditing a plan against the current floors."""
+
+    plan_id: str
+    passed: bool
+    audited_at: float
+    breaches: Tuple[str, ...] = field(default_factory=tuple)
+    error: Optional[str] = None
+
+
+def reaudit(item: AuditItem, floors: Optional[Mapping[str, float]] = None) -> AuditResult:
+    """Re-check ``item``'s ΔS and Peace² against ``floors`` (current floors by default)."""
+
+    floors = floors or get_floors()
+    breaches = []
+    if item.deltaS < floors.get("deltaS", 0.0):
+        breaches.append("deltaS")
+    if item.peace2 < floors.get("peace2", 1.0):
+        breaches.append("peace2")
+    return AuditResult(
+        plan_id=item.plan_id,
+        passed=not breaches,
+        audited_at=time.time(),
+        breaches=tuple(breaches),
+    )
+
+
+def _guarded_audit(audit: Callable[[AuditItem], AuditResult], item: AuditItem) -> AuditResult | str:
+    """Run ``audit`` on ``item``, returning the error text instead of raising."""
+
+    try:
+        return audit(item)
+    except Exception as exc:
+        return f"{type(exc).__name__}: {exc}"
+
+
+def _parse_ts(value: Any) -> Optional[float]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+class PhoenixScheduler:
+    """Min-heap of pending re-audits backed by an append-only journal.
+
+    ``executor`` selects a ``"thread"`` or ``"process"`` pool of ``workers``
+    for :meth:`run_due`; ``audit`` must be picklable for process pools.  A
+    failed audit is retried after ``retry_backoff * 2 ** attempts`` seconds, up
+    to ``max_attempts`` attempts in all.
+    """
+
+    def __init__(
+        self,
+        journal_path: str | os.PathLike[str],
+        *,
+        workers: int = 4,
+        batch_size: int = 256,
+        executor: str = "thread",
+        audit: Callable[[AuditItem], AuditResult] = reaudit,
+        max_attempts: int = 5,
+        retry_backoff: float = 60.0,
+    ) -> None:
+        if executor not in {"thread", "process"}:
+            raise ValueError("executor must be 'thread' or 'process'")
+        if workers < 1 or batch_size < 1 or max_attempts < 1:
+            raise ValueError("workers, batch_size, and max_attempts must be positive")
+        if retry_backoff < 0:
+            raise ValueError("retry_backoff must not be negative")
+        self.journal_path = Path(journal_path)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.executor_kind = executor
+        self.audit = audit
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._pending: Dict[str, AuditItem] = {}
+        self._seq = 0
+        self._journal_records = 0
+        self._executor: Optional[Executor] = None
+        self._listener: Optional[Callable[..., None]] = None
+        self._replay()
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self._journal = self.journal_path.open("a", encoding="utf-8")
+
+    # -- persistence -----------------------------------------------------
+
+    def _replay(self) -> None:
+        if not self.journal_path.exists():
+            return
+        pending: Dict[str, AuditItem] = {}
+        with self.journal_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:  # pragma: no cover - torn final line
+                    continue
+                self._journal_records += 1
+                seq = int(event.get("seq", 0))
+                self._seq = max(self._seq, seq)
+                plan_id = event.get("plan_id")
+                if event.get("op") == "schedule":
+                    pending[plan_id] = AuditItem(
+                        plan_id=plan_id,
+                        due=float(event["due"]),
+                        deltaS=float(event["deltaS"]),
+                        peace2=float(event["peace2"]),
+                        content_hash=event.get("hash"),
+                        seq=seq,
+                        attempts=int(event.get("attempts", 0)),
+                    )
+                elif event.get("op") == "done":
+                    current = pending.get(plan_id)
+                    if current is not None and current.seq == seq:
+                        del pending[plan_id]
+        self._pending = pending
+        self._heap = [(item.due, item.seq, item.plan_id) for item in pending.values()]
+        heapq.heapify(self._heap)
+        if self._journal_records > 2 * len(pending) + 1024:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the journal with only the pending audits."""
+
+        temp_path = self.journal_path.with_suffix(self.journal_path.suffix + ".tmp")
+        with temp_path.open("w", encoding="utf-8") as handle:
+            for item in self._pending.values():
+                handle.write(json.dumps(self._schedule_event(item), sort_keys=True) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.journal_path)
+        self._journal_records = len(self._pending)
+
+    @staticmethod
+    def _schedule_event(item: AuditItem) -> Dict[str, Any]:
+        return {
+            "op": "schedule",
+            "plan_id": item.plan_id,
+            "due": item.due,
+            "deltaS": item.deltaS,
+            "peace2": item.peace2,
+            "hash": item.content_hash,
+            "seq": item.seq,
+            "attempts": item.attempts,
+        }
+
+    def _append(self, events: Iterable[Mapping[str, Any]]) -> None:
+        lines = [json.dumps(event, sort_keys=True) + "\n" for event in events]
+        self._journal.writelines(lines)
+        self._journal.flush()
+        self._journal_records += len(lines)
+
+    # -- scheduling ------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def schedule(
+        self,
+        plan_id: str,
+        metrics: Mapping[str, Any],
+        *,
+        sealed_at: Optional[float] = None,
+        due: Optional[float] = None,
+        content_hash: Optional[str] = None,
+    ) -> AuditItem:
+        """Schedule (or reschedule) ``plan_id`` for re-audit.
+
+        ``due`` defaults to ``sealed_at`` (or now) plus 72 hours.  Rescheduling
+        a pending plan replaces its previous audit.
+        """
+
+        if due is None:
+            due = (sealed_at if sealed_at is not None else time.time()) + PHOENIX_WINDOW_SECONDS
+        with self._lock:
+            self._seq += 1
+            item = AuditItem(
+                plan_id=plan_id,
+                due=float(due),
+                deltaS=float(metrics.get("deltaS", 0.0)),
+                peace2=float(metrics.get("peace2", 0.0)),
+                content_hash=content_hash,
+                seq=self._seq,
+            )
+            self._pending[plan_id] = item
+            heapq.heappush(self._heap, (item.due, item.seq, plan_id))
+            self._append([self._schedule_event(item)])
+        return item
+
+    def next_due(self) -> Optional[float]:
+        """Return the due time of the earliest pending audit."""
+
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def _drop_stale(self) -> None:
+        heap = self._heap
+        while heap:
+            _, seq, plan_id = heap[0]
+            current = self._pending.get(plan_id)
+            if current is not None and current.seq == seq:
+                return
+            heapq.heappop(heap)
+
+    def pop_due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[AuditItem]:
+        """Remove and return up to ``limit`` audits due at ``now``, earliest first."""
+
+        now = time.time() if now is None else now
+        limit = limit or self.batch_size
+        due: List[AuditItem] = []
+        with self._lock:
+            heap = self._heap
+            while heap and len(due) < limit and heap[0][0] <= now:
+                _, seq, plan_id = heapq.heappop(heap)
+                current = self._pending.get(plan_id)
+                if current is None or current.seq != seq:
+                    continue
+                del self._pending[plan_id]
+                due.append(current)
+        return due
+
+    def _requeue(self, items: Iterable[AuditItem]) -> None:
+        """Return popped but unaudited ``items`` to the queue unless rescheduled since."""
+
+        with self._lock:
+            for item in items:
+                if item.plan_id in self._pending:
+                    continue
+                self._pending[item.plan_id] = item
+                heapq.heappush(self._heap, (item.due, item.seq, item.plan_id))
+
+    def _retry(self, item: AuditItem, due: float) -> None:
+        """Reschedule a failed ``item`` for ``due`` unless rescheduled since."""
+
+        with self._lock:
+            if item.plan_id in self._pending:
+                return
+            self._seq += 1
+            retry = replace(item, due=due, seq=self._seq, attempts=item.attempts + 1)
+            self._pending[item.plan_id] = retry
+            heapq.heappush(self._heap, (retry.due, retry.seq, retry.plan_id))
+            self._append([self._schedule_event(retry)])
+
+    def complete(self, items: Iterable[AuditItem]) -> None:
+        """Journal ``items`` as audited so they are not replayed after a restart."""
+
+        with self._lock:
+            self._append({"op": "done", "plan_id": item.plan_id, "seq": item.seq} for item in items)
+            if self._journal_records > 2 * len(self._pending) + 1024:
+                self._journal.close()
+                self._compact()
+                self._journal = self.journal_path.open("a", encoding="utf-8")
+
+    # -- execution -------------------------------------------------------
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            pool = ProcessPoolExecutor if self.executor_kind == "process" else ThreadPoolExecutor
+            self._executor = pool(max_workers=self.workers)
+        return self._executor
+
+    def run_due(self, now: Optional[float] = None) -> List[AuditResult]:
+        """Audit every item due at ``now`` in batches and return the results.
+
+        Failed audits are rescheduled with backoff and left out of the results
+        until their last attempt, which yields a failed result with ``error``.
+        """
+
+        results: List[AuditResult] = []
+        audit = partial(_guarded_audit, self.audit)
+        while True:
+            batch = self.pop_due(now)
+            if not batch:
+                return results
+            executor = self._get_executor()
+            chunksize = max(1, len(batch) // (self.workers * 4))
+            outcomes: List[AuditResult | str] = []
+            try:
+                if self.executor_kind == "process":
+                    audited = executor.map(audit, batch, chunksize=chunksize)
+                else:
+                    audited = executor.map(audit, batch)
+                outcomes.extend(audited)
+            except BaseException:
+                # Results arrive in order: journal the audited prefix, requeue the rest.
+                self.complete(batch[:len(outcomes)])
+                self._requeue(batch[len(outcomes):])
+                raise
+            failed_at = time.time() if now is None else now
+            for item, outcome in zip(batch, outcomes):
+                if isinstance(outcome, AuditResult):
+                    results.append(outcome)
+                elif item.attempts + 1 < self.max_attempts:
+                    self._retry(item, failed_at + self.retry_backoff * 2 ** item.attempts)
+                else:
+                    results.append(
+                        AuditResult(
+                            plan_id=item.plan_id,
+                            passed=False,
+                            audited_at=time.time(),
+                            error=outcome,
+                        )
+                    )
+            self.complete(batch)
+
+    def serve(
+        self,
+        stop: threading.Event,
+        *,
+        poll_interval: float = 60.0,
+        on_results: Optional[Callable[[List[AuditResult]], None]] = None,
+    ) -> None:
+        """Run due audits until ``stop`` is set, sleeping until the next due item."""
+
+        while not stop.is_set():
+            results = self.run_due()
+            if results and on_results is not None:
+                on_results(results)
+            next_due = self.next_due()
+            wait = poll_interval if next_due is None else min(poll_interval, next_due - time.time())
+            stop.wait(max(wait, 0.0))
+
+    # -- ledger integration ----------------------------------------------
+
+    def _on_ledger_write(self, path: Path, record: Dict[str, Any], start: int, end: int) -> None:
+        if record.get("agent") != _SEALING_AGENT:
+            return
+        plan_id = (record.get("metadata") or {}).get("plan_id")
+        if isinstance(plan_id, str) and plan_id:
+            self.schedule(
+                plan_id,
+                record.get("metrics") or {},
+                sealed_at=_parse_ts(record.get("ts")),
+                content_hash=record.get("hash"),
+            )
+
+    def attach(self) -> None:
+        """Schedule a re-audit for every plan sealed in the Cooling Ledger.
+
+        Only the runloop's ``integration`` seal schedules a plan, with the
+        metrics that were sealed; other entries sharing its ``plan_id`` (such as
+        the AGI draft) are ignored.
+        """
+
+        if self._listener is None:
+            self._listener = self._on_ledger_write
+            add_write_listener(self._listener)
+
+    def detach(self) -> None:
+        if self._listener is not None:
+            remove_write_listener(self._listener)
+            self._listener = None
+
+    def close(self) -> None:
+        self.detach()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        with self._lock:
+            self._journal.close()
+
+
+__all__ = [
+    "AuditItem",
+    "AuditResult",
+    "PHOENIX_WINDOW_SECONDS",
+    "PhoenixScheduler",
+    "reaudit",
+]
@@ -0,0 +1,257 @@
+"""Host-wide request-rate limiting for EEE-777.
+
+:func:`packages.eee_777.eee.limiter` judges Ψ trends but not how often an agent
+asks to seal.  :class:`SharedRateLimiter` adds a per-agent token bucket (steady
+``rate`` with ``burst`` headroom) combined with a sliding-window counter
+(at most ``window_limit`` requests per ``window`` seconds).  State lives in a
+:mod:`multiprocessing.shared_memory` segment guarded by an ``flock`` so every
+worker process on a host draws from the same budget without touching the
+Cooling Ledger.
+
+Decisions use the limiter vocabulary: ``allow`` consumes a token, ``delay``
+means capacity returns within ``max_delay`` seconds, and ``block`` means it
+does not.  Every decision carries a suggested ``retry_after`` in seconds.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterator, Optional
+
+try:  # pragma: no cover - exercised implicitly on POSIX hosts
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX fallback
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_NAME = "arifos-eee-ratelimit"
+
+_MAGIC = b"ARIFRL01"
+_HEADER = struct.Struct("<8sIIdddII")
+_SLOT = struct.Struct("<QdddII")
+
+
+@dataclass(frozen=True)
+class RateDecision:
+    """Outcome of a rate or limiter check."""
+
+    decision: str
+    retry_after: float = 0.0
+
+    @property
+    def allowed(self) -> bool:
+        return self.decision == "allow"
+
+
+def _agent_key(agent: str) -> int:
+    key = int.from_bytes(hashlib.blake2b(agent.encode("utf-8"), digest_size=8).digest(), "little")
+    return key or 1
+
+
+class SharedRateLimiter:
+    """Token bucket plus sliding window per agent, shared across processes.
+
+    The first process to open ``name`` creates the segment and fixes its
+    configuration; later processes attach and use the stored configuration.
+    Up to ``slots`` agents are tracked; once the table is full, new agents
+    share the budget of the slot their name hashes to.  The segment outlives
+    the processes using it until :meth:`unlink` is called.
+    """
+
+    def __init__(
+        self,
+        name: str = DEFAULT_NAME,
+        *,
+        rate: float = 5.0,
+        burst: float = 10.0,
+        window: float = 60.0,
+        window_limit: int = 120,
+        slots: int = 256,
+        max_delay: float = 1.0,
+    ) -> None:
+        if rate <= 0 or burst < 1 or window <= 0 or window_limit < 1 or slots < 1:
+            raise ValueError("rate, burst, window, window_limit, and slots must be positive")
+        self.name = name
+        self.max_delay = max_delay
+        self._thread_lock = threading.Lock()
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._lock_handle = open(self._lock_path, "a+b")
+        with self._locked():
+            self._shm = self._open(_HEADER.size + slots * _SLOT.size)
+            magic, _, stored_slots, stored_rate, stored_burst, stored_window, stored_limit, _ = (
+                _HEADER.unpack_from(self._shm.buf, 0)
+            )
+            if magic != _MAGIC:
+                _HEADER.pack_into(
+                    self._shm.buf, 0, _MAGIC, 1, slots, rate, burst, window, window_limit, 0
+                )
+            else:
+                slots, rate, burst, window, window_limit = (
+                    stored_slots,
+                    stored_rate,
+                    stored_burst,
+                    stored_window,
+                    stored_limit,
+                )
+        self.slots = slots
+        self.rate = rate
+        self.burst = burst
+        self.window = window
+        self.window_limit = window_limit
+
+    def _open(self, size: int) -> shared_memory.SharedMemory:
+        try:
+            shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        except FileExistsError:
+            shm = shared_memory.SharedMemory(name=self.name)
+        # The segment is a host-wide budget; do not unlink it when this process exits.
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return shm
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._thread_lock:
+            if fcntl is not None:
+                fcntl.flock(self._lock_handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_handle.fileno(), fcntl.LOCK_UN)
+
+    def _slot_offset(self, key: int) -> int:
+        buf = self._shm.buf
+        start = key % self.slots
+        for probe in range(self.slots):
+            index = (start + probe) % self.slots
+            offset = _HEADER.size + index * _SLOT.size
+            stored = _SLOT.unpack_from(buf, offset)[0]
+            if stored == key:
+                return offset
+            if stored == 0:
+                _SLOT.pack_into(buf, offset, key, float(self.burst), -1.0, -1.0, 0, 0)
+                return offset
+        return _HEADER.size + start * _SLOT.size
+
+    def _window_wait(self, elapsed: float, current: int, previous: int) -> float:
+        """Seconds until the sliding-window estimate admits one more request."""
+
+        window, limit = self.window, self.window_limit
+        room = limit - 1 - current
+        if room >= 0:
+            if previous <= room:
+                return 0.0
+            return max(window * (1.0 - room / previous) - elapsed, 0.0)
+        # The current window alone is over budget; wait for it to roll over.
+        wait = window - elapsed
+        if current > limit - 1:
+            wait += window * (1.0 - (limit - 1) / current)
+        return max(wait, 0.0)
+
+    def acquire(
+        self,
+        agent: str,
+        cost: float = 1.0,
+        *,
+        now: Optional[float] = None,
+    ) -> RateDecision:
+        """Consume ``cost`` tokens for ``agent`` when both limits allow it."""
+
+        key = _agent_key(agent)
+        with self._locked():
+            now = time.monotonic() if now is None else now
+            offset = self._slot_offset(key)
+            _, tokens, refilled, window_start, current, previous = _SLOT.unpack_from(
+                self._shm.buf, offset
+            )
+            if refilled >= 0:
+                tokens = min(self.burst, tokens + max(now - refilled, 0.0) * self.rate)
+            if window_start < 0:
+                window_start = now
+            windows_passed = max(int((now - window_start) // self.window), 0)
+            if windows_passed == 1:
+                previous, current = current, 0
+            elif windows_passed > 1:
+                previous, current = 0, 0
+            window_start += windows_passed * self.window
+            elapsed = now - window_start
+
+            token_wait = max(cost - tokens, 0.0) / self.rate
+            window_wait = self._window_wait(elapsed, current, previous)
+            retry_after = max(token_wait, window_wait)
+            if retry_after == 0.0:
+                tokens -= cost
+                current += 1
+            _SLOT.pack_into(
+                self._shm.buf, offset, key, tokens, now, window_start, current, previous
+            )
+
+        if retry_after == 0.0:
+            return RateDecision("allow")
+        return RateDecision("delay" if retry_after <= self.max_delay else "block", retry_after)
+
+    def reset(self) -> None:
+        """Forget every agent's usage."""
+
+        with self._locked():
+            size = self.slots * _SLOT.size
+            self._shm.buf[_HEADER.size:_HEADER.size + size] = bytes(size)
+
+    def close(self) -> None:
+        self._shm.close()
+        self._lock_handle.close()
+
+    def unlink(self) -> None:
+        """Remove the shared segment; attached processes keep their mapping."""
+
+        # ``SharedMemory.unlink`` unregisters the name from the resource tracker.
+        resource_tracker.register(self._shm._name, "shared_memory")  # type: ignore[attr-defined]
+        self._shm.unlink()
+
+
+_default: Optional[SharedRateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def _parse_spec(spec: str) -> dict:
+    options: dict = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        key, _, value = part.partition("=")
+        key = key.strip()
+        if key not in {"rate", "burst", "window", "window_limit", "slots", "max_delay", "name"}:
+            raise ValueError(f"Unknown rate limit option: {key!r}")
+        options[key] = value.strip() if key == "name" else float(value)
+    for key in ("window_limit", "slots"):
+        if key in options:
+            options[key] = int(options[key])
+    return options
+
+
+def get_rate_limiter() -> Optional[SharedRateLimiter]:
+    """Return the host-wide limiter configured by ``ARIFOS_RATE_LIMIT``, if any.
+
+    The variable holds comma-separated options, e.g.
+    ``rate=5,burst=10,window=60,window_limit=120``.  When unset, rate limiting
+    is disabled and ``None`` is returned.
+    """
+
+    global _default
+    if _default is None:
+        spec = os.getenv("ARIFOS_RATE_LIMIT")
+        if not spec:
+            return None
+        with _default_lock:
+            if _default is None:
+                _default = SharedRateLimiter(**_parse_spec(spec))
+    return _default
+
+
+__all__ = ["DEFAULT_NAME", "RateDecision", "SharedRateLimiter", "get_rate_limiter"]
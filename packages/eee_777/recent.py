@@ -0,0 +1,214 @@
+"""Per-agent ring buffers of recent Ψ values for the EEE limiter.
+
+The limiter only needs the last few Ψ values an agent wrote to the Cooling
+Ledger.  Instead of parsing the whole ledger on every call, each ledger file is
+mirrored by a :class:`_LedgerTail` holding a fixed-size deque per agent:
+
+* ledger writes made through :func:`platform.cooling_ledger.sdk.write_entry`
+  in this process are pushed into the buffers by a write listener;
+* appends made by other processes are detected with a single ``stat`` and only
+  the new bytes are read;
+* a process starting cold reads the ledger backwards from its end, a block at a
+  time, and stops as soon as the requested agent's buffer is full.
+
+A query therefore costs one ``stat`` plus work proportional to the bytes
+appended since the previous query, independent of the ledger's total size.
+The ledger is append-only; a file that is replaced (new inode) or found shorter
+than the mirrored prefix is rebuilt from scratch.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, Mapping, Optional, Tuple
+
+from platform.cooling_ledger.sdk import add_write_listener
+
+RECENT_LIMIT = 5
+_BLOCK_SIZE = 64 * 1024
+
+
+def _psi_of(record: Mapping[str, Any]) -> float:
+    try:
+        return float((record.get("metrics") or {}).get("psi", 0.0))
+    except (TypeError, ValueError):  # pragma: no cover - defensive
+        return 0.0
+
+
+def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        record = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):  # pragma: no cover - defensive
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _reverse_lines(path: str, end: int) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(offset, line)`` for complete lines before ``end``, last line first."""
+
+    with open(path, "rb") as handle:
+        position = end
+        carry = b""
+        while position > 0:
+            step = min(_BLOCK_SIZE, position)
+            position -= step
+            handle.seek(position)
+            chunk = handle.read(step) + carry
+            lines = chunk.split(b"\n")
+            carry = lines[0]
+            offset = position + len(carry) + 1
+            tail = []
+            for line in lines[1:]:
+                tail.append((offset, line))
+                offset += len(line) + 1
+            yield from reversed(tail)
+        if carry:
+            yield 0, carry
+
+
+class _LedgerTail:
+    """Ring-buffer mirror of one ledger file."""
+
+    __slots__ = ("path", "lock", "inode", "offset", "floor", "buffers")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self._reset(None, 0)
+
+    def _reset(self, inode: Optional[int], offset: int) -> None:
+        self.inode = inode
+        # Bytes before ``offset`` are mirrored; bytes before ``floor`` have not
+        # been back-filled yet by the reverse cold-start scan.
+        self.offset = offset
+        self.floor = offset
+        self.buffers: Dict[str, Deque[float]] = {}
+
+    def _buffer(self, agent: str) -> Deque[float]:
+        buffer = self.buffers.get(agent)
+        if buffer is None:
+            buffer = self.buffers[agent] = deque(maxlen=RECENT_LIMIT)
+        return buffer
+
+    def push(self, record: Mapping[str, Any]) -> None:
+        agent = record.get("agent")
+        if isinstance(agent, str):
+            self._buffer(agent).append(_psi_of(record))
+
+    def _complete_end(self, size: int) -> int:
+        """Return the offset just past the last newline before ``size``."""
+
+        with open(self.path, "rb") as handle:
+            position = size
+            while position > 0:
+                step = min(_BLOCK_SIZE, position)
+                handle.seek(position - step)
+                chunk = handle.read(step)
+                index = chunk.rfind(b"\n")
+                if index >= 0:
+                    return position - step + index + 1
+                position -= step
+        return 0
+
+    def sync(self) -> None:
+        """Bring the mirror up to date with the file on disk."""
+
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._reset(None, 0)
+            return
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            self._reset(stat.st_ino, self._complete_end(stat.st_size))
+            return
+        if stat.st_size == self.offset:
+            return
+        with open(self.path, "rb") as handle:
+            handle.seek(self.offset)
+            appended = handle.read(stat.st_size - self.offset)
+        complete = appended.rfind(b"\n") + 1
+        for line in appended[:complete].split(b"\n"):
+            record = _parse(line)
+            if record is not None:
+                self.push(record)
+        self.offset += complete
+
+    def backfill(self, agent: str) -> None:
+        """Scan backwards from ``floor`` until ``agent``'s buffer is full."""
+
+        target = self._buffer(agent)
+        if self.floor == 0 or len(target) == RECENT_LIMIT:
+            return
+        floor = self.floor
+        for offset, line in _reverse_lines(self.path, self.floor):
+            floor = offset
+            record = _parse(line)
+            if record is not None:
+                name = record.get("agent")
+                if isinstance(name, str):
+                    buffer = self._buffer(name)
+                    if len(buffer) < RECENT_LIMIT:
+                        buffer.appendleft(_psi_of(record))
+            if len(target) == RECENT_LIMIT:
+                break
+        else:
+            floor = 0
+        self.floor = floor
+
+    def recent(self, agent: str) -> Tuple[float, ...]:
+        with self.lock:
+            self.sync()
+            self.backfill(agent)
+            buffer = self.buffers.get(agent)
+            return tuple(buffer) if buffer else ()
+
+    def observe(self, record: Mapping[str, Any], start: int, end: int) -> None:
+        with self.lock:
+            if self.inode is not None and start == self.offset:
+                self.push(record)
+                self.offset = end
+            # Otherwise another writer interleaved; the next sync() catches up.
+
+
+_tails: Dict[str, _LedgerTail] = {}
+_tails_lock = threading.Lock()
+
+
+def _tail_for(path: Path | str) -> _LedgerTail:
+    key = os.path.abspath(path)
+    tail = _tails.get(key)
+    if tail is None:
+        with _tails_lock:
+            tail = _tails.setdefault(key, _LedgerTail(key))
+    return tail
+
+
+def recent_psi(agent: str, path: Path | str) -> Tuple[float, ...]:
+    """Return up to the last five Ψ values ``agent`` wrote to the ledger at ``path``."""
+
+    return _tail_for(path).recent(agent)
+
+
+def clear_recent_psi() -> None:
+    """Forget every mirrored ledger so the next query starts cold."""
+
+    with _tails_lock:
+        _tails.clear()
+
+
+def _on_ledger_write(path: Path, record: Dict[str, Any], start: int, end: int) -> None:
+    tail = _tails.get(os.path.abspath(path))
+    if tail is not None:
+        tail.observe(record, start, end)
+
+
+add_write_listener(_on_ledger_write)
+
+
+__all__ = ["RECENT_LIMIT", "clear_recent_psi", "recent_psi"]
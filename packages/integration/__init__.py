@@ -1,4 +1,17 @@
 """Integration flow for the Core-5 runloop."""
-from .runloop import RunloopResult, runloop
+from .cache import clear_result_cache, configure_result_cache, result_cache_info
+from .runloop import RunloopResult, arunloop, encode_result, runloop, runloop_many
+from .speculative import reset_speculation_stats, speculation_stats
 
-__all__ = ["runloop", "RunloopResult"]
+__all__ = [
+    "arunloop",
+    "clear_result_cache",
+    "configure_result_cache",
+    "encode_result",
+    "runloop",
+    "runloop_many",
+    "result_cache_info",
+    "RunloopResult",
+    "reset_speculation_stats",
+    "speculation_stats",
+]
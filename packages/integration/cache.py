@@ -0,0 +1,172 @@
+"""Opt-in end-to-end result cache for the integration runloop.
+
+Retries and duplicate submissions of the same ``(task, initial_draft)`` would
+otherwise re-run planning, scoring, routing, and cooling only for the ledger's
+idempotency scan to discard the write.  When enabled with
+:func:`configure_result_cache`, sealed results are kept in an LRU with a TTL and
+a repeat run returns the original result, including its existing seal, without
+touching the ledger.  A repeat still passes the EEE limiter, so cache hits
+count against Ψ-trend delays and the request-rate limit like any other run.
+
+Entries are keyed by the input hash, the floors version, the lexicon version,
+and the ledger path, so changing floors or lexicons (or pointing at another
+ledger) never serves a stale seal.  Each entry also remembers the ledger
+file's identity and size when it was stored; once that file is replaced or
+truncated, the entry is dropped as stale.  Only sealed results are cached: delays
+depend on limiter history and refusals are cheap.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from platform.cooling_ledger.sdk import _ledger_key
+from platform.psi.psi_score import floors_version
+from packages.arif_asi.lexicon import lexicon_version
+
+_RESULT_CACHE_SIZE = 0
+_RESULT_CACHE_TTL = 300.0
+
+ResultKey = Tuple[str, str, str, str]
+LedgerIdentity = Tuple[int, int, int]
+_result_cache: "OrderedDict[ResultKey, Tuple[float, LedgerIdentity, Dict[str, Any]]]" = (
+    OrderedDict()
+)
+_result_lock = threading.Lock()
+_result_stats: Dict[str, int] = {"hits": 0, "misses": 0, "expired": 0, "stale": 0}
+
+
+def _ledger_identity(path: str) -> Optional[LedgerIdentity]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino, stat.st_size
+
+
+def _same_ledger(stored: LedgerIdentity, current: Optional[LedgerIdentity]) -> bool:
+    """Whether the ledger is still the file the seal went into, not truncated since."""
+
+    return current is not None and current[:2] == stored[:2] and current[2] >= stored[2]
+
+
+def input_key(task: str, initial_draft: Optional[str], floors: Mapping[str, float]) -> ResultKey:
+    """Identify a run by its input hash, floors and lexicon versions, and ledger."""
+
+    canonical = json.dumps([task, initial_draft or None], separators=(",", ":"))
+    return (
+        hashlib.sha256(canonical.encode("utf-8")).hexdigest(),
+        floors_version(dict(floors)),
+        lexicon_version(),
+        _ledger_key(),
+    )
+
+
+def result_key(
+    task: str,
+    initial_draft: Optional[str],
+    floors: Mapping[str, float],
+) -> Optional[ResultKey]:
+    """Return the cache key for a run, or ``None`` while the cache is disabled."""
+
+    if _RESULT_CACHE_SIZE <= 0:
+        return None
+    return input_key(task, initial_draft, floors)
+
+
+def cached_result(key: Optional[ResultKey]) -> Optional[Dict[str, Any]]:
+    """Return a copy of the sealed result stored under ``key``, if still fresh.
+
+    An entry whose ledger file has since been replaced or truncated is dropped.
+    """
+
+    if key is None:
+        return None
+    now = time.monotonic()
+    current = _ledger_identity(key[3])
+    with _result_lock:
+        cached = _result_cache.get(key)
+        if cached is not None:
+            if cached[0] <= now:
+                _result_stats["expired"] += 1
+            elif not _same_ledger(cached[1], current):
+                _result_stats["stale"] += 1
+            else:
+                _result_cache.move_to_end(key)
+                _result_stats["hits"] += 1
+                return copy.deepcopy(cached[2])
+            del _result_cache[key]
+        _result_stats["misses"] += 1
+    return None
+
+
+def store_result(key: Optional[ResultKey], result: Mapping[str, Any]) -> None:
+    """Remember ``result`` under ``key`` when it is sealed."""
+
+    if key is None or result.get("status") != "sealed":
+        return
+    identity = _ledger_identity(key[3])
+    if identity is None:
+        return
+    entry = (time.monotonic() + _RESULT_CACHE_TTL, identity, copy.deepcopy(dict(result)))
+    with _result_lock:
+        if _RESULT_CACHE_SIZE <= 0:
+            return
+        _result_cache[key] = entry
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+
+def configure_result_cache(maxsize: Optional[int] = None, ttl: Optional[float] = None) -> None:
+    """Enable (``maxsize > 0``), resize, or disable the result cache, or change its TTL."""
+
+    global _RESULT_CACHE_SIZE, _RESULT_CACHE_TTL
+    with _result_lock:
+        if maxsize is not None:
+            _RESULT_CACHE_SIZE = maxsize
+        if ttl is not None:
+            _RESULT_CACHE_TTL = ttl
+        while len(_result_cache) > max(_RESULT_CACHE_SIZE, 0):
+            _result_cache.popitem(last=False)
+
+
+def result_cache_info() -> Dict[str, float]:
+    """Return hit/miss/expiry/stale counters, the hit rate, and the cache size."""
+
+    with _result_lock:
+        info: Dict[str, float] = {
+            **_result_stats,
+            "size": len(_result_cache),
+            "maxsize": _RESULT_CACHE_SIZE,
+            "ttl": _RESULT_CACHE_TTL,
+        }
+    lookups = info["hits"] + info["misses"]
+    info["hit_rate"] = info["hits"] / lookups if lookups else 0.0
+    return info
+
+
+def clear_result_cache() -> None:
+    """Drop every cached result and reset the counters."""
+
+    with _result_lock:
+        _result_cache.clear()
+        for key in _result_stats:
+            _result_stats[key] = 0
+
+
+__all__ = [
+    "cached_result",
+    "clear_result_cache",
+    "configure_result_cache",
+    "input_key",
+    "result_cache_info",
+    "result_key",
+    "store_result",
+]
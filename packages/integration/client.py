@@ -0,0 +1,212 @@
+"""Client library for the local runloop server.
+
+Every message in either direction is one frame: a 4-byte big-endian unsigned
+length followed by that many bytes of UTF-8 JSON.  A request is
+``{"id", "op", ...}``: ``op`` is ``"runloop"`` (the default, with ``task``,
+``initial_draft``, and ``raise_on_refusal``) or ``"ping"``.  The response is
+``{"id", **result}`` where ``result`` is what :func:`runloop_many` returns for
+one item.  A connection answers its requests in order, so requests may be
+pipelined; see :meth:`RunloopClient.runloop_many`.
+
+Addresses are ``"host:port"`` or ``(host, port)`` for localhost TCP, and
+``"unix:/path"`` or any path containing ``/`` for a Unix socket.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import socket
+import struct
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from .runloop import RunloopItem
+
+HEADER = struct.Struct(">I")
+MAX_FRAME = 16 * 1024 * 1024
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+
+Address = Union[str, "os.PathLike[str]", Tuple[str, int]]
+
+
+def parse_address(address: Address) -> Tuple[int, Any]:
+    """Return the socket ``(family, sockaddr)`` for ``address``."""
+
+    if isinstance(address, tuple):
+        host, port = address
+        return socket.AF_INET6 if ":" in host else socket.AF_INET, (host, int(port))
+    text = os.fspath(address)
+    if text.startswith("unix:"):
+        return socket.AF_UNIX, text[len("unix:"):]
+    if isinstance(address, os.PathLike) or "/" in text:
+        return socket.AF_UNIX, text
+    host, _, port = text.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"invalid address {text!r}; expected host:port or unix:PATH")
+    host = host.strip("[]")
+    return socket.AF_INET6 if ":" in host else socket.AF_INET, (host, int(port))
+
+
+def format_address(sock: socket.socket) -> str:
+    """Return the ``host:port`` or ``unix:PATH`` address ``sock`` is bound to."""
+
+    name = sock.getsockname()
+    if sock.family == socket.AF_UNIX:
+        return f"unix:{name}"
+    host = f"[{name[0]}]" if sock.family == socket.AF_INET6 else name[0]
+    return f"{host}:{name[1]}"
+
+
+def encode_frame(body: bytes) -> bytes:
+    return HEADER.pack(len(body)) + body
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytearray]:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            if received:
+                raise ConnectionError("connection closed mid-frame")
+            return None
+        received += count
+    return buffer
+
+
+def read_frame(sock: socket.socket, max_frame: int = MAX_FRAME) -> Optional[bytes]:
+    """Return the next frame's body, or ``None`` when the peer closed cleanly."""
+
+    header = _recv_exactly(sock, HEADER.size)
+    if header is None:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > max_frame:
+        raise ConnectionError(f"frame of {length} bytes exceeds the {max_frame} byte limit")
+    body = _recv_exactly(sock, length) if length else bytearray()
+    if body is None:
+        raise ConnectionError("connection closed mid-frame")
+    return bytes(body)
+
+
+class RunloopClient:
+    """Persistent connection to a runloop server; safe to share between threads.
+
+    Results match :func:`runloop_many` items, except that ``metrics`` arrive as
+    a plain mapping rather than a :class:`Metrics` instance.
+    """
+
+    def __init__(
+        self,
+        address: Address = DEFAULT_ADDRESS,
+        *,
+        timeout: Optional[float] = 60.0,
+    ) -> None:
+        family, sockaddr = parse_address(address)
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(sockaddr)
+        except OSError:
+            self._sock.close()
+            raise
+        if family != socket.AF_UNIX:
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+
+    def _send(self, payload: Mapping[str, Any]) -> None:
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self._sock.sendall(encode_frame(body))
+
+    def _receive(self, request_id: int) -> Dict[str, Any]:
+        body = read_frame(self._sock)
+        if body is None:
+            raise ConnectionError("server closed the connection")
+        response = json.loads(body)
+        if response.pop("id", None) != request_id:
+            raise ConnectionError("response does not match the pending request")
+        return response
+
+    def request(self, payload: Mapping[str, Any]) -> Dict[str, Any]:
+        """Send one request and return its response without the ``id``."""
+
+        with self._lock:
+            request_id = next(self._ids)
+            self._send({**payload, "id": request_id})
+            return self._receive(request_id)
+
+    def runloop(
+        self,
+        task: str,
+        *,
+        initial_draft: Optional[str] = None,
+        raise_on_refusal: bool = False,
+    ) -> Dict[str, Any]:
+        """Run ``task`` on the server; refusals come back as ``"refused"`` results."""
+
+        return self.request(
+            {
+                "op": "runloop",
+                "task": task,
+                "initial_draft": initial_draft,
+                "raise_on_refusal": raise_on_refusal,
+            }
+        )
+
+    def runloop_many(
+        self,
+        tasks: Iterable[RunloopItem],
+        *,
+        window: int = 32,
+    ) -> List[Dict[str, Any]]:
+        """Pipeline ``tasks`` over this connection and return the results in input order.
+
+        Up to ``window`` requests are outstanding at a time.  The server works
+        through one connection's requests sequentially; open several clients
+        to use more than one worker.
+        """
+
+        results: List[Dict[str, Any]] = []
+        pending: Deque[int] = deque()
+        with self._lock:
+            for item in tasks:
+                request_id = next(self._ids)
+                if isinstance(item, str):
+                    payload: Dict[str, Any] = {"task": item}
+                else:
+                    payload = {"task": item.get("task"), "initial_draft": item.get("initial_draft")}
+                self._send({"id": request_id, "op": "runloop", **payload})
+                pending.append(request_id)
+                if len(pending) >= window:
+                    results.append(self._receive(pending.popleft()))
+            while pending:
+                results.append(self._receive(pending.popleft()))
+        return results
+
+    def ping(self) -> Dict[str, Any]:
+        """Return ``{"status": "ok", "pid"}`` from the worker serving this connection."""
+
+        return self.request({"op": "ping"})
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def __enter__(self) -> "RunloopClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+__all__ = [
+    "DEFAULT_ADDRESS",
+    "RunloopClient",
+    "encode_frame",
+    "format_address",
+    "parse_address",
+    "read_frame",
+]
@@ -0,0 +1,189 @@
+"""Offline corpus re-scoring for tone and TEARFRAME metrics.
+
+Whenever lexicons or floors change, historical drafts are re-scored with
+:func:`assess_tone` and :func:`evaluate_metrics`.  :func:`score_corpus` streams
+drafts from a JSONL file, stdin, or a directory of ``.txt`` files, fans chunked
+batches out to a process pool whose workers load the lexicon once, and yields
+results back in input order while keeping at most ``max_in_flight`` batches in
+memory.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from packages.arif_agi.metrics import evaluate_metrics
+from packages.arif_asi.asi import assess_tone
+from packages.arif_asi.lexicon import get_lexicon, load_lexicon, set_lexicon
+from platform.psi.psi_score import get_floors
+
+Record = Dict[str, Any]
+
+
+def _records_from_lines(handle: IO[str], origin: str) -> Iterator[Record]:
+    for line_number, line in enumerate(handle, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{origin}:{line_number}: invalid JSON record") from exc
+        draft = payload.get("draft", payload.get("text"))
+        if not isinstance(draft, str):
+            raise ValueError(f"{origin}:{line_number}: record needs a 'draft' string")
+        yield {
+            "id": payload.get("id", line_number),
+            "task": str(payload.get("task", "")),
+            "draft": draft,
+        }
+
+
+def iter_drafts(source: str | os.PathLike[str] | IO[str]) -> Iterator[Record]:
+    """Yield ``{"id", "task", "draft"}`` records from ``source`` lazily.
+
+    ``source`` may be an open text stream, ``"-"`` for stdin, a JSONL file with
+    one ``{"draft": ..., "task": ..., "id": ...}`` object per line (``text`` is
+    accepted as an alias for ``draft``), or a directory whose ``*.txt`` files are
+    read in sorted order with the file name as ``id``.
+    """
+
+    if hasattr(source, "read"):
+        yield from _records_from_lines(source, "<stream>")  # type: ignore[arg-type]
+        return
+    if str(source) == "-":
+        yield from _records_from_lines(sys.stdin, "<stdin>")
+        return
+
+    path = Path(source)
+    if path.is_dir():
+        for file_path in sorted(path.glob("*.txt")):
+            yield {
+                "id": file_path.name,
+                "task": "",
+                "draft": file_path.read_text(encoding="utf-8"),
+            }
+        return
+    with path.open("r", encoding="utf-8") as handle:
+        yield from _records_from_lines(handle, str(path))
+
+
+def _init_worker(lexicon_path: Optional[str]) -> None:
+    """Load the lexicon and floors once per worker process."""
+
+    if lexicon_path:
+        set_lexicon(load_lexicon(lexicon_path))
+    get_floors()
+
+
+def score_draft(record: Record) -> Record:
+    """Return tone and metrics for a single corpus record."""
+
+    draft = record["draft"]
+    tone = assess_tone(draft)
+    metrics = evaluate_metrics(record.get("task", ""), draft)
+    return {
+        "id": record.get("id"),
+        "tone": {"rasa": tone["rasa"], "peace2_hint": tone["peace2_hint"]},
+        "metrics": asdict(metrics),
+    }
+
+
+def _score_batch(batch: Sequence[Record]) -> List[Record]:
+    return [score_draft(record) for record in batch]
+
+
+def _batched(records: Iterable[Record], batch_size: int) -> Iterator[List[Record]]:
+    batch: List[Record] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def score_corpus(
+    source: str | os.PathLike[str] | IO[str] | Iterable[Record],
+    *,
+    workers: Optional[int] = None,
+    batch_size: int = 64,
+    max_in_flight: Optional[int] = None,
+    lexicon_path: Optional[str] = None,
+) -> Iterator[Record]:
+    """Score every draft in ``source`` and yield results in input order.
+
+    ``source`` is anything accepted by :func:`iter_drafts` or an iterable of
+    records.  ``workers`` defaults to the CPU count; ``workers=1`` scores inline
+    without a pool.  At most ``max_in_flight`` batches (default ``2 * workers``)
+    are queued at once, which bounds memory regardless of corpus size.
+    """
+
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    if isinstance(source, (str, os.PathLike)) or hasattr(source, "read"):
+        records: Iterable[Record] = iter_drafts(source)  # type: ignore[arg-type]
+    else:
+        records = source  # type: ignore[assignment]
+
+    workers = workers or os.cpu_count() or 1
+    batches = _batched(records, batch_size)
+
+    if workers == 1:
+        previous = get_lexicon()
+        _init_worker(lexicon_path)
+        try:
+            for batch in batches:
+                yield from _score_batch(batch)
+        finally:
+            set_lexicon(previous)
+        return
+
+    window = max_in_flight or 2 * workers
+    pending: Deque[Future[List[Record]]] = deque()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(lexicon_path,)
+    ) as executor:
+        try:
+            for batch in batches:
+                pending.append(executor.submit(_score_batch, batch))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-score a draft corpus as JSONL.")
+    parser.add_argument("source", help="JSONL file, directory of .txt drafts, or '-' for stdin")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--lexicon", default=None, help="lexicon directory or JSON file")
+    args = parser.parse_args(argv)
+
+    for result in score_corpus(
+        args.source,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        lexicon_path=args.lexicon,
+    ):
+        sys.stdout.write(json.dumps(result, sort_keys=True) + "\n")
+    return 0
+
+
+__all__ = ["iter_drafts", "score_corpus", "score_draft"]
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
@@ -2,26 +2,100 @@
 from __future__ import annotations
 
 import hashlib
-from dataclasses import asdict, dataclass
-from typing import Any, Dict, List, Optional
+import json
+import math
+import os
+from contextlib import nullcontext
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from json.encoder import encode_basestring_ascii
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
 
+from platform.concurrency import SingleFlight
+from platform.cooling_ledger.aio import Steps, adrive, drive, ledger_executor
 from platform.psi.psi_score import (
     Metrics,
-    SABARPause,
+    Refusal,
     get_floors,
-    psi_from,
+    refuse,
 )
-from packages.arif_agi.agent import AGIResponse, respond
+from platform.telemetry import Trace, capture, span
+from packages.arif_agi.agent import AGIResponse, respond_steps
+from packages.arif_asi.analysis import analyze
 from packages.arif_agi.metrics import evaluate_metrics
 from packages.arif_agi.planner import plan_and_reason
-from packages.apex_prime.judge import seal_if_lawful
+from packages.apex_prime.judge import EvaluationContext, seal_if_lawful
 from packages.compass_888.compass import route
 from packages.eee_777.eee import limiter, sabar_orchestrate
 
+from .cache import cached_result, input_key, result_key, store_result
+from .speculative import claim, cooling_likely, discard, speculate_cooling
 
-@dataclass(frozen=True)
+
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+_metric_values = attrgetter(*(item.name for item in fields(Metrics)))
+_METRICS_TEMPLATE = "{%s}" % ",".join(f'"{item.name}":%s' for item in fields(Metrics))
+
+
+def _json_metrics(metrics: Metrics) -> str:
+    values = _metric_values(metrics)
+    try:
+        numbers = tuple(map(float.__repr__, values))
+    except TypeError:  # a metric that is not a float
+        numbers = ()
+    # Finite float reprs never contain "n"; "nan" and "inf" need JSON's spelling.
+    if not numbers or "n" in "".join(numbers):
+        numbers = tuple(map(_json_value, values))
+    return _METRICS_TEMPLATE % numbers
+
+
+def _json_value(value: Any) -> str:
+    kind = value.__class__
+    if kind is str:
+        return encode_basestring_ascii(value)
+    if kind is float and math.isfinite(value):
+        return float.__repr__(value)
+    if kind is Metrics:
+        return _json_metrics(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if kind is int:
+        return int.__repr__(value)
+    return _encode_json(value)
+
+
+def encode_result(result: Mapping[str, Any]) -> bytes:
+    """Encode a runloop result mapping as compact JSON, including its ``Metrics``.
+
+    Produces the same document as ``json.dumps`` over the result with metrics
+    expanded by ``asdict``, keeping the mapping's key order.
+    """
+
+    return (
+        "{"
+        + ",".join(
+            [
+                f"{encode_basestring_ascii(key)}:{_json_value(value)}"
+                for key, value in result.items()
+            ]
+        )
+        + "}"
+    ).encode("ascii")
+
+
+@dataclass(frozen=True, slots=True)
 class RunloopResult:
-    """Schema guard for integration outcomes."""
+    """Schema guard for integration outcomes.
+
+    Use :meth:`trusted` to skip validation for results assembled by the runloop
+    itself; :meth:`to_bytes` and :meth:`to_json` encode it with
+    :func:`encode_result`.
+    """
 
     status: str
     draft: str
@@ -70,6 +144,29 @@ class RunloopResult:
             "route_history": list(self.route_history),
         }
 
+    @classmethod
+    def trusted(cls, **values: Any) -> "RunloopResult":
+        """Build a result without running the ``__post_init__`` checks."""
+
+        if values.keys() != _RESULT_FIELDS_SET:
+            raise TypeError(f"trusted() requires exactly the fields {list(_RESULT_FIELDS)}")
+        result = object.__new__(cls)
+        for name in _RESULT_FIELDS:
+            object.__setattr__(result, name, values[name])
+        return result
+
+    def to_bytes(self) -> bytes:
+        """Return the result as compact ASCII JSON."""
+
+        return encode_result(self.to_dict())
+
+    def to_json(self) -> str:
+        return self.to_bytes().decode("ascii")
+
+
+_RESULT_FIELDS = tuple(item.name for item in fields(RunloopResult))
+_RESULT_FIELDS_SET = frozenset(_RESULT_FIELDS)
+
 
 def _hash_text(payload: str) -> str:
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -78,11 +175,22 @@ def _hash_text(payload: str) -> str:
 def _bootstrap(
     task: str,
     initial_draft: Optional[str],
-) -> tuple[str, Metrics, Dict[str, Any], Optional[AGIResponse], bool, Optional[str], List[str]]:
+    context: EvaluationContext,
+    *,
+    raise_on_refusal: bool = True,
+) -> Steps[
+    tuple[str, Metrics, Dict[str, Any], Optional[AGIResponse], bool, Optional[str], List[str]]
+    | Refusal
+]:
     """Return the starting draft, metrics, plan, AGI context, and provenance."""
 
     if not initial_draft:
-        agi_outcome = respond(task)
+        with span("runloop.agi"):
+            agi_outcome = yield from respond_steps(
+                task, raise_on_refusal=raise_on_refusal, context=context
+            )
+        if isinstance(agi_outcome, Refusal):
+            return agi_outcome
         return (
             agi_outcome.draft,
             agi_outcome.metrics,
@@ -93,8 +201,9 @@ def _bootstrap(
             ["arif-agi"],
         )
 
-    plan = plan_and_reason(task)
-    metrics = evaluate_metrics(task, initial_draft)
+    with span("runloop.seed"):
+        plan = plan_and_reason(task)
+        metrics = evaluate_metrics(task, initial_draft, context=context)
     return (
         initial_draft,
         metrics,
@@ -106,10 +215,97 @@ def _bootstrap(
     )
 
 
-def runloop(task: str, *, initial_draft: Optional[str] = None) -> Dict[str, Any]:
-    """Execute the Mind→Compass→Heart→Soul→EEE flow."""
+def _refused(refusal: Refusal, plan_id: Optional[str], route_history: List[str]) -> Dict[str, Any]:
+    return {**refusal.to_dict(), "plan_id": plan_id, "route_history": list(route_history)}
 
-    floors = get_floors()
+
+def _limiter_blocked(
+    plan_id: Optional[str],
+    route_history: List[str],
+    raise_on_refusal: bool,
+) -> Dict[str, Any]:
+    refusal = refuse(
+        "limiter_block",
+        "EEE limiter blocked the run due to repeated near-threshold Ψ.",
+        raise_on_refusal,
+    )
+    return _refused(refusal, plan_id, route_history)
+
+
+def _limit_cached(
+    cached: Dict[str, Any],
+    context: EvaluationContext,
+    raise_on_refusal: bool,
+) -> Steps[Dict[str, Any]]:
+    """Pass a cached sealed result through the EEE limiter before returning it."""
+
+    with span("runloop.limiter"):
+        limit_decision = yield (
+            limiter,
+            ("integration", {**asdict(cached["metrics"]), "psi": cached["psi"]}),
+            {"context": context},
+        )
+    if limit_decision == "allow":
+        return cached
+    # Delays and blocks report the route taken before the integration seal.
+    route_history = cached["route_history"][:-1]
+    if limit_decision == "delay":
+        return {**cached, "status": "delay", "seal_id": None, "route_history": route_history}
+    return _limiter_blocked(cached["plan_id"], route_history, raise_on_refusal)
+
+
+def _route(
+    task: str,
+    draft: str,
+    metrics: Metrics,
+    context: EvaluationContext,
+    speculative: bool,
+) -> tuple[str, Optional[Future]]:
+    """Route ``draft``, speculatively cooling it alongside when that looks likely."""
+
+    with span("runloop.route"):
+        analysis = analyze(draft)
+        pending = None
+        if speculative and cooling_likely(metrics, analysis, context.floors):
+            pending = speculate_cooling(task, draft, metrics, context)
+        chosen = route(task, draft, metrics, analysis=analysis, context=context)
+        if pending is not None and chosen != "arif-asi":
+            discard(pending)
+            pending = None
+    return chosen, pending
+
+
+def runloop_steps(
+    task: str,
+    *,
+    initial_draft: Optional[str] = None,
+    raise_on_refusal: bool = True,
+    speculative_cooling: bool = False,
+) -> Steps[Dict[str, Any]]:
+    """Step generator behind :func:`runloop` and :func:`arunloop`.
+
+    Yields each Cooling Ledger call (AGI sealing, limiter history, final seal)
+    for the driver to perform; see :mod:`platform.cooling_ledger.aio`.  When the
+    result cache is enabled a repeat of a sealed run skips planning, scoring,
+    routing, and cooling: it only passes the EEE limiter (Ψ trend and request
+    rate), which may turn the cached result into a delay or a block; see
+    :mod:`packages.integration.cache`.
+
+    One :class:`EvaluationContext` carries the floor snapshot through every
+    Core-5 call, so Ψ and the verdict of the final metrics are computed once.
+    """
+
+    context = EvaluationContext(get_floors())
+    floors = context.floors
+    cache_key = result_key(task, initial_draft, floors)
+    cached = cached_result(cache_key)
+    if cached is not None:
+        return (yield from _limit_cached(cached, context, raise_on_refusal))
+    bootstrap = yield from _bootstrap(
+        task, initial_draft, context, raise_on_refusal=raise_on_refusal
+    )
+    if isinstance(bootstrap, Refusal):
+        return _refused(bootstrap, None, [])
     (
         draft,
         metrics,
@@ -118,7 +314,7 @@ def runloop(task: str, *, initial_draft: Optional[str] = None) -> Dict[str, Any]
         seeded,
         seed_hash,
         route_history,
-    ) = _bootstrap(task, initial_draft)
+    ) = bootstrap
 
     plan_id = plan_data["plan_id"]
 
@@ -127,34 +323,65 @@ def runloop(task: str, *, initial_draft: Optional[str] = None) -> Dict[str, Any]
             metrics.truth < floors.get("truth", 0.99)
             or metrics.deltaS < floors.get("deltaS", 0.0)
         ):
-            raise SABARPause(
-                "Initial draft breaches core truth/ΔS floors; invoking refusal-first."
+            refusal = refuse(
+                "seed_floor_breach",
+                "Initial draft breaches core truth/ΔS floors; invoking refusal-first.",
+                raise_on_refusal,
             )
+            return _refused(refusal, plan_id, route_history)
 
-    chosen = route(task, draft, metrics)
+    chosen, pending = _route(task, draft, metrics, context, speculative_cooling)
     route_history.append(f"compass:{chosen}")
     if chosen == "arif-agi":
-        agi_context = respond(task)
+        with span("runloop.agi"):
+            agi_context = yield from respond_steps(
+                task, raise_on_refusal=raise_on_refusal, context=context
+            )
+        if isinstance(agi_context, Refusal):
+            return _refused(agi_context, plan_id, route_history)
         draft = agi_context.draft
         metrics = agi_context.metrics
         plan_data = agi_context.plan
         plan_id = agi_context.plan_id
         route_history.append("arif-agi")
-        chosen = route(task, draft, metrics)
+        chosen, pending = _route(task, draft, metrics, context, speculative_cooling)
         route_history.append(f"compass:{chosen}")
 
     if chosen == "arif-asi":
-        cooling = sabar_orchestrate(draft, metrics)
-        draft = cooling["draft"]
-        metrics = evaluate_metrics(task, draft)
+        with span("runloop.cooling"):
+            cooled_metrics = None
+            if pending is not None:
+                cooling, cooled_metrics = claim(pending)
+                if isinstance(cooling, Refusal):
+                    cooling = refuse(cooling.code, cooling.reason, raise_on_refusal)
+            else:
+                cooling = sabar_orchestrate(
+                    draft, metrics, raise_on_refusal=raise_on_refusal, context=context
+                )
+            if not isinstance(cooling, Refusal):
+                draft = cooling["draft"]
+                metrics = cooled_metrics or evaluate_metrics(
+                    task, draft, analysis=analyze(draft), context=context
+                )
+        if isinstance(cooling, Refusal):
+            return _refused(cooling, plan_id, route_history)
         route_history.append("arif-asi")
         chosen = "apex-prime"
         route_history.append(f"compass:{chosen}")
 
-    psi = psi_from(metrics, floors)
-    limit_decision = limiter("integration", {**asdict(metrics), "psi": psi})
+    with span("runloop.verdict"):
+        verdict = context.bind(metrics).verdict
+    refusal = verdict.refusal
+    if refusal is not None:
+        refusal = refuse(refusal.code, refusal.reason, raise_on_refusal)
+        return _refused(refusal, plan_id, route_history)
+    psi = verdict.psi
+    with span("runloop.limiter"):
+        limit_decision = yield (
+            limiter, ("integration", {**asdict(metrics), "psi": psi}), {"context": context}
+        )
     if limit_decision == "delay":
-        result = RunloopResult(
+        result = RunloopResult.trusted(
             status="delay",
             draft=draft,
             route=chosen,
@@ -169,7 +396,7 @@ def runloop(task: str, *, initial_draft: Optional[str] = None) -> Dict[str, Any]
         )
         return result.to_dict()
     if limit_decision == "block":
-        raise SABARPause("EEE limiter blocked the run due to repeated near-threshold Ψ.")
+        return _limiter_blocked(plan_id, route_history, raise_on_refusal)
 
     draft_hash = _hash_text(draft)
     final_route_history = route_history + ["integration"]
@@ -184,15 +411,19 @@ def runloop(task: str, *, initial_draft: Optional[str] = None) -> Dict[str, Any]
     idempotency_key = (
         f"integration:{plan_id}:{draft_hash}:{chosen}:{seed_segment}:{route_signature}"
     )
-    seal_id = seal_if_lawful(
-        "integration",
-        metrics,
-        note=task,
-        plan_id=plan_id,
-        idempotency_key=idempotency_key,
-        metadata=metadata,
-    )
-    result = RunloopResult(
+    with span("runloop.seal"):
+        seal_id = yield (
+            seal_if_lawful,
+            ("integration", metrics),
+            {
+                "note": task,
+                "plan_id": plan_id,
+                "idempotency_key": idempotency_key,
+                "metadata": metadata,
+                "context": context,
+            },
+        )
+    result = RunloopResult.trusted(
         status="sealed",
         draft=draft,
         route=chosen,
@@ -205,7 +436,191 @@ def runloop(task: str, *, initial_draft: Optional[str] = None) -> Dict[str, Any]
         seed_hash=seed_hash,
         route_history=metadata["route_history"],
     )
-    return result.to_dict()
+    sealed = result.to_dict()
+    store_result(cache_key, sealed)
+    return sealed
+
+
+_runloop_flight = SingleFlight("integration.runloop")
+
+
+def _flight_key(task: str, initial_draft: Optional[str], raise_on_refusal: bool) -> tuple:
+    return (input_key(task, initial_draft, get_floors()), raise_on_refusal)
+
+
+def _check_trace(trace: bool, coalesce: bool) -> None:
+    # A coalesced follower does not run the stages, so it would see no spans.
+    if trace and coalesce:
+        raise ValueError("trace=True cannot be combined with coalesce=True")
+
+
+def _with_spans(result: Dict[str, Any], trace: Optional[Trace]) -> Dict[str, Any]:
+    if trace is None:
+        return result
+    return {**result, "spans": list(trace.spans)}
+
+
+def runloop(
+    task: str,
+    *,
+    initial_draft: Optional[str] = None,
+    raise_on_refusal: bool = True,
+    speculative_cooling: bool = False,
+    trace: bool = False,
+    coalesce: bool = False,
+) -> Dict[str, Any]:
+    """Execute the Mind→Compass→Heart→Soul→EEE flow.
+
+    Refusals raise :class:`SABARPause` (carrying a ``code``) by default.  With
+    ``raise_on_refusal=False`` the run returns ``{"status": "refused", "code",
+    "reason", "plan_id", "route_history"}`` instead, so batch callers with high
+    refusal rates never pay for exception unwinding.
+
+    ``speculative_cooling=True`` starts SABAR cooling in parallel with Compass
+    routing for drafts that look likely to need it; see
+    :mod:`packages.integration.speculative`.  Results are identical either way.
+
+    ``trace=True`` adds a ``"spans"`` list of ``{"name", "start_ns",
+    "duration_ns"}`` timings for every stage and ledger call to the result.
+    Stage timings also feed the histograms in :mod:`platform.telemetry` when
+    telemetry is enabled.
+
+    ``coalesce=True`` lets concurrent calls with the same task, seed draft,
+    floors, lexicon, and ledger share one execution and the same result object;
+    see :mod:`platform.concurrency.singleflight`.  Spans are captured on the
+    executing thread only, so ``trace`` and ``coalesce`` cannot be combined.
+    """
+
+    _check_trace(trace, coalesce)
+    steps = runloop_steps(
+        task,
+        initial_draft=initial_draft,
+        raise_on_refusal=raise_on_refusal,
+        speculative_cooling=speculative_cooling,
+    )
+    with capture() if trace else nullcontext() as collected, span("runloop"):
+        if coalesce:
+            key = _flight_key(task, initial_draft, raise_on_refusal)
+            result = _runloop_flight.do(key, drive, steps)
+        else:
+            result = drive(steps)
+    return _with_spans(result, collected)
+
+
+async def arunloop(
+    task: str,
+    *,
+    initial_draft: Optional[str] = None,
+    raise_on_refusal: bool = True,
+    speculative_cooling: bool = False,
+    executor: Optional[Executor] = None,
+    trace: bool = False,
+    coalesce: bool = False,
+) -> Dict[str, Any]:
+    """Asyncio-native :func:`runloop` returning the same results.
+
+    Every ledger read and write is awaited on the dedicated ledger I/O thread,
+    so many runs can share one event loop.  Pass ``executor`` to move planning,
+    scoring, and cooling off the event loop thread as well.
+    """
+
+    _check_trace(trace, coalesce)
+    steps = runloop_steps(
+        task,
+        initial_draft=initial_draft,
+        raise_on_refusal=raise_on_refusal,
+        speculative_cooling=speculative_cooling,
+    )
+    with capture() if trace else nullcontext() as collected, span("runloop"):
+        if coalesce:
+            key = _flight_key(task, initial_draft, raise_on_refusal)
+            result = await _runloop_flight.ado(key, lambda: adrive(steps, executor=executor))
+        else:
+            result = await adrive(steps, executor=executor)
+    return _with_spans(result, collected)
+
+
+RunloopItem = Union[str, Mapping[str, Any]]
+
+
+def _unpack_item(item: RunloopItem) -> tuple[str, Optional[str]]:
+    if isinstance(item, str):
+        return item, None
+    return str(item["task"]), item.get("initial_draft")
+
+
+def _error_result(task: Optional[str], exc: Exception) -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "task": task,
+        "code": getattr(exc, "code", None),
+        "error_type": type(exc).__name__,
+        "reason": str(exc),
+    }
+
+
+def _run_item(
+    item: RunloopItem,
+    raise_on_refusal: bool,
+    ledger: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    task = item if isinstance(item, str) else item.get("task")
+    try:
+        task, initial_draft = _unpack_item(item)
+        steps = runloop_steps(
+            task, initial_draft=initial_draft, raise_on_refusal=raise_on_refusal
+        )
+        return drive(steps, ledger=ledger)
+    except Exception as exc:
+        return _error_result(task, exc)
+
+
+def runloop_many(
+    tasks: Iterable[RunloopItem],
+    *,
+    workers: Optional[int] = None,
+    executor: str = "thread",
+    raise_on_refusal: bool = False,
+) -> List[Dict[str, Any]]:
+    """Run :func:`runloop` for a batch and return the results in input order.
+
+    Each item is a task string or ``{"task": ..., "initial_draft": ...}``.  Any
+    exception an item raises is captured as ``{"status": "error", "task",
+    "code", "error_type", "reason"}`` so one failure never aborts the batch;
+    refusals come back as ``"refused"`` results unless ``raise_on_refusal``.
+
+    With ``executor="thread"`` every ledger call is funnelled through the single
+    ledger writer thread.  With ``executor="process"`` each worker writes
+    directly under the ledger's cross-process lock.  Either way a plan's
+    ``arif-agi`` entry is written before its ``integration`` entry.
+    """
+
+    if executor not in {"thread", "process"}:
+        raise ValueError("executor must be 'thread' or 'process'")
+    items = list(tasks)
+    workers = workers or os.cpu_count() or 1
+    if executor == "process":
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(
+                pool.map(
+                    _run_item,
+                    items,
+                    [raise_on_refusal] * len(items),
+                    chunksize=max(1, len(items) // (workers * 4)),
+                )
+            )
+    ledger = ledger_executor()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(
+            pool.map(lambda item: _run_item(item, raise_on_refusal, ledger), items)
+        )
 
 
-__all__ = ["runloop", "RunloopResult"]
+__all__ = [
+    "arunloop",
+    "encode_result",
+    "runloop",
+    "runloop_many",
+    "runloop_steps",
+    "RunloopResult",
+]
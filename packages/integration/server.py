@@ -0,0 +1,310 @@
+"""Local runloop server with pre-forked workers and a single ledger writer.
+
+``python -m packages.integration.server --listen 127.0.0.1:8765 --workers 4``
+binds a localhost TCP port (or ``--listen unix:/path/to.sock``), starts one
+:class:`~platform.cooling_ledger.writer.LedgerWriter` process, and forks the
+workers.  Floors, lexicons, and the routing table are loaded once before the
+fork, so every worker starts warm.  Each worker accepts connections on the
+shared listening socket and runs the Core-5 pipeline in-process, sending every
+Cooling Ledger append to the writer, which group-commits the appends of all
+workers; ledger reads (the EEE limiter's Ψ history) stay in the workers.
+
+The server must be started from a process with no other threads running,
+before any thread pool is created; see :meth:`RunloopServer.start`.  The wire
+format is described in :mod:`packages.integration.client`.  A worker
+that exits is not replaced; :meth:`RunloopServer.serve_forever` returns once
+none are left.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import stat
+import sys
+import threading
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Sequence
+
+from platform.cooling_ledger.sdk import set_entry_appender
+from platform.cooling_ledger.writer import LedgerWriter, RemoteAppender
+from platform.psi.psi_score import floors_version, get_floors
+from packages.arif_agi.metrics import evaluate_metrics
+from packages.compass_888.compass import route
+
+from .client import (
+    DEFAULT_ADDRESS,
+    HEADER,
+    MAX_FRAME,
+    Address,
+    encode_frame,
+    format_address,
+    parse_address,
+)
+from .runloop import _error_result, _run_item, encode_result
+
+
+def handle_request(body: bytes) -> bytes:
+    """Answer one request frame body with a response body; never raises."""
+
+    try:
+        request = json.loads(body)
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+    except ValueError as exc:
+        return encode_result({"id": None, **_error_result(None, exc)})
+    op = request.get("op", "runloop")
+    if op == "runloop":
+        result = _run_item(request, bool(request.get("raise_on_refusal", False)))
+    elif op == "ping":
+        result = {"status": "ok", "pid": os.getpid()}
+    else:
+        result = _error_result(None, ValueError(f"unknown op {op!r}"))
+    return encode_result({"id": request.get("id"), **result})
+
+
+async def _handle_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    max_frame: int,
+) -> None:
+    try:
+        while True:
+            try:
+                header = await reader.readexactly(HEADER.size)
+            except asyncio.IncompleteReadError:
+                break
+            (length,) = HEADER.unpack(header)
+            if length > max_frame:
+                error = ValueError(f"frame of {length} bytes exceeds the {max_frame} byte limit")
+                response = encode_result({"id": None, **_error_result(None, error)})
+                writer.write(encode_frame(response))
+                break
+            body = await reader.readexactly(length)
+            # Scoring is CPU-bound and the worker is one process per core, so
+            # requests are answered inline on the event loop.
+            writer.write(encode_frame(handle_request(body)))
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def _warm_up() -> None:
+    floors_version(get_floors())
+    metrics = evaluate_metrics("Warm up", "We respond with calm care and respect.")
+    route("Warm up", "We respond with calm care and respect.", metrics)
+
+
+async def _serve(listener: socket.socket, max_frame: int) -> None:
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopping.set)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await _handle_connection(reader, writer, max_frame)
+
+    if listener.family == socket.AF_UNIX:
+        server = await asyncio.start_unix_server(handle, sock=listener)
+    else:
+        server = await asyncio.start_server(handle, sock=listener)
+    async with server:
+        await stopping.wait()
+
+
+def _worker_main(listener: socket.socket, connection: Connection, max_frame: int) -> None:
+    # Drop handlers inherited from the parent until the event loop installs its own.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    set_entry_appender(RemoteAppender(connection))
+    asyncio.run(_serve(listener, max_frame))
+
+
+class RunloopServer:
+    """Listening socket, ledger-writer process, and pre-forked worker processes.
+
+    ``workers`` defaults to the CPU count.  ``fsync``, ``commit_interval``, and
+    ``max_batch`` configure the writer's group commit.  Use as a context manager
+    or call :meth:`start` and :meth:`stop`; :attr:`address` is the bound address
+    (useful with port ``0``).
+    """
+
+    def __init__(
+        self,
+        address: Address = DEFAULT_ADDRESS,
+        *,
+        workers: Optional[int] = None,
+        fsync: bool = False,
+        commit_interval: float = 0.0,
+        max_batch: int = 256,
+        max_frame: int = MAX_FRAME,
+        backlog: int = 128,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError("workers must be positive")
+        self._requested = address
+        self._writer_options = {
+            "fsync": fsync,
+            "commit_interval": commit_interval,
+            "max_batch": max_batch,
+        }
+        self._max_frame = max_frame
+        self._backlog = backlog
+        self._listener: Optional[socket.socket] = None
+        self._writer: Optional[LedgerWriter] = None
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+        self.address: Optional[str] = None
+
+    def _bind(self) -> socket.socket:
+        family, sockaddr = parse_address(self._requested)
+        listener = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            if family == socket.AF_UNIX:
+                try:
+                    if stat.S_ISSOCK(os.stat(sockaddr).st_mode):
+                        os.unlink(sockaddr)
+                except FileNotFoundError:
+                    pass
+            else:
+                listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind(sockaddr)
+            listener.listen(self._backlog)
+        except OSError:
+            listener.close()
+            raise
+        return listener
+
+    def start(self) -> "RunloopServer":
+        """Bind, warm up, and fork the writer and the workers.
+
+        Forking a process that runs other threads can deadlock the children on
+        locks those threads held, so call this before starting any thread or
+        pool (the ledger I/O executor, speculative cooling, a client pool).
+        A :class:`RuntimeError` is raised when other threads are alive.
+        """
+
+        if self._listener is not None:
+            raise RuntimeError("server already started")
+        if threading.active_count() > 1:
+            raise RuntimeError(
+                "RunloopServer.start() forks and must run before any other thread starts"
+            )
+        self._listener = self._bind()
+        self.address = format_address(self._listener)
+        # Load floors, lexicons, and the routing table once; workers inherit them.
+        _warm_up()
+        self._writer = LedgerWriter(self.workers, **self._writer_options).start()
+        context = multiprocessing.get_context("fork")
+        for index, connection in enumerate(self._writer.connections):
+            process = context.Process(
+                target=_worker_main,
+                args=(self._listener, connection, self._max_frame),
+                name=f"arifos-runloop-{index}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        for connection in self._writer.connections:
+            connection.close()
+        return self
+
+    def alive_workers(self) -> int:
+        return sum(1 for process in self._processes if process.is_alive())
+
+    def writer_stats(self) -> Dict[str, int]:
+        """Return the ledger writer's batch, entry, and largest-batch counts."""
+
+        if self._writer is None:
+            raise RuntimeError("server not started")
+        return self._writer.stats()
+
+    def stop(self, timeout: float = 5.0) -> Dict[str, int]:
+        """Stop the workers, then the writer, and return the writer's final stats."""
+
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():  # pragma: no cover - defensive
+                process.kill()
+                process.join()
+        self._processes = []
+        stats = self._writer.stop(timeout) if self._writer is not None else {}
+        self._writer = None
+        if self._listener is not None:
+            if self._listener.family == socket.AF_UNIX:
+                try:
+                    os.unlink(self._listener.getsockname())
+                except OSError:  # pragma: no cover - already removed
+                    pass
+            self._listener.close()
+            self._listener = None
+        return stats
+
+    def serve_forever(self) -> Dict[str, int]:
+        """Start, run until SIGINT or SIGTERM (or every worker exits), then stop."""
+
+        stopping = threading.Event()
+        handlers = {
+            signum: signal.signal(signum, lambda *_: stopping.set())
+            for signum in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            self.start()
+            sys.stderr.write(f"runloop server listening on {self.address}\n")
+            while not stopping.wait(0.5):
+                if not self.alive_workers():
+                    sys.stderr.write("every runloop worker exited; shutting down\n")
+                    break
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+            stats = self.stop()
+        return stats
+
+    def __enter__(self) -> "RunloopServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the runloop to local clients.")
+    parser.add_argument("--listen", default=DEFAULT_ADDRESS, help="host:port or unix:PATH")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (CPU count)")
+    parser.add_argument("--fsync", action="store_true", help="fsync every group commit")
+    parser.add_argument(
+        "--commit-interval",
+        type=float,
+        default=0.0,
+        help="seconds the writer waits to grow a batch",
+    )
+    parser.add_argument("--max-batch", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    server = RunloopServer(
+        args.listen,
+        workers=args.workers,
+        fsync=args.fsync,
+        commit_interval=args.commit_interval,
+        max_batch=args.max_batch,
+    )
+    stats = server.serve_forever()
+    sys.stderr.write(json.dumps(stats, sort_keys=True) + "\n")
+    return 0
+
+
+__all__ = ["RunloopServer", "handle_request"]
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+"""Speculative SABAR cooling for the integration runloop.
+
+Cooling normally starts only after Compass routes a draft to ``arif-asi``.  When
+cheap tone signals already suggest that outcome, :func:`speculate_cooling`
+starts :func:`sabar_orchestrate` and the follow-up :func:`evaluate_metrics` on a
+background thread while routing runs.  The runloop claims the result when the
+route does need cooling and discards it otherwise.  Both steps are side-effect
+free, so a discarded speculation only costs CPU time, which is tracked in
+:func:`speculation_stats`.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from platform.psi.psi_score import Metrics, Refusal
+from packages.apex_prime.judge import EvaluationContext
+from packages.arif_agi.metrics import evaluate_metrics
+from packages.arif_asi.analysis import TextAnalysis, analyze
+from packages.arif_asi.asi import tone_from_counts
+from packages.eee_777.eee import sabar_orchestrate
+
+CoolingOutcome = Tuple[Dict[str, Any] | Refusal, Optional[Metrics], int]
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {"launched": 0, "hits": 0, "misses": 0, "cancelled": 0, "wasted_ns": 0}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="arifos-speculate")
+    return _executor
+
+
+def cooling_likely(metrics: Metrics, analysis: TextAnalysis, floors: Mapping[str, float]) -> bool:
+    """Return ``True`` when cheap signals suggest Compass will route to ``arif-asi``."""
+
+    if metrics.peace2 < floors.get("peace2", 1.0):
+        return True
+    if metrics.kappa_r <= floors.get("kappa_r", 0.95) + 0.01:
+        return True
+    if analysis.negative_hits or analysis.has("exclaim"):
+        return True
+    tone = tone_from_counts(analysis.positive_hits, analysis.negative_hits, len(analysis.tokens))
+    return (
+        tone["peace2_hint"] < floors.get("peace2", 1.0)
+        or tone["rasa"] < floors.get("rasa", 0.85)
+    )
+
+
+def _cool(
+    task: str,
+    draft: str,
+    metrics: Metrics,
+    context: Optional[EvaluationContext],
+) -> CoolingOutcome:
+    started = time.perf_counter_ns()
+    cooling = sabar_orchestrate(draft, metrics, raise_on_refusal=False, context=context)
+    cooled_metrics = None
+    if not isinstance(cooling, Refusal):
+        cooled = cooling["draft"]
+        cooled_metrics = evaluate_metrics(task, cooled, analysis=analyze(cooled), context=context)
+    return cooling, cooled_metrics, time.perf_counter_ns() - started
+
+
+def speculate_cooling(
+    task: str,
+    draft: str,
+    metrics: Metrics,
+    context: Optional[EvaluationContext] = None,
+) -> Future[CoolingOutcome]:
+    """Start cooling ``draft`` in the background and return its future.
+
+    Only the floor snapshot of ``context`` is read, so sharing it with the
+    request thread is safe.
+    """
+
+    with _stats_lock:
+        _stats["launched"] += 1
+    return _get_executor().submit(_cool, task, draft, metrics, context)
+
+
+def claim(future: Future[CoolingOutcome]) -> Tuple[Dict[str, Any] | Refusal, Optional[Metrics]]:
+    """Wait for a speculation the route needs and return ``(cooling, metrics)``.
+
+    ``cooling`` is a :class:`Refusal` when SABAR refused; ``metrics`` is then
+    ``None``.
+    """
+
+    cooling, cooled_metrics, _ = future.result()
+    with _stats_lock:
+        _stats["hits"] += 1
+    return cooling, cooled_metrics
+
+
+def _record_waste(future: Future[CoolingOutcome]) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    with _stats_lock:
+        _stats["wasted_ns"] += future.result()[2]
+
+
+def discard(future: Future[CoolingOutcome]) -> None:
+    """Drop a speculation the route did not need, cancelling it when possible."""
+
+    cancelled = future.cancel()
+    with _stats_lock:
+        _stats["misses"] += 1
+        if cancelled:
+            _stats["cancelled"] += 1
+    if not cancelled:
+        future.add_done_callback(_record_waste)
+
+
+def speculation_stats() -> Dict[str, float]:
+    """Return speculation counters plus the hit rate over resolved speculations."""
+
+    with _stats_lock:
+        stats: Dict[str, float] = dict(_stats)
+    resolved = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / resolved if resolved else 0.0
+    return stats
+
+
+def reset_speculation_stats() -> None:
+    """Zero every speculation counter."""
+
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+__all__ = [
+    "claim",
+    "cooling_likely",
+    "discard",
+    "reset_speculation_stats",
+    "speculate_cooling",
+    "speculation_stats",
+]
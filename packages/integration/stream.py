@@ -0,0 +1,218 @@
+"""Streaming JSONL runner for offline governance backfills.
+
+:func:`stream_runloop` reads ``{"task", "initial_draft", "id"}`` records from a
+JSONL file or stdin, runs each through :func:`runloop` with at most
+``max_in_flight`` records queued, and appends every outcome (sealed, delayed,
+refused, or error) to a JSONL output in input order as soon as it and every
+record before it have finished.  Memory stays bounded by the window regardless
+of input size.
+
+With a ``checkpoint`` path, progress (input lines consumed and output bytes
+written) is saved atomically every ``checkpoint_every`` records after the
+output has been flushed to disk.  Restarting with the same checkpoint skips the
+finished lines and truncates any output written after the last checkpoint, so
+every record appears exactly once.  Records re-run after a crash do not
+duplicate Cooling Ledger entries because both ledger writes carry
+deterministic idempotency keys.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any, BinaryIO, Deque, Dict, Iterator, Optional, Sequence, Tuple
+
+from platform.cooling_ledger.aio import ledger_executor
+
+from .runloop import _error_result, _run_item, encode_result
+
+Record = Dict[str, Any]
+
+
+def iter_tasks(source: str | os.PathLike[str] | IO[str]) -> Iterator[Tuple[int, Record]]:
+    """Yield ``(line_number, record)`` for every non-blank line of ``source``.
+
+    Lines that are not JSON objects are yielded as ``{"error": ...}`` records so
+    the runner reports them instead of aborting the stream.
+    """
+
+    if hasattr(source, "read"):
+        handle: IO[str] = source  # type: ignore[assignment]
+        yield from _parse_lines(handle)
+        return
+    if str(source) == "-":
+        yield from _parse_lines(sys.stdin)
+        return
+    with Path(source).open("r", encoding="utf-8") as handle:
+        yield from _parse_lines(handle)
+
+
+def _parse_lines(handle: IO[str]) -> Iterator[Tuple[int, Record]]:
+    for line_number, line in enumerate(handle, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_number, {"error": exc}
+            continue
+        if not isinstance(payload, dict):
+            yield line_number, {"error": ValueError("record must be a JSON object")}
+            continue
+        yield line_number, payload
+
+
+def _load_checkpoint(path: Optional[Path]) -> Dict[str, int]:
+    if path is None or not path.exists():
+        return {"lines": 0, "output_bytes": 0}
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return {"lines": int(payload["lines"]), "output_bytes": int(payload["output_bytes"])}
+
+
+def _save_checkpoint(path: Path, lines: int, output: BinaryIO) -> None:
+    output.flush()
+    os.fsync(output.fileno())
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    temp_path.write_text(
+        json.dumps({"lines": lines, "output_bytes": output.tell()}, sort_keys=True),
+        encoding="utf-8",
+    )
+    os.replace(temp_path, path)
+
+
+def _process(
+    line_number: int,
+    record: Record,
+    raise_on_refusal: bool,
+    ledger: Optional[Executor] = None,
+) -> Record:
+    error = record.get("error")
+    if isinstance(error, Exception):
+        result = _error_result(None, error)
+    else:
+        result = _run_item(record, raise_on_refusal, ledger)
+    return {"line": line_number, "id": record.get("id", line_number), **result}
+
+
+def _open_output(output: str | os.PathLike[str] | BinaryIO, offset: int) -> Tuple[BinaryIO, bool]:
+    if hasattr(output, "write"):
+        return output, False  # type: ignore[return-value]
+    if str(output) == "-":
+        return sys.stdout.buffer, False
+    path = Path(output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle = path.open("r+b" if path.exists() else "w+b")
+    handle.truncate(offset)
+    handle.seek(offset)
+    return handle, True
+
+
+def stream_runloop(
+    source: str | os.PathLike[str] | IO[str],
+    output: str | os.PathLike[str] | BinaryIO,
+    *,
+    checkpoint: Optional[str | os.PathLike[str]] = None,
+    checkpoint_every: int = 100,
+    workers: int = 1,
+    executor: str = "thread",
+    max_in_flight: Optional[int] = None,
+    raise_on_refusal: bool = False,
+) -> Dict[str, int]:
+    """Run every record of ``source`` through :func:`runloop`, appending results to ``output``.
+
+    ``output`` is a path, ``"-"`` for stdout, or a binary stream; resuming from
+    a ``checkpoint`` requires a path.  ``workers=1`` runs inline; otherwise a
+    ``"thread"`` or ``"process"`` pool is used as in :func:`runloop_many`, with
+    at most ``max_in_flight`` records (default ``4 * workers``) pending.  Each
+    output line is the run's result plus its input ``line`` and ``id``.
+    Returns counts per status along with ``processed`` and ``skipped``.
+    """
+
+    if executor not in {"thread", "process"}:
+        raise ValueError("executor must be 'thread' or 'process'")
+    if workers < 1 or checkpoint_every < 1:
+        raise ValueError("workers and checkpoint_every must be positive")
+    checkpoint_path = Path(checkpoint) if checkpoint is not None else None
+    state = _load_checkpoint(checkpoint_path)
+    handle, owned = _open_output(output, state["output_bytes"])
+    if checkpoint_path is not None and not owned:
+        raise ValueError("checkpointing requires an output file path")
+    window = max_in_flight or 4 * workers
+    stats: Dict[str, int] = {"processed": 0, "skipped": 0}
+    done_lines = state["lines"]
+
+    def emit(result: Record) -> None:
+        nonlocal done_lines
+        handle.write(encode_result(result) + b"\n")
+        done_lines = result["line"]
+        stats["processed"] += 1
+        stats[result["status"]] = stats.get(result["status"], 0) + 1
+        if checkpoint_path is not None and stats["processed"] % checkpoint_every == 0:
+            _save_checkpoint(checkpoint_path, done_lines, handle)
+
+    pool: Optional[Executor] = None
+    try:
+        if workers > 1:
+            pool = (ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor)(
+                max_workers=workers
+            )
+        ledger = ledger_executor() if pool is not None and executor == "thread" else None
+        pending: Deque[Future[Record]] = deque()
+        for line_number, record in iter_tasks(source):
+            if line_number <= state["lines"]:
+                stats["skipped"] += 1
+                continue
+            if pool is None:
+                emit(_process(line_number, record, raise_on_refusal))
+                continue
+            pending.append(pool.submit(_process, line_number, record, raise_on_refusal, ledger))
+            if len(pending) >= window:
+                emit(pending.popleft().result())
+        while pending:
+            emit(pending.popleft().result())
+        if checkpoint_path is not None:
+            _save_checkpoint(checkpoint_path, done_lines, handle)
+        else:
+            handle.flush()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if owned:
+            handle.close()
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream JSONL tasks through the runloop.")
+    parser.add_argument("source", help="JSONL file of {task, initial_draft, id} or '-' for stdin")
+    parser.add_argument("--output", default="-", help="JSONL results path, or '-' for stdout")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint path for crash recovery")
+    parser.add_argument("--checkpoint-every", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    stats = stream_runloop(
+        args.source,
+        args.output,
+        checkpoint=args.checkpoint,
+        checkpoint_every=args.checkpoint_every,
+        workers=args.workers,
+        executor=args.executor,
+        max_in_flight=args.max_in_flight,
+    )
+    sys.stderr.write(json.dumps(stats, sort_keys=True) + "\n")
+    return 0
+
+
+__all__ = ["iter_tasks", "stream_runloop"]
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
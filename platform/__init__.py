@@ -5,7 +5,7 @@ from importlib import import_module
 from types import ModuleType
 from typing import List
 
-__all__ = ["cooling_ledger", "psi", "tri_witness"]
+__all__ = ["concurrency", "cooling_ledger", "psi", "telemetry", "tri_witness"]
 
 
 def __getattr__(name: str) -> ModuleType:
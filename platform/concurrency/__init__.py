@@ -0,0 +1,5 @@
+"""Concurrency helpers shared by agent packages."""
+
+from .singleflight import SingleFlight, reset_singleflight_stats, singleflight_stats
+
+__all__ = ["SingleFlight", "reset_singleflight_stats", "singleflight_stats"]
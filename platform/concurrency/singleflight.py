@@ -0,0 +1,125 @@
+"""Single-flight coalescing of concurrent identical calls.
+
+A :class:`SingleFlight` group lets the first caller for a key (the leader)
+execute the work while concurrent callers with the same key wait for it and
+receive the very same result object, or the same exception.  Threaded callers
+use :meth:`SingleFlight.do`; coroutines use :meth:`SingleFlight.ado`, which
+coalesces per event loop.  Once a call finishes the key is forgotten, so later
+calls execute afresh.
+
+Every group registers under its name; :func:`singleflight_stats` reports how
+many executions ran and how many requests were coalesced onto them.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_groups: Dict[str, "SingleFlight"] = {}
+_groups_lock = threading.Lock()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future[Any]] = {}
+        self._stats: Dict[str, int] = {"executions": 0, "coalesced": 0}
+        with _groups_lock:
+            _groups[name] = self
+
+    def do(self, key: Hashable, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Return ``func(*args, **kwargs)``, sharing one execution per in-flight ``key``."""
+
+        with self._lock:
+            existing = self._calls.get(key)
+            if existing is None:
+                call = self._calls[key] = _Call()
+                self._stats["executions"] += 1
+            else:
+                self._stats["coalesced"] += 1
+        if existing is not None:
+            existing.done.wait()
+            if existing.error is not None:
+                raise existing.error
+            return existing.result
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def ado(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Await ``factory()``, sharing one task per in-flight ``key`` on this event loop.
+
+        The shared task is shielded, so cancelling one waiter does not cancel
+        the work the others are waiting for.
+        """
+
+        loop = asyncio.get_running_loop()
+        flight = (loop, key)
+        with self._lock:
+            task = self._tasks.get(flight)
+            if task is None:
+                task = self._tasks[flight] = asyncio.ensure_future(factory())
+                task.add_done_callback(lambda done: self._forget(flight, done))
+                self._stats["executions"] += 1
+            else:
+                self._stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, flight: Tuple[asyncio.AbstractEventLoop, Hashable], task: Any) -> None:
+        with self._lock:
+            if self._tasks.get(flight) is task:
+                del self._tasks[flight]
+
+    def stats(self) -> Dict[str, int]:
+        """Return executions, coalesced requests, and calls currently in flight."""
+
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls) + len(self._tasks)}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+
+def singleflight_stats() -> Dict[str, Dict[str, int]]:
+    """Return :meth:`SingleFlight.stats` for every registered group by name."""
+
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
+
+
+def reset_singleflight_stats() -> None:
+    """Zero the counters of every registered group."""
+
+    with _groups_lock:
+        groups = list(_groups.values())
+    for group in groups:
+        group.reset_stats()
+
+
+__all__ = ["SingleFlight", "reset_singleflight_stats", "singleflight_stats"]
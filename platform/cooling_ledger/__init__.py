@@ -1,5 +1,5 @@
 """Cooling Ledger SDK package."""
 
-from .sdk import seal, write_entry
+from .sdk import add_write_listener, remove_write_listener, seal, write_entry
 
-__all__ = ["seal", "write_entry"]
+__all__ = ["add_write_listener", "remove_write_listener", "seal", "write_entry"]
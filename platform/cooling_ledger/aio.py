@@ -0,0 +1,145 @@
+"""Asyncio helpers for Cooling Ledger I/O.
+
+Ledger reads and writes are blocking file operations.  The coroutines here run
+them on one dedicated ledger thread, which keeps the event loop responsive and
+serialises appends from every coroutine in the process.
+
+Flows that interleave scoring with ledger I/O (``respond``, ``runloop``) are
+written once as *step generators*: plain generators that ``yield`` a
+``(function, args, kwargs)`` ledger call and receive its result.  :func:`drive`
+runs such a generator synchronously; :func:`adrive` awaits each ledger call on
+the ledger thread and can run the scoring in between on a caller-supplied
+executor, so CPU-bound work does not block the event loop either.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, TypeVar
+
+from .sdk import query_entries, write_entry
+
+T = TypeVar("T")
+LedgerCall = Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]
+Steps = Generator[LedgerCall, Any, T]
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def ledger_executor() -> ThreadPoolExecutor:
+    """Return the single-thread executor that performs all async ledger I/O."""
+
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="arifos-ledger")
+    return _executor
+
+
+async def run_ledger_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run the blocking ledger call ``func(*args, **kwargs)`` on the ledger thread."""
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(ledger_executor(), lambda: context.run(func, *args, **kwargs))
+
+
+async def awrite_entry(
+    agent: str,
+    metrics: Dict[str, float],
+    note: str = "",
+    **kwargs: Any,
+) -> str:
+    """Async :func:`write_entry`."""
+
+    return await run_ledger_io(write_entry, agent, metrics, note, **kwargs)
+
+
+async def aquery_entries(**kwargs: Any) -> List[Dict[str, Any]]:
+    """Async :func:`query_entries`."""
+
+    return await run_ledger_io(query_entries, **kwargs)
+
+
+def drive(steps: Steps[T], *, ledger: Optional[Executor] = None) -> T:
+    """Run a step generator to completion.
+
+    Ledger calls run inline, or on ``ledger`` (for example
+    :func:`ledger_executor`) so that many worker threads funnel their writes
+    through one writer while scoring stays on the calling thread.
+    """
+
+    value: Any = None
+    error: Optional[BaseException] = None
+    while True:
+        try:
+            call = steps.throw(error) if error is not None else steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+        func, args, kwargs = call
+        try:
+            if ledger is None:
+                value = func(*args, **kwargs)
+            else:
+                context = contextvars.copy_context()
+                value = ledger.submit(context.run, func, *args, **kwargs).result()
+            error = None
+        except Exception as exc:  # re-raised inside the generator at the call site
+            value, error = None, exc
+
+
+def _advance(steps: Steps[T], value: Any) -> Tuple[bool, Any]:
+    # StopIteration cannot cross a Future, so completion is reported as a flag.
+    try:
+        return False, steps.send(value)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+async def adrive(steps: Steps[T], *, executor: Optional[Executor] = None) -> T:
+    """Run a step generator on the event loop, awaiting every ledger call.
+
+    With ``executor`` the scoring between ledger calls runs there instead of on
+    the event loop thread.  Context variables (such as an active telemetry
+    capture) follow every step and ledger call.
+    """
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    value: Any = None
+    error: Optional[BaseException] = None
+    while True:
+        if error is not None:
+            try:
+                done, payload = False, steps.throw(error)
+            except StopIteration as stop:
+                done, payload = True, stop.value
+        elif executor is not None:
+            done, payload = await loop.run_in_executor(
+                executor, context.run, _advance, steps, value
+            )
+        else:
+            done, payload = _advance(steps, value)
+        if done:
+            return payload
+        func, args, kwargs = payload
+        try:
+            value, error = await run_ledger_io(func, *args, **kwargs), None
+        except Exception as exc:  # re-raised inside the generator at the call site
+            value, error = None, exc
+
+
+__all__ = [
+    "LedgerCall",
+    "Steps",
+    "adrive",
+    "aquery_entries",
+    "awrite_entry",
+    "drive",
+    "ledger_executor",
+    "run_ledger_io",
+]
@@ -5,13 +5,45 @@ import hashlib
 import json
 import os
 import re
+import threading
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Mapping, Optional
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from platform.telemetry import span, timed
+
+try:  # pragma: no cover - exercised implicitly on POSIX hosts
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX fallback
+    fcntl = None  # type: ignore[assignment]
 
 
 _LEDGER_FILENAME = "ledger.jsonl"
 
+WriteListener = Callable[[Path, Dict[str, Any], int, int], None]
+_write_listeners: List[WriteListener] = []
+
+# A prepared entry is ``(payload, content_hash, plan_id)``; appending one yields
+# ``(content_hash, record, start, end)`` with ``record=None`` on an idempotent hit.
+PreparedEntry = Tuple[Dict[str, Any], str, Optional[str]]
+AppendOutcome = Tuple[str, Optional[Dict[str, Any]], int, int]
+EntryAppender = Callable[[Path, PreparedEntry], "AppendOutcome | Exception"]
+_appender: Optional[EntryAppender] = None
+
 
 def _ledger_path() -> Path:
     env_override = os.getenv("ARIFOS_LEDGER_PATH")
@@ -20,6 +52,12 @@ def _ledger_path() -> Path:
     return Path(__file__).resolve().parent / _LEDGER_FILENAME
 
 
+def _ledger_key() -> str:
+    """Return the resolved ledger path, so relative and absolute overrides agree."""
+
+    return str(_ledger_path().resolve())
+
+
 def _encode_base58(data: bytes) -> str:
     alphabet = b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
     num = int.from_bytes(data, "big")
@@ -35,22 +73,6 @@ def _encode_base58(data: bytes) -> str:
     return encoded.decode()
 
 
-def _existing_hash_for_key(path: Path, key: str) -> Optional[str]:
-    if not key:
-        return None
-    if not path.exists():
-        return None
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            try:
-                payload = json.loads(line)
-            except json.JSONDecodeError:  # pragma: no cover - guardrail
-                continue
-            if payload.get("idempotency_key") == key:
-                return payload.get("hash")
-    return None
-
-
 _EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 _DIGIT_PATTERN = re.compile(r"\b\d{6,}\b")
 
@@ -76,81 +98,235 @@ def _sanitize_metadata(metadata: Mapping[str, Any]) -> Dict[str, Any]:
     return {key: _clean(value) for key, value in metadata.items()}
 
 
-def _replay_exists(path: Path, plan_id: Optional[str], content_hash: str) -> bool:
-    if not plan_id or not content_hash or not path.exists():
-        return False
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
+_thread_lock = threading.Lock()
+
+
+@contextmanager
+def _ledger_lock(ledger_path: Path) -> Iterator[None]:
+    """Serialise the check-then-append in :func:`write_entry` across threads and processes."""
+
+    with _thread_lock:
+        if fcntl is None:  # pragma: no cover - non-POSIX fallback
+            yield
+            return
+        with ledger_path.with_name(ledger_path.name + ".lock").open("a") as lock_handle:
+            fcntl.flock(lock_handle.fileno(), fcntl.LOCK_EX)
             try:
-                payload = json.loads(line)
-            except json.JSONDecodeError:  # pragma: no cover - guardrail
-                continue
-            if payload.get("hash") != content_hash:
-                continue
-            metadata = payload.get("metadata") or {}
-            if metadata.get("plan_id") == plan_id:
-                return True
-    return False
+                yield
+            finally:
+                fcntl.flock(lock_handle.fileno(), fcntl.LOCK_UN)
 
 
-def write_entry(
-    agent: str,
-    metrics: Mapping[str, float],
-    note: str = "",
-    *,
-    idempotency_key: Optional[str] = None,
-    metadata: Optional[Mapping[str, Any]] = None,
-) -> str:
-    """Append a Cooling Ledger entry and return its deterministic content hash."""
+def add_write_listener(listener: WriteListener) -> None:
+    """Call ``listener(path, record, start, end)`` after every appended entry.
 
-    ledger_path = _ledger_path()
-    existing_hash = _existing_hash_for_key(ledger_path, idempotency_key) if idempotency_key else None
-    if existing_hash:
-        return existing_hash
+    ``start`` and ``end`` are the byte offsets of the appended line, letting
+    listeners that mirror the ledger tell whether they saw every prior write.
+    """
 
-    timestamp = datetime.now(timezone.utc).isoformat()
-    metrics_copy: Dict[str, float] = dict(metrics)
-    redacted_note = _redact_text(note)
+    if listener not in _write_listeners:
+        _write_listeners.append(listener)
+
+
+def remove_write_listener(listener: WriteListener) -> None:
+    """Stop notifying ``listener`` about ledger writes."""
+
+    if listener in _write_listeners:
+        _write_listeners.remove(listener)
+
+
+def set_entry_appender(appender: Optional[EntryAppender]) -> Optional[EntryAppender]:
+    """Route the appends of :func:`write_entry` through ``appender``; return the previous one.
+
+    ``appender(path, entry)`` must perform the idempotency and replay checks and
+    the append, as :func:`append_entries` does, and return that entry's outcome
+    (which may be the replay ``ValueError``).  ``None`` restores in-process
+    appends.
+    """
+
+    global _appender
+    previous, _appender = _appender, appender
+    return previous
+
+
+def _prepare_entry(
+    agent: str,
+    metrics: Mapping[str, float],
+    note: str,
+    idempotency_key: Optional[str],
+    metadata: Optional[Mapping[str, Any]],
+) -> PreparedEntry:
     payload: Dict[str, Any] = {
         "agent": agent,
-        "metrics": metrics_copy,
-        "note": redacted_note,
+        "metrics": dict(metrics),
+        "note": _redact_text(note),
     }
     if idempotency_key is not None:
         payload["idempotency_key"] = idempotency_key
+    plan_id = None
     if metadata:
         sanitized_metadata = _sanitize_metadata(metadata)
         payload["metadata"] = sanitized_metadata
-    else:
-        sanitized_metadata = None
-
-    canonical_json = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-    content_hash = hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
-
-    plan_id = None
-    if sanitized_metadata:
         potential_plan_id = sanitized_metadata.get("plan_id")
         if isinstance(potential_plan_id, str) and potential_plan_id:
             plan_id = potential_plan_id
 
-    if _replay_exists(ledger_path, plan_id, content_hash):
-        raise ValueError(
-            "Cooling Ledger replay detected for plan_id and content hash pair."
-        )
+    canonical_json = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    content_hash = hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
+    return payload, content_hash, plan_id
 
-    record: Dict[str, Any] = {
-        **payload,
-        "ts": timestamp,
-        "hash": content_hash,
-    }
 
+def _scan_ledger(
+    path: Path,
+    keys: Set[str],
+    pairs: Set[Tuple[str, str]],
+) -> Tuple[Dict[str, str], Set[Tuple[str, str]]]:
+    """Return the first hash per idempotency key in ``keys`` and the ``pairs`` already present."""
+
+    hashes: Dict[str, str] = {}
+    present: Set[Tuple[str, str]] = set()
+    if (not keys and not pairs) or not path.exists():
+        return hashes, present
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError:  # pragma: no cover - guardrail
+                continue
+            key = payload.get("idempotency_key")
+            if key in keys and key not in hashes:
+                hashes[key] = payload.get("hash")
+            if pairs:
+                pair = ((payload.get("metadata") or {}).get("plan_id"), payload.get("hash"))
+                if pair in pairs:
+                    present.add(pair)
+    return hashes, present
+
+
+def append_entries(
+    ledger_path: Path,
+    entries: Sequence[PreparedEntry],
+    *,
+    fsync: bool = False,
+) -> List[AppendOutcome | Exception]:
+    """Group-commit prepared entries to ``ledger_path`` in order.
+
+    One lock acquisition, one ledger scan, and one write cover the whole batch;
+    with ``fsync`` the batch is also flushed to disk before the lock is released.
+    Each entry gets its own outcome: an :data:`AppendOutcome`, or the
+    ``ValueError`` a replay raises in :func:`write_entry`.  Duplicates within the
+    batch resolve against the entries before them.  Listeners are not notified.
+    """
+
+    keys = {payload.get("idempotency_key") for payload, _, _ in entries} - {None, ""}
+    pairs = {(plan_id, content_hash) for _, content_hash, plan_id in entries if plan_id}
+    outcomes: List[AppendOutcome | Exception] = []
+    appended: List[Tuple[int, Dict[str, Any], bytes]] = []
     ledger_path.parent.mkdir(parents=True, exist_ok=True)
-    with ledger_path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(record, sort_keys=True) + "\n")
+    with _ledger_lock(ledger_path):
+        with span("ledger.scan"):
+            hashes, present = _scan_ledger(ledger_path, keys, pairs)
+        for payload, content_hash, plan_id in entries:
+            key = payload.get("idempotency_key")
+            existing_hash = hashes.get(key) if key else None
+            if existing_hash:
+                outcomes.append((existing_hash, None, 0, 0))
+                continue
+            if plan_id and (plan_id, content_hash) in present:
+                outcomes.append(
+                    ValueError("Cooling Ledger replay detected for plan_id and content hash pair.")
+                )
+                continue
+            record: Dict[str, Any] = {
+                **payload,
+                "ts": datetime.now(timezone.utc).isoformat(),
+                "hash": content_hash,
+            }
+            if key:
+                hashes[key] = content_hash
+            if plan_id:
+                present.add((plan_id, content_hash))
+            appended.append(
+                (len(outcomes), record, (json.dumps(record, sort_keys=True) + "\n").encode("utf-8"))
+            )
+            outcomes.append((content_hash, record, 0, 0))
+        if appended:
+            with ledger_path.open("ab") as handle:
+                start = handle.tell()
+                handle.write(b"".join(line for _, _, line in appended))
+                if fsync:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            for index, record, line in appended:
+                outcomes[index] = (record["hash"], record, start, start + len(line))
+                start += len(line)
+    return outcomes
+
+
+@timed("ledger.write_entry")
+def write_entry(
+    agent: str,
+    metrics: Mapping[str, float],
+    note: str = "",
+    *,
+    idempotency_key: Optional[str] = None,
+    metadata: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """Append a Cooling Ledger entry and return its deterministic content hash.
+
+    The idempotency and replay checks and the append run under a lock shared by
+    every thread and process writing the same ledger, so entries land in
+    timestamp order and concurrent duplicates are still detected.  When an
+    appender is installed with :func:`set_entry_appender` (as in the runloop
+    server's workers) it performs that step instead.
+    """
 
+    ledger_path = _ledger_path()
+    entry = _prepare_entry(agent, metrics, note, idempotency_key, metadata)
+    appender = _appender
+    if appender is not None:
+        outcome: AppendOutcome | Exception = appender(ledger_path, entry)
+    else:
+        outcome = append_entries(ledger_path, [entry])[0]
+    if isinstance(outcome, Exception):
+        raise outcome
+    content_hash, record, start, end = outcome
+    if record is not None:
+        for listener in list(_write_listeners):
+            listener(ledger_path, record, start, end)
     return content_hash
 
 
+@timed("ledger.query_entries")
+def query_entries(
+    agent: Optional[str] = None,
+    *,
+    plan_id: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Return ledger entries, oldest first, filtered by ``agent`` and ``plan_id``.
+
+    ``limit`` keeps only the most recent matching entries.
+    """
+
+    ledger_path = _ledger_path()
+    if not ledger_path.exists():
+        return []
+    matches: Deque[Dict[str, Any]] = deque(maxlen=limit)
+    with ledger_path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError:  # pragma: no cover - guardrail
+                continue
+            if agent is not None and payload.get("agent") != agent:
+                continue
+            if plan_id is not None and (payload.get("metadata") or {}).get("plan_id") != plan_id:
+                continue
+            matches.append(payload)
+    return list(matches)
+
+
 def seal(content_hash: str) -> str:
     """Return a zkPC-like receipt identifier derived from the hash and timestamp."""
 
@@ -160,4 +336,15 @@ def seal(content_hash: str) -> str:
     return seal_id
 
 
-__all__ = ["write_entry", "seal"]
+__all__ = [
+    "AppendOutcome",
+    "EntryAppender",
+    "PreparedEntry",
+    "add_write_listener",
+    "append_entries",
+    "query_entries",
+    "remove_write_listener",
+    "seal",
+    "set_entry_appender",
+    "write_entry",
+]
@@ -0,0 +1,183 @@
+"""Dedicated Cooling Ledger writer process with group commit.
+
+A :class:`LedgerWriter` owns every append made by a fixed set of client
+processes.  Each client takes one of :attr:`LedgerWriter.connections` and
+installs a :class:`RemoteAppender` with
+:func:`~platform.cooling_ledger.sdk.set_entry_appender`; :func:`write_entry`
+then prepares (redacts and hashes) entries in the client and the writer runs the
+idempotency and replay checks and the append.
+
+Whenever the writer wakes it drains every request already waiting, optionally
+lingers ``commit_interval`` seconds for more, and commits them with one
+:func:`~platform.cooling_ledger.sdk.append_entries` call per ledger: concurrent
+writers share one lock acquisition, one ledger scan, one write, and, with
+``fsync=True``, one ``fsync``.  The writer still takes the ledger's
+cross-process lock, so processes outside the group can keep writing directly.
+
+The writer and its clients are forked, so this module is POSIX-only like the
+ledger lock itself.
+"""
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+import signal
+import threading
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .sdk import AppendOutcome, PreparedEntry, append_entries
+
+Request = Tuple[Any, str, PreparedEntry]
+
+
+class RemoteAppender:
+    """Entry appender that sends each append to a :class:`LedgerWriter`.
+
+    One append is in flight per appender; threads of a client process share it
+    under a lock.  Replies are matched by tag, so a reply meant for a request
+    that raised mid-flight is never delivered to the next one.
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        self._connection = connection
+        self._lock = threading.Lock()
+        self._tags = itertools.count()
+
+    def __call__(self, path: Path, entry: PreparedEntry) -> AppendOutcome | Exception:
+        with self._lock:
+            tag = (os.getpid(), next(self._tags))
+            self._connection.send((tag, str(path), entry))
+            while True:
+                reply_tag, outcome = self._connection.recv()
+                if reply_tag == tag:
+                    return outcome
+
+
+def _commit(
+    batch: List[Tuple[Connection, Request]],
+    fsync: bool,
+    stats: Dict[str, int],
+) -> None:
+    by_path: Dict[str, List[Tuple[Connection, Request]]] = {}
+    for item in batch:
+        by_path.setdefault(item[1][1], []).append(item)
+    for path, items in by_path.items():
+        try:
+            outcomes: List[AppendOutcome | Exception] = append_entries(
+                Path(path), [request[2] for _, request in items], fsync=fsync
+            )
+        except Exception as exc:  # an I/O failure fails the whole batch
+            outcomes = [exc] * len(items)
+        stats["batches"] += 1
+        stats["entries"] += len(items)
+        stats["max_batch"] = max(stats["max_batch"], len(items))
+        for (connection, request), outcome in zip(items, outcomes):
+            try:
+                connection.send((request[0], outcome))
+            except OSError:  # pragma: no cover - client exited mid-request
+                pass
+
+
+def _drain(
+    ready: List[Any],
+    clients: List[Connection],
+    batch: List[Tuple[Connection, Request]],
+    max_batch: int,
+) -> None:
+    for connection in ready:
+        try:
+            while len(batch) < max_batch and connection.poll():
+                batch.append((connection, connection.recv()))
+        except (EOFError, OSError):
+            clients.remove(connection)
+
+
+def _serve(
+    clients: List[Connection],
+    control: Connection,
+    fsync: bool,
+    commit_interval: float,
+    max_batch: int,
+) -> None:
+    # The owner stops the writer through ``control`` once its clients are done.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    stats = {"batches": 0, "entries": 0, "max_batch": 0}
+    clients = list(clients)
+    while True:
+        ready = wait(clients + [control])
+        batch: List[Tuple[Connection, Request]] = []
+        _drain([item for item in ready if item is not control], clients, batch, max_batch)
+        if batch and commit_interval > 0 and len(batch) < max_batch:
+            _drain(wait(clients, timeout=commit_interval), clients, batch, max_batch)
+        if batch:
+            _commit(batch, fsync, stats)
+        if control in ready:
+            command = control.recv()
+            control.send(dict(stats))
+            if command == "stop":
+                return
+
+
+class LedgerWriter:
+    """Forked process that performs the ledger appends of ``clients`` processes."""
+
+    def __init__(
+        self,
+        clients: int,
+        *,
+        fsync: bool = False,
+        commit_interval: float = 0.0,
+        max_batch: int = 256,
+    ) -> None:
+        if clients < 1 or max_batch < 1:
+            raise ValueError("clients and max_batch must be positive")
+        context = multiprocessing.get_context("fork")
+        pipes = [context.Pipe() for _ in range(clients)]
+        self.connections: List[Connection] = [client for client, _ in pipes]
+        self._served = [served for _, served in pipes]
+        self._control, control = context.Pipe()
+        self._control_lock = threading.Lock()
+        self._process = context.Process(
+            target=_serve,
+            args=(self._served, control, fsync, commit_interval, max_batch),
+            name="arifos-ledger-writer",
+            daemon=True,
+        )
+        self._final_stats: Optional[Dict[str, int]] = None
+
+    def start(self) -> "LedgerWriter":
+        self._process.start()
+        for served in self._served:
+            served.close()
+        return self
+
+    def stats(self) -> Dict[str, int]:
+        """Return the batches committed, entries appended, and the largest batch."""
+
+        if self._final_stats is not None:
+            return dict(self._final_stats)
+        with self._control_lock:
+            self._control.send("stats")
+            return self._control.recv()
+
+    def stop(self, timeout: float = 5.0) -> Dict[str, int]:
+        """Commit pending appends, stop the process, and return its final stats."""
+
+        if self._final_stats is None:
+            with self._control_lock:
+                try:
+                    self._control.send("stop")
+                    self._final_stats = self._control.recv()
+                except (EOFError, OSError):
+                    self._final_stats = {"batches": 0, "entries": 0, "max_batch": 0}
+            self._process.join(timeout)
+            if self._process.is_alive():  # pragma: no cover - defensive
+                self._process.terminate()
+            self._control.close()
+        return dict(self._final_stats)
+
+
+__all__ = ["LedgerWriter", "RemoteAppender"]
@@ -1,5 +1,27 @@
 """Ψ computation helpers exposed for agent packages."""
 
-from .psi_score import Metrics, SABARPause, get_floors, meets_floors, psi_from
+from .psi_score import (
+    Metrics,
+    Refusal,
+    SABARPause,
+    floor_checks,
+    floors_version,
+    get_floors,
+    meets_floors,
+    psi_from,
+    raw_psi,
+    refuse,
+)
 
-__all__ = ["Metrics", "SABARPause", "get_floors", "meets_floors", "psi_from"]
+__all__ = [
+    "Metrics",
+    "Refusal",
+    "SABARPause",
+    "floor_checks",
+    "floors_version",
+    "get_floors",
+    "meets_floors",
+    "psi_from",
+    "raw_psi",
+    "refuse",
+]
@@ -10,8 +10,10 @@ from __future__ import annotations
 from dataclasses import dataclass, asdict
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable
+from typing import Dict
 
+import hashlib
+import json
 import math
 
 try:  # pragma: no cover - import resolution depends on environment
@@ -20,8 +22,48 @@ except ModuleNotFoundError:  # pragma: no cover
     yaml = None  # type: ignore
 
 
+FLOORS_BREACHED = "floors_breached"
+PSI_BELOW_FLOOR = "psi_below_floor"
+
+
 class SABARPause(RuntimeError):
-    """Raised when Ψ or one of the metric floors breaches governance limits."""
+    """Raised when Ψ or one of the metric floors breaches governance limits.
+
+    ``code`` is a stable, machine-readable reason (for example
+    ``"floors_breached"``) shared with the :class:`Refusal` outcome.
+    """
+
+    def __init__(self, message: str = "", code: str = "sabar_pause") -> None:
+        super().__init__(message)
+        self.code = code
+
+
+@dataclass(frozen=True)
+class Refusal:
+    """Structured refusal returned instead of raising :class:`SABARPause`.
+
+    Functions that accept ``raise_on_refusal=False`` return a ``Refusal`` on the
+    refusal path, which avoids building and unwinding a traceback for every
+    refused input in high-refusal batch workloads.
+    """
+
+    code: str
+    reason: str
+
+    def to_pause(self) -> SABARPause:
+        return SABARPause(self.reason, code=self.code)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"status": "refused", "code": self.code, "reason": self.reason}
+
+
+def refuse(code: str, reason: str, raise_on_refusal: bool = True) -> Refusal:
+    """Raise :class:`SABARPause` by default, or return the equivalent :class:`Refusal`."""
+
+    refusal = Refusal(code=code, reason=reason)
+    if raise_on_refusal:
+        raise refusal.to_pause()
+    return refusal
 
 
 @dataclass(frozen=True)
@@ -80,49 +122,102 @@ def _clamp(value: float, minimum: float, maximum: float) -> float:
     return max(minimum, min(maximum, value))
 
 
-def meets_floors(metrics: Metrics, floors: Dict[str, float] | None = None) -> bool:
-    """Return ``True`` when every governed metric satisfies the configured floor."""
+def _floors_digest(floors: Dict[str, float]) -> str:
+    canonical = json.dumps(floors, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+@lru_cache(maxsize=1)
+def _default_floors_version() -> str:
+    return _floors_digest(_default_floors())
+
+
+def floors_version(floors: Dict[str, float] | None = None) -> str:
+    """Return a short content hash identifying a floor configuration."""
+
+    if not floors or floors == _default_floors():
+        return _default_floors_version()
+    return _floors_digest(floors)
+
+
+def floor_checks(metrics: Metrics, floors: Dict[str, float] | None = None) -> Dict[str, bool]:
+    """Return a per-floor pass mask for the floors that apply to :class:`Metrics`.
+
+    Floors such as ``tri_witness`` and ``psi_min`` apply outside of Metrics and
+    are omitted from the mask.
+    """
 
     floors = floors or _default_floors()
     metric_map = metrics.as_floor_dict()
+    mask: Dict[str, bool] = {}
+    for key, limit in floors.items():
+        if key not in metric_map:
+            continue
+        value = metric_map[key]
+        mask[key] = math.isfinite(value) and value >= limit
+    return mask
 
-    def _iter_floor_checks() -> Iterable[bool]:
-        for key, limit in floors.items():
-            if key not in metric_map:
-                # Floors such as tri_witness apply outside of Metrics and are ignored.
-                continue
-            value = metric_map[key]
-            if not math.isfinite(value):
-                yield False
-                continue
-            yield value >= limit
 
-    return all(_iter_floor_checks())
+def meets_floors(metrics: Metrics, floors: Dict[str, float] | None = None) -> bool:
+    """Return ``True`` when every governed metric satisfies the configured floor."""
+
+    return all(floor_checks(metrics, floors).values())
+
 
+def raw_psi(metrics: Metrics, *, epsilon: float = 1e-9) -> float:
+    """Return the clamped Ψ score without enforcing any floor."""
 
-def psi_from(metrics: Metrics, floors: Dict[str, float] | None = None, *, epsilon: float = 1e-9) -> float:
+    numerator = metrics.deltaS * metrics.peace2 * metrics.kappa_r * metrics.rasa * metrics.amanah
+    denominator = max(metrics.entropy, 0.0) + epsilon
+    return _clamp(numerator / denominator, 0.0, 2.0)
+
+
+def psi_from(
+    metrics: Metrics,
+    floors: Dict[str, float] | None = None,
+    *,
+    epsilon: float = 1e-9,
+    raise_on_refusal: bool = True,
+) -> float | Refusal:
     """Compute the Ψ score and enforce governance floors.
 
     ``floors`` defaults to the values from ``docs/floors.yaml``.  The function
     raises :class:`SABARPause` when a floor is breached or the resulting Ψ falls
-    below the configured ``psi_min`` (defaults to ``0.95`` when absent).
+    below the configured ``psi_min`` (defaults to ``0.95`` when absent).  With
+    ``raise_on_refusal=False`` it returns a :class:`Refusal` instead.
     """
 
     floors = floors or _default_floors()
     psi_floor = float(floors.get("psi_min", 0.95))
 
     if not meets_floors(metrics, floors):
-        raise SABARPause("Metric floors breached before Ψ computation.")
+        return refuse(
+            FLOORS_BREACHED, "Metric floors breached before Ψ computation.", raise_on_refusal
+        )
 
-    numerator = metrics.deltaS * metrics.peace2 * metrics.kappa_r * metrics.rasa * metrics.amanah
-    denominator = max(metrics.entropy, 0.0) + epsilon
-    raw_psi = numerator / denominator
-    psi = _clamp(raw_psi, 0.0, 2.0)
+    psi = raw_psi(metrics, epsilon=epsilon)
 
     if psi < psi_floor:
-        raise SABARPause(f"Ψ={psi:.3f} below governance floor {psi_floor:.2f}.")
+        return refuse(
+            PSI_BELOW_FLOOR,
+            f"Ψ={psi:.3f} below governance floor {psi_floor:.2f}.",
+            raise_on_refusal,
+        )
 
     return psi
 
 
-__all__ = ["Metrics", "SABARPause", "psi_from", "meets_floors", "get_floors"]
+__all__ = [
+    "FLOORS_BREACHED",
+    "Metrics",
+    "PSI_BELOW_FLOOR",
+    "Refusal",
+    "SABARPause",
+    "floor_checks",
+    "floors_version",
+    "get_floors",
+    "meets_floors",
+    "psi_from",
+    "raw_psi",
+    "refuse",
+]
@@ -0,0 +1,29 @@
+"""Span timing and latency histograms."""
+
+from .spans import (
+    Histogram,
+    Trace,
+    capture,
+    disable,
+    enable,
+    is_enabled,
+    latency_summary,
+    record,
+    reset_histograms,
+    span,
+    timed,
+)
+
+__all__ = [
+    "Histogram",
+    "Trace",
+    "capture",
+    "disable",
+    "enable",
+    "is_enabled",
+    "latency_summary",
+    "record",
+    "reset_histograms",
+    "span",
+    "timed",
+]
@@ -0,0 +1,239 @@
+"""Opt-in span timing for the runloop and the Cooling Ledger.
+
+Stages are wrapped in :func:`span` blocks timed with ``perf_counter_ns``.  When
+telemetry is enabled (``ARIFOS_TELEMETRY=1`` or :func:`enable`), every span feeds
+an in-process log-linear histogram per name, summarised by
+:func:`latency_summary` as p50/p95/p99.  Independently, :func:`capture` collects
+the spans of one run so they can be attached to its result.
+
+With telemetry disabled and nothing capturing, :func:`span` returns a shared
+no-op context manager after one flag check and one context-variable read.
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import math
+import os
+import threading
+from contextlib import contextmanager
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = os.getenv("ARIFOS_TELEMETRY", "").strip().lower() in {"1", "true", "yes", "on"}
+
+# Eight sub-buckets per power of two bound the percentile error to 12.5%.
+_SUB_BITS = 3
+_SUB_COUNT = 1 << _SUB_BITS
+
+
+def _bucket(value: int) -> int:
+    if value < 2 * _SUB_COUNT:
+        return max(value, 0)
+    shift = value.bit_length() - _SUB_BITS - 1
+    return ((shift + 1) << _SUB_BITS) | ((value >> shift) & (_SUB_COUNT - 1))
+
+
+def _bucket_bounds(index: int) -> tuple[int, int]:
+    """Return the inclusive lower bound and width of bucket ``index``."""
+
+    if index < 2 * _SUB_COUNT:
+        return index, 1
+    shift = (index >> _SUB_BITS) - 1
+    return (_SUB_COUNT | (index & (_SUB_COUNT - 1))) << shift, 1 << shift
+
+
+class Histogram:
+    """Log-linear histogram of nanosecond durations."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        index = _bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, quantile: float) -> int:
+        """Return the approximate ``quantile`` (0–1) in nanoseconds."""
+
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(quantile * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, width = _bucket_bounds(index)
+                return min(max(low + width // 2, self.min), self.max)
+        return self.max  # pragma: no cover - rank never exceeds count
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ns": self.total / self.count if self.count else 0.0,
+            "min_ns": self.min,
+            "p50_ns": self.percentile(0.50),
+            "p95_ns": self.percentile(0.95),
+            "p99_ns": self.percentile(0.99),
+            "max_ns": self.max,
+        }
+
+
+class Trace:
+    """Spans recorded for one run, with starts relative to the trace origin."""
+
+    __slots__ = ("origin", "spans", "_lock")
+
+    def __init__(self) -> None:
+        self.origin = perf_counter_ns()
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: int, duration: int) -> None:
+        with self._lock:
+            self.spans.append(
+                {"name": name, "start_ns": start - self.origin, "duration_ns": duration}
+            )
+
+
+_histograms: Dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+_active_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar(
+    "arifos_trace", default=None
+)
+
+
+def record(name: str, duration_ns: int) -> None:
+    """Add one ``duration_ns`` sample to the histogram for ``name``."""
+
+    with _histograms_lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.record(duration_ns)
+
+
+class _Span:
+    __slots__ = ("name", "trace", "start")
+
+    def __init__(self, name: str, trace: Optional[Trace]) -> None:
+        self.name = name
+        self.trace = trace
+        self.start = 0
+
+    def __enter__(self) -> "_Span":
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        duration = perf_counter_ns() - self.start
+        if _enabled:
+            record(self.name, duration)
+        if self.trace is not None:
+            self.trace.add(self.name, self.start, duration)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str) -> _Span | _NoopSpan:
+    """Return a context manager timing the enclosed block as ``name``."""
+
+    trace = _active_trace.get()
+    if not _enabled and trace is None:
+        return _NOOP
+    return _Span(name, trace)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorate a function so every call is timed as span ``name``."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+@contextmanager
+def capture() -> Iterator[Trace]:
+    """Collect every span opened in this context (and contexts copied from it)."""
+
+    trace = Trace()
+    token = _active_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _active_trace.reset(token)
+
+
+def enable(flag: bool = True) -> None:
+    """Turn histogram recording on (or off with ``flag=False``)."""
+
+    global _enabled
+    _enabled = flag
+
+
+def disable() -> None:
+    enable(False)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def latency_summary() -> Dict[str, Dict[str, float]]:
+    """Return count, mean, min, p50/p95/p99, and max in nanoseconds per span name."""
+
+    with _histograms_lock:
+        return {name: histogram.summary() for name, histogram in sorted(_histograms.items())}
+
+
+def reset_histograms() -> None:
+    """Drop every recorded sample."""
+
+    with _histograms_lock:
+        _histograms.clear()
+
+
+__all__ = [
+    "Histogram",
+    "Trace",
+    "capture",
+    "disable",
+    "enable",
+    "is_enabled",
+    "latency_summary",
+    "record",
+    "reset_histograms",
+    "span",
+    "timed",
+]
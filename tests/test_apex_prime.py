@@ -1,10 +1,17 @@
+import importlib
 import json
 from pathlib import Path
 
 import pytest
 
-from packages.apex_prime.judge import judge, seal_if_lawful
-from platform.psi.psi_score import Metrics, SABARPause, get_floors
+from packages.apex_prime.judge import (
+    EvaluationContext,
+    Verdict,
+    evaluate,
+    judge,
+    seal_if_lawful,
+)
+from platform.psi.psi_score import Metrics, SABARPause, floors_version, get_floors
 
 
 def test_judge_allows_metrics_above_floors():
@@ -42,3 +49,78 @@ def test_seal_if_lawful_raises_on_failure(tmp_path, monkeypatch):
 
     with pytest.raises(SABARPause):
         seal_if_lawful("apex-prime", metrics)
+
+
+def test_evaluate_returns_memoised_verdict_with_floor_mask():
+    metrics = Metrics(truth=0.90, peace2=1.08, kappa_r=1.02, deltaS=1.2, rasa=0.95, amanah=1.0)
+    verdict = evaluate(metrics)
+    assert isinstance(verdict, Verdict)
+    assert verdict is evaluate(metrics)
+    assert verdict.floor_mask["truth"] is False
+    assert verdict.floor_mask["peace2"] is True
+    assert "tri_witness" not in verdict.floor_mask
+    assert verdict.allowed is False
+    assert judge(metrics, verdict=verdict) == judge(metrics)
+
+
+def test_seal_if_lawful_reuses_verdict(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "ledger.jsonl"))
+    metrics = Metrics(truth=0.996, peace2=1.07, kappa_r=1.01, deltaS=1.1, rasa=0.95, amanah=1.0)
+    verdict = evaluate(metrics)
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("floors re-checked")
+
+    judge_module = importlib.import_module("packages.apex_prime.judge")
+    monkeypatch.setattr(judge_module, "floor_checks", _fail)
+    assert seal_if_lawful("apex-prime", metrics, note="reuse", verdict=verdict)
+
+
+def test_seal_if_lawful_reevaluates_verdict_after_floors_change(tmp_path, monkeypatch):
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    metrics = Metrics(truth=0.996, peace2=1.07, kappa_r=1.01, deltaS=1.1, rasa=0.95, amanah=1.0)
+    verdict = evaluate(metrics)
+    assert verdict.allowed
+
+    judge_module = importlib.import_module("packages.apex_prime.judge")
+    floors = get_floors()
+    monkeypatch.setattr(
+        judge_module, "get_floors", lambda: {**floors, "psi_min": verdict.psi + 0.01}
+    )
+    with pytest.raises(SABARPause) as excinfo:
+        seal_if_lawful("apex-prime", metrics, note="stale", verdict=verdict)
+    assert excinfo.value.code == "psi_below_floor"
+    assert not ledger_path.exists()
+
+
+def test_evaluation_context_computes_verdict_once_per_metrics(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "ledger.jsonl"))
+    judge_module = importlib.import_module("packages.apex_prime.judge")
+    judge_module._memo.clear()
+    calls = []
+    real_checks = judge_module.floor_checks
+    monkeypatch.setattr(
+        judge_module, "floor_checks", lambda *args: calls.append(args) or real_checks(*args)
+    )
+
+    context = EvaluationContext()
+    assert context.floors_version == floors_version()
+    assert EvaluationContext({}).floors == {}
+    with pytest.raises(ValueError):
+        context.verdict
+
+    metrics = Metrics(truth=0.997, peace2=1.07, kappa_r=1.01, deltaS=1.1, rasa=0.95, amanah=1.0)
+    verdict = context.bind(metrics).verdict
+    assert context.bind(Metrics(**vars(metrics))).verdict is verdict
+    assert judge(metrics, context=context) == verdict.as_decision()
+    assert seal_if_lawful("apex-prime", metrics, note="context", context=context)
+    assert len(calls) == 1
+
+    cooled = Metrics(truth=0.997, peace2=1.1, kappa_r=1.01, deltaS=1.1, rasa=0.95, amanah=1.0)
+    assert context.bind(cooled).verdict.metrics == cooled
+    assert len(calls) == 2
+
+    strict = EvaluationContext({**get_floors(), "psi_min": 1.9}, metrics)
+    assert strict.floors_version != context.floors_version
+    assert strict.verdict.allowed is False
@@ -1,10 +1,12 @@
+import asyncio
 import json
 
 import pytest
 
-from packages.arif_agi.agent import AGIResponse, respond
+from packages.arif_agi.agent import AGIResponse, DraftChunk, arespond, respond, respond_stream
 from packages.arif_agi.metrics import evaluate_metrics
 from packages.arif_agi.planner import plan_and_reason
+from platform.concurrency import singleflight_stats
 from platform.psi.psi_score import Metrics, SABARPause, get_floors
 
 
@@ -47,6 +49,27 @@ def test_respond_seals_and_logs(monkeypatch, tmp_path):
     assert pytest.approx(record["metrics"]["psi"], rel=1e-6) == outcome.psi
 
 
+def test_respond_stream_yields_chunks_before_seal(monkeypatch, tmp_path):
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    stream = respond_stream("Offer grounded guidance")
+
+    first = next(stream)
+    assert isinstance(first, DraftChunk)
+    assert first.text.startswith("Task:")
+    assert not ledger_path.exists()
+
+    items = [first, *stream]
+    chunks = [item for item in items if isinstance(item, DraftChunk)]
+    outcome = items[-1]
+    assert isinstance(outcome, AGIResponse)
+    assert len(chunks) == len(items) - 1
+    assert "".join(chunk.text for chunk in chunks) == outcome.draft
+    assert chunks[-1].peace2_hint >= get_floors()["peace2"]
+    assert outcome.seal_id
+    assert len(ledger_path.read_text(encoding="utf-8").strip().splitlines()) == 1
+
+
 def test_respond_raises_when_metrics_fail(monkeypatch, tmp_path):
     ledger_path = tmp_path / "ledger.jsonl"
     monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
@@ -72,3 +95,25 @@ def test_respond_raises_when_metrics_fail(monkeypatch, tmp_path):
         arif_agi_pkg.respond("Plan harm")
 
     assert not ledger_path.exists()
+
+
+def test_arespond_coalesces_concurrent_identical_tasks(monkeypatch, tmp_path):
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    before = singleflight_stats()["arif_agi.respond"]
+
+    async def main():
+        return await asyncio.gather(
+            *(arespond("Share a calm summary", coalesce=True) for _ in range(4)),
+            arespond("Share a calm plan", coalesce=True),
+        )
+
+    *same, other = asyncio.run(main())
+    assert all(result is same[0] for result in same)
+    assert other.plan_id != same[0].plan_id
+    after = singleflight_stats()["arif_agi.respond"]
+    assert after["executions"] - before["executions"] == 2
+    assert after["coalesced"] - before["coalesced"] == 3
+    assert after["in_flight"] == 0
+    assert len(ledger_path.read_text(encoding="utf-8").splitlines()) == 2
+    assert respond("Share a calm summary", coalesce=True) is not same[0]
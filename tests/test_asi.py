@@ -1,6 +1,15 @@
+import io
 import math
 
-from packages.arif_asi.asi import assess_tone, compute_conductance, tune
+from packages.arif_asi.analysis import (
+    analysis_cache_info,
+    analyze,
+    clear_analysis_cache,
+    resolve,
+)
+from packages.arif_asi.asi import ToneAccumulator, assess_tone, compute_conductance, tune
+from packages.arif_asi.lexicon import Lexicon, get_lexicon, load_lexicon, set_lexicon
+from packages.arif_asi.sketch import ConductanceIndex, sketch, sketch_conductance
 from platform.psi.psi_score import get_floors
 
 
@@ -27,3 +36,123 @@ def test_tune_increases_peace_without_breaking_truth():
     assert tuned["peace2_hint"] >= 1.0
     assert "Truth:" in tuned["text"]
     assert tuned["peace2_hint"] >= baseline["peace2_hint"]
+
+
+def test_tune_rewrites_in_one_pass_with_consistent_tone():
+    harsh = "Angry words, an attack's edge, harmony kept. " * 200
+    tuned = tune(harsh, target_peace2=1.05)
+    assert "angry" not in tuned["text"].lower()
+    assert "reflect's edge" in tuned["text"]
+    assert "harmony" in tuned["text"]
+    rescored = assess_tone(tuned["text"])
+    assert tuned["peace2_hint"] == rescored["peace2_hint"]
+    assert tuned["negative_hits"] == rescored["negative_hits"] == 0
+
+
+def test_tone_accumulator_matches_whole_text_across_chunks():
+    text = "We stay calm and kind; no angry shouting, only care and respect. " * 50
+    accumulator = ToneAccumulator()
+    for start in range(0, len(text), 7):
+        accumulator.feed(text[start:start + 7])
+    expected = assess_tone(text)
+    assert accumulator.tone() == expected
+    assert accumulator.rasa == expected["rasa"]
+
+    streamed = ToneAccumulator().feed_stream(io.StringIO(text), chunk_size=13)
+    assert streamed.peace2_hint == expected["peace2_hint"]
+
+
+def test_analyze_caches_by_content_hash():
+    clear_analysis_cache()
+    draft = "We respond with calm care, but the angry tone lingers."
+    first = analyze(draft)
+    second = analyze("".join(list(draft)))
+    assert first is second
+    assert analysis_cache_info()["hits"] == 1
+    assert first.positive_hits == 2
+    assert first.negative_hits == 1
+    assert first.has("calm") and not first.has("harm")
+
+
+def test_assess_tone_accepts_shared_analysis():
+    draft = "Support and respect together."
+    analysis = analyze(draft)
+    assert assess_tone(draft, analysis=analysis) == assess_tone(draft)
+    assert compute_conductance("Offer support", draft, analysis_b=analysis) == compute_conductance(
+        "Offer support", draft
+    )
+    other = analyze("This is angry and harsh.")
+    assert resolve(draft, analysis) is analysis
+    assert resolve(draft, other) is analysis
+    assert assess_tone(draft, analysis=other) == assess_tone(draft)
+
+
+def test_lexicon_scan_respects_word_and_substring_modes():
+    lexicon = Lexicon(
+        {"negative": ["harm", "shout at"], "harm": ["harm"]},
+        {"negative": "word", "harm": "substring"},
+    )
+    counts = lexicon.scan("Harmony is no harm; never SHOUT at people, harm's way.")
+    assert counts["negative"] == 2
+    assert counts["harm"] == 3
+    glued = {
+        (start, category, bounded)
+        for start, _end, category, _term, bounded in lexicon.iter_matches("harmony")
+    }
+    assert glued == {(0, "negative", True), (0, "harm", False)}
+
+
+def test_loaded_lexicon_drives_tone_scoring(tmp_path):
+    (tmp_path / "positive.txt").write_text(
+        "# custom phrases\nwarm welcome\n" + "\n".join(f"term{i}" for i in range(20000)),
+        encoding="utf-8",
+    )
+    lexicon = load_lexicon(tmp_path)
+    assert "warm welcome" in lexicon.terms("positive")
+    assert lexicon.terms("negative") == get_lexicon().terms("negative")
+
+    draft = "A warm welcome for everyone."
+    baseline = assess_tone(draft)
+    try:
+        set_lexicon(lexicon)
+        tuned = assess_tone(draft)
+        assert analyze(draft).lexicon_version == lexicon.version
+    finally:
+        set_lexicon(None)
+    assert baseline["positive_hits"] == 0
+    assert tuned["positive_hits"] == 1
+    assert tuned["peace2_hint"] > baseline["peace2_hint"]
+
+
+def _corpus_text(seed: int, words: int) -> str:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return " ".join(
+        letters[(seed * 7 + index * 13) % 26]
+        + letters[(seed + index * index) % 26]
+        + letters[index % 26]
+        + "x"
+        for index in range(words)
+    )
+
+
+def test_sketch_conductance_within_error_of_exact():
+    reference = (
+        "We offer calm care and respect while we document each step. " + _corpus_text(1, 400)
+    )
+    draft = reference + " " + _corpus_text(2, 60)
+    exact = compute_conductance(reference, draft)
+    estimate = sketch_conductance(reference, draft, error=0.05)
+    assert abs(exact - estimate) <= 0.05
+    assert sketch(reference, error=0.05) is sketch(reference, error=0.05)
+
+
+def test_conductance_index_returns_near_duplicates_only():
+    index = ConductanceIndex(error=0.1, threshold=0.5)
+    reference = "Support together with calm respect. " + _corpus_text(3, 300)
+    index.add("near", reference + " with care")
+    index.add("far", "Angry threats and toxic shouting dominate the exchange today.")
+    results = index.query(reference)
+    assert [key for key, _kappa, _overlap in results] == ["near"]
+    key, kappa, overlap = results[0]
+    assert overlap >= 0.8
+    assert 0.0 <= kappa <= 1.5
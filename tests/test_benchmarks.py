@@ -0,0 +1,40 @@
+from benchmarks import compare, run_suite
+from benchmarks.suite import populate_ledger, synthetic_draft
+
+
+def test_smoke_suite_reports_latency_and_scaling(tmp_path):
+    baseline = run_suite("smoke", only="ledger/write_entry", workdir=tmp_path)
+    results = baseline["results"]
+    assert set(results) == {"ledger/write_entry[entries=100]", "ledger/write_entry[entries=1000]"}
+    small = results["ledger/write_entry[entries=100]"]
+    large = results["ledger/write_entry[entries=1000]"]
+    assert small["iterations"] >= 3
+    assert small["p50_ns"] <= small["p99_ns"] <= small["max_ns"]
+    assert "scaling" not in small
+    assert large["scaling"] > 0
+
+
+def test_compare_flags_regressions_and_scaling_cliffs():
+    def baseline(p50, scaling=None):
+        result = {"p50_ns": p50}
+        if scaling is not None:
+            result["scaling"] = scaling
+        return result
+
+    before = {"results": {"a": baseline(100), "b": baseline(100, 0.1), "c": baseline(100)}}
+    after = {"results": {"a": baseline(140), "b": baseline(100, 1.0), "c": baseline(50)}}
+    before["results"]["gone"] = after["results"]["new"] = baseline(1)
+    statuses = {row["key"]: row["status"] for row in compare(before, after, threshold=0.25)}
+    assert statuses == {
+        "a": "regression",
+        "b": "regression",
+        "c": "improvement",
+        "gone": "missing",
+        "new": "new",
+    }
+
+
+def test_fixtures_have_requested_sizes(tmp_path):
+    ledger = populate_ledger(tmp_path / "ledger.jsonl", 250)
+    assert len(ledger.read_text(encoding="utf-8").splitlines()) == 250
+    assert len(synthetic_draft(4096).encode("utf-8")) == 4096
@@ -1,3 +1,6 @@
+import importlib
+
+from packages.compass_888 import Condition, Floor, Rule, RoutingTable, route_many
 from packages.compass_888.compass import noise_score, route
 from platform.psi.psi_score import Metrics, get_floors
 
@@ -26,3 +29,53 @@ def test_noise_score_flags_aggressive_text():
     noisy = noise_score("This is angry!! and harsh!!")
     assert 0.0 <= noisy <= 1.0
     assert noisy > 0.5
+
+
+def test_route_many_matches_route():
+    floors = get_floors()
+    requests = [
+        (
+            "Explain",
+            "Draft is calm and clear",
+            Metrics(
+                truth=floors["truth"] - 0.05,
+                peace2=1.1,
+                kappa_r=1.0,
+                deltaS=0.1,
+                rasa=0.9,
+                amanah=0.95,
+            ),
+        ),
+        (
+            "Assist kindly",
+            "This draft feels harsh and angry",
+            Metrics(truth=1.0, peace2=0.7, kappa_r=0.96, deltaS=0.1, rasa=0.9, amanah=0.95),
+        ),
+        (
+            "Assist kindly",
+            "We assist kindly with care",
+            {"truth": 1.0, "peace2": 1.1, "kappa_r": floors["kappa_r"], "deltaS": 0.5},
+        ),
+        ("Assist kindly", "angry!! fight!!", {"truth": 1.0}),
+    ]
+    assert route_many(requests) == [route(*request) for request in requests]
+
+
+def test_route_skips_conductance_outside_kappa_margin(monkeypatch):
+    compass = importlib.import_module("packages.compass_888.compass")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("conductance should not be computed")
+
+    monkeypatch.setattr(compass, "compute_conductance", fail)
+    metrics = Metrics(truth=1.0, peace2=1.12, kappa_r=1.1, deltaS=1.3, rasa=0.95, amanah=1.02)
+    assert route("Assist kindly", "We assist kindly with care and respect", metrics) == "apex-prime"
+
+
+def test_route_accepts_custom_table():
+    table = RoutingTable(
+        rules=(Rule("arif-agi", (Condition("truth", "<", Floor("truth", 0.99, offset=0.5)),)),),
+        default="apex-prime",
+    )
+    metrics = Metrics(truth=1.0, peace2=1.12, kappa_r=1.1, deltaS=1.3, rasa=0.95, amanah=1.02)
+    assert route("Assist", "Calm care", metrics, table=table) == "arif-agi"
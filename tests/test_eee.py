@@ -1,11 +1,27 @@
+import json
+import threading
+import uuid
 from datetime import datetime, timezone
 
 import pytest
 
 from dataclasses import asdict
 
-from packages.eee_777.eee import limiter, phoenix_schedule, sabar_orchestrate
-from platform.psi.psi_score import Metrics, SABARPause, get_floors
+from packages.eee_777.eee import (
+    clear_cooling_cache,
+    configure_cooling_cache,
+    cooling_cache_info,
+    limiter,
+    limiter_decision,
+    phoenix_schedule,
+    sabar_orchestrate,
+)
+from packages.apex_prime.judge import EvaluationContext
+from packages.eee_777.phoenix import PHOENIX_WINDOW_SECONDS, PhoenixScheduler
+from packages.eee_777.ratelimit import SharedRateLimiter
+from packages.eee_777.recent import clear_recent_psi, recent_psi
+from platform.cooling_ledger.sdk import write_entry
+from platform.psi.psi_score import Metrics, Refusal, SABARPause, get_floors
 
 
 def good_metrics() -> Metrics:
@@ -26,6 +42,18 @@ def test_limiter_delays_near_threshold(tmp_path, monkeypatch):
     assert decision == "delay"
 
 
+def test_limiter_binds_metrics_to_the_context(tmp_path, monkeypatch):
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    ledger_path.write_text("", encoding="utf-8")
+    bad = Metrics(truth=0.995, peace2=0.6, kappa_r=0.6, deltaS=1.2, rasa=0.95, amanah=1.0)
+    context = EvaluationContext()
+    context.bind(good_metrics())
+    assert limiter("integration", bad) == "block"
+    assert limiter("integration", bad, context=context) == "block"
+    assert context.metrics == bad
+
+
 def test_sabar_orchestrate_cools_text(tmp_path, monkeypatch):
     monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "ledger.jsonl"))
     metrics = good_metrics()
@@ -41,8 +69,194 @@ def test_sabar_orchestrate_raises_on_low_truth():
         sabar_orchestrate("Calm text", metrics)
 
 
+def test_sabar_orchestrate_returns_refusal_when_not_raising():
+    metrics = Metrics(truth=0.90, peace2=1.1, kappa_r=0.96, deltaS=0.1, rasa=0.9, amanah=0.95)
+    outcome = sabar_orchestrate("Calm text", metrics, raise_on_refusal=False)
+    assert isinstance(outcome, Refusal)
+    assert outcome.code == "truth_floor"
+
+
 def test_phoenix_schedule_72_hours():
     start = datetime(2024, 1, 1, tzinfo=timezone.utc)
     result = phoenix_schedule(start)
     expected = datetime(2024, 1, 4, tzinfo=timezone.utc).isoformat()
     assert result == expected
+
+
+def test_recent_psi_tracks_writes_and_cold_starts(tmp_path, monkeypatch):
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    lines = [{"agent": "integration", "metrics": {"psi": 0.955}}] * 2
+    lines += [{"agent": "arif-agi", "metrics": {"psi": 1.2}}] * 500
+    ledger_path.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+
+    clear_recent_psi()
+    assert recent_psi("integration", ledger_path) == (0.955, 0.955)
+    assert limiter("integration", {**asdict(good_metrics()), "psi": 1.05}) == "delay"
+
+    write_entry("integration", {"psi": 1.1})
+    assert recent_psi("integration", ledger_path) == (0.955, 0.955, 1.1)
+    assert recent_psi("arif-agi", ledger_path) == (1.2,) * 5
+
+
+@pytest.fixture
+def rate_limiter():
+    name = f"arifos-test-{uuid.uuid4().hex[:12]}"
+    limiter_instance = SharedRateLimiter(
+        name, rate=2.0, burst=2, window=10.0, window_limit=3, max_delay=1.0
+    )
+    yield limiter_instance
+    limiter_instance.unlink()
+    limiter_instance.close()
+
+
+def test_shared_rate_limiter_token_bucket_and_window(rate_limiter):
+    assert rate_limiter.acquire("a", now=100.0).allowed
+    assert rate_limiter.acquire("a", now=100.0).allowed
+    delayed = rate_limiter.acquire("a", now=100.0)
+    assert delayed.decision == "delay"
+    assert delayed.retry_after == pytest.approx(0.5)
+    assert rate_limiter.acquire("b", now=100.0).allowed
+
+    assert rate_limiter.acquire("a", now=100.5).allowed
+    blocked = rate_limiter.acquire("a", now=101.5)
+    assert blocked.decision == "block"
+    assert blocked.retry_after > 1.0
+
+
+def test_shared_rate_limiter_state_is_shared_between_instances(rate_limiter):
+    other = SharedRateLimiter(rate_limiter.name, rate=100.0, burst=100)
+    try:
+        assert other.burst == rate_limiter.burst
+        assert other.acquire("a", now=50.0).allowed
+        assert rate_limiter.acquire("a", now=50.0).allowed
+        assert other.acquire("a", now=50.0).decision == "delay"
+    finally:
+        other.close()
+
+
+def test_limiter_decision_applies_rate_limit(tmp_path, monkeypatch, rate_limiter):
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "ledger.jsonl"))
+    metrics = {**asdict(good_metrics()), "psi": 1.05}
+    decisions = [
+        limiter_decision("integration", metrics, rate_limiter=rate_limiter) for _ in range(3)
+    ]
+    assert [decision.decision for decision in decisions] == ["allow", "allow", "delay"]
+    assert decisions[-1].retry_after > 0.0
+
+
+def test_limiter_decision_psi_delay_does_not_charge_rate_limit(
+    tmp_path, monkeypatch, rate_limiter
+):
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    ledger_path.write_text("", encoding="utf-8")
+    near = {**asdict(good_metrics()), "psi": 0.96}
+    delayed = limiter_decision("integration", near, rate_limiter=rate_limiter)
+    assert delayed.decision == "delay"
+    assert delayed.retry_after > 0.0
+
+    # The bucket still holds its full burst of two tokens.
+    metrics = {**asdict(good_metrics()), "psi": 1.05}
+    decisions = [
+        limiter_decision("integration", metrics, rate_limiter=rate_limiter) for _ in range(3)
+    ]
+    assert [decision.decision for decision in decisions] == ["allow", "allow", "delay"]
+
+
+def test_phoenix_scheduler_runs_due_audits_and_survives_restart(tmp_path):
+    journal = tmp_path / "phoenix.jsonl"
+    scheduler = PhoenixScheduler(journal, workers=2, batch_size=2)
+    scheduler.schedule("plan-late", {"deltaS": 1.0, "peace2": 1.1}, due=300.0)
+    scheduler.schedule("plan-bad", {"deltaS": -1.0, "peace2": 0.5}, due=100.0)
+    scheduler.schedule("plan-ok", {"deltaS": 1.0, "peace2": 1.1}, due=50.0)
+    scheduler.schedule("plan-ok", {"deltaS": 1.0, "peace2": 1.1}, due=150.0)
+    assert len(scheduler) == 3
+    assert scheduler.next_due() == 100.0
+    scheduler.close()
+
+    restarted = PhoenixScheduler(journal, workers=2, batch_size=2)
+    results = restarted.run_due(now=200.0)
+    assert [result.plan_id for result in results] == ["plan-bad", "plan-ok"]
+    assert results[0].breaches == ("deltaS", "peace2")
+    assert results[1].passed
+    restarted.close()
+
+    again = PhoenixScheduler(journal)
+    assert len(again) == 1
+    assert again.run_due(now=200.0) == []
+    assert again.next_due() == 300.0
+    again.close()
+
+
+def test_phoenix_scheduler_attaches_to_ledger_writes(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "ledger.jsonl"))
+    scheduler = PhoenixScheduler(tmp_path / "phoenix.jsonl")
+    scheduler.attach()
+    try:
+        write_entry("arif-agi", {"deltaS": 0.5, "peace2": 1.0}, metadata={"plan_id": "plan-1"})
+        assert len(scheduler) == 0
+        write_entry("integration", {"deltaS": 1.0, "peace2": 1.1}, metadata={"plan_id": "plan-1"})
+    finally:
+        scheduler.close()
+    assert len(scheduler) == 1
+    assert scheduler.next_due() > PHOENIX_WINDOW_SECONDS
+    (item,) = scheduler.pop_due(now=float("inf"))
+    assert (item.plan_id, item.deltaS, item.peace2) == ("plan-1", 1.0, 1.1)
+
+
+def _failing_audit(item):
+    raise RuntimeError(f"audit crashed for {item.plan_id}")
+
+
+def test_phoenix_scheduler_retries_failing_audits_with_backoff(tmp_path):
+    journal = tmp_path / "phoenix.jsonl"
+    scheduler = PhoenixScheduler(
+        journal, audit=_failing_audit, workers=1, max_attempts=3, retry_backoff=10.0
+    )
+    scheduler.schedule("plan-bad", {"deltaS": 1.0, "peace2": 1.1}, due=100.0)
+    assert scheduler.run_due(now=200.0) == []
+    assert scheduler.next_due() == 210.0
+    scheduler.close()
+
+    restarted = PhoenixScheduler(
+        journal, audit=_failing_audit, workers=1, max_attempts=3, retry_backoff=10.0
+    )
+    assert restarted.run_due(now=210.0) == []
+    assert restarted.next_due() == 230.0
+    (result,) = restarted.run_due(now=230.0)
+    assert (result.plan_id, result.passed) == ("plan-bad", False)
+    assert result.error == "RuntimeError: audit crashed for plan-bad"
+    assert len(restarted) == 0
+
+    stop = threading.Event()
+    restarted.schedule("plan-worse", {"deltaS": 1.0, "peace2": 1.1}, due=0.0)
+    restarted.max_attempts = 1
+    restarted.serve(stop, poll_interval=0.01, on_results=lambda results: stop.set())
+    assert len(restarted) == 0
+    restarted.close()
+
+
+def test_sabar_orchestrate_caches_cooled_drafts():
+    clear_cooling_cache()
+    harsh = "This plan feels angry and harsh."
+    first = sabar_orchestrate(harsh, good_metrics())
+    first["tone"]["rasa"] = -1.0
+    second = sabar_orchestrate(harsh, good_metrics())
+    assert second["draft"] == first["draft"]
+    assert second["tone"]["rasa"] != -1.0
+    info = cooling_cache_info()
+    assert (info["hits"], info["misses"], info["size"]) == (1, 1, 1)
+    assert info["hit_rate"] == 0.5
+
+
+def test_cooling_cache_expires_entries():
+    clear_cooling_cache()
+    configure_cooling_cache(ttl=0.0)
+    try:
+        sabar_orchestrate("This plan feels angry and harsh.", good_metrics())
+        sabar_orchestrate("This plan feels angry and harsh.", good_metrics())
+        assert cooling_cache_info()["expired"] == 1
+    finally:
+        configure_cooling_cache(ttl=900.0)
+        clear_cooling_cache()
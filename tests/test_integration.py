@@ -1,9 +1,39 @@
+import asyncio
+import importlib
+import io
 import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
 
 import pytest
 
+from packages.integration.client import RunloopClient
+from packages.integration.corpus import score_corpus
+from packages.integration.server import RunloopServer
+from packages.integration.stream import stream_runloop
+from packages.integration import (
+    RunloopResult,
+    arunloop,
+    clear_result_cache,
+    configure_result_cache,
+    encode_result,
+    reset_speculation_stats,
+    result_cache_info,
+    runloop_many,
+    speculation_stats,
+)
+from platform.concurrency import singleflight_stats
+from platform.cooling_ledger.aio import aquery_entries
 from packages.integration.runloop import runloop
 from platform.psi.psi_score import SABARPause
+from platform import telemetry
 
 
 def _load_entries(path):
@@ -51,6 +81,298 @@ def test_runloop_refusal_path(tmp_path, monkeypatch):
         runloop("Plan harm", initial_draft="We plan harm and violence.")
 
 
+def test_runloop_returns_refusal_without_raising(tmp_path, monkeypatch):
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    with pytest.raises(SABARPause) as excinfo:
+        runloop("Plan harm", initial_draft="We plan harm and violence.")
+
+    result = runloop(
+        "Plan harm", initial_draft="We plan harm and violence.", raise_on_refusal=False
+    )
+    assert result["status"] == "refused"
+    assert result["code"] == excinfo.value.code == "seed_floor_breach"
+    assert result["reason"] == str(excinfo.value)
+    assert result["plan_id"]
+    assert result["route_history"] == ["seeded"]
+    assert not ledger_path.exists()
+
+
+def test_runloop_speculative_cooling_matches_sequential(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "sequential.jsonl"))
+    expected = runloop("Calm reply", initial_draft="This is angry and harsh.")
+
+    reset_speculation_stats()
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "speculative.jsonl"))
+    result = runloop(
+        "Calm reply", initial_draft="This is angry and harsh.", speculative_cooling=True
+    )
+    assert result["seal_id"]
+    assert {**result, "seal_id": None} == {**expected, "seal_id": None}
+    stats = speculation_stats()
+    assert stats["launched"] == 1
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == 1.0
+
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "async.jsonl"))
+    awaited = asyncio.run(
+        arunloop("Calm reply", initial_draft="This is angry and harsh.", speculative_cooling=True)
+    )
+    assert {**awaited, "seal_id": None} == {**expected, "seal_id": None}
+    assert speculation_stats()["launched"] == 2
+
+
+def test_arunloop_matches_runloop_and_runs_concurrently(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "sync.jsonl"))
+    expected = runloop("Calm reply", initial_draft="This is angry and harsh.")
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            single = await arunloop(
+                "Calm reply", initial_draft="This is angry and harsh.", executor=executor
+            )
+            many = await asyncio.gather(
+                *(arunloop(f"Provide compassionate response {index}") for index in range(20))
+            )
+        entries = await aquery_entries(agent="integration")
+        return single, many, entries
+
+    ledger_path = tmp_path / "async.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    single, many, entries = asyncio.run(main())
+    assert {**single, "seal_id": None} == {**expected, "seal_id": None}
+    assert all(result["status"] == "sealed" for result in many)
+    assert len({result["plan_id"] for result in many}) == 20
+    assert len(entries) == 21
+    assert len(_load_entries(ledger_path)) == 41
+
+
+def _stage_count(summary, stage):
+    return summary.get(stage, {}).get("count", 0)
+
+
+def test_runloop_trace_attaches_spans_and_feeds_histograms(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "ledger.jsonl"))
+    stages = ("runloop", "runloop.seed", "runloop.route", "runloop.seal", "ledger.write_entry")
+    before = telemetry.latency_summary()
+    plain = runloop("Calm reply", initial_draft="This is angry and harsh.")
+    assert "spans" not in plain
+
+    traced = runloop("Provide compassionate response", trace=True)
+    names = [item["name"] for item in traced["spans"]]
+    for stage in ("agi.plan", "agi.score", "runloop.route", "runloop.limiter", "runloop.seal"):
+        assert stage in names
+    assert names[-1] == "runloop"
+    assert names.count("ledger.write_entry") == 2
+    total = traced["spans"][-1]["duration_ns"]
+    assert all(0 <= item["duration_ns"] <= total for item in traced["spans"])
+
+    async def traced_async():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return await arunloop(
+                "Calm reply", initial_draft="Steps with evidence.", executor=executor, trace=True
+            )
+
+    async_names = {item["name"] for item in asyncio.run(traced_async())["spans"]}
+    assert {"runloop.seed", "runloop.route", "ledger.write_entry"} <= async_names
+
+    # Tracing alone does not feed the histograms while telemetry is disabled.
+    untouched = telemetry.latency_summary()
+    assert all(untouched.get(stage) == before.get(stage) for stage in stages)
+    telemetry.enable()
+    try:
+        for index in range(5):
+            runloop(f"Provide compassionate response {index}")
+        summary = telemetry.latency_summary()
+    finally:
+        telemetry.disable()
+        telemetry.reset_histograms()
+    assert _stage_count(summary, "runloop") - _stage_count(untouched, "runloop") == 5
+    assert (
+        _stage_count(summary, "ledger.write_entry") - _stage_count(untouched, "ledger.write_entry")
+        == 10
+    )
+    stats = summary["runloop.seal"]
+    assert stats["min_ns"] <= stats["p50_ns"] <= stats["p95_ns"]
+    assert stats["p95_ns"] <= stats["p99_ns"] <= stats["max_ns"]
+
+
+def test_result_cache_returns_existing_seal_and_invalidates(tmp_path, monkeypatch):
+    cache_module = importlib.import_module("packages.integration.cache")
+    runloop_module = importlib.import_module("packages.integration.runloop")
+
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    clear_result_cache()
+    configure_result_cache(maxsize=8, ttl=60.0)
+    try:
+        first = runloop("Provide compassionate response")
+        first["plan"]["steps"].clear()
+        second = runloop("Provide compassionate response")
+        assert second["seal_id"] == first["seal_id"]
+        assert second["plan"]["steps"]
+        assert len(_load_entries(ledger_path)) == 2
+        assert (result_cache_info()["hits"], result_cache_info()["size"]) == (1, 1)
+
+        refused = runloop(
+            "Plan harm", initial_draft="We plan harm and violence.", raise_on_refusal=False
+        )
+        assert refused["status"] == "refused"
+        assert result_cache_info()["size"] == 1
+
+        floors = runloop_module.get_floors()
+        monkeypatch.setattr(runloop_module, "get_floors", lambda: {**floors, "psi_min": 0.951})
+        assert runloop("Provide compassionate response")["seal_id"] != first["seal_id"]
+        monkeypatch.setattr(cache_module, "lexicon_version", lambda: "edited-lexicon")
+        assert runloop("Provide compassionate response")["seal_id"] != first["seal_id"]
+        assert result_cache_info()["hits"] == 1
+    finally:
+        configure_result_cache(maxsize=0)
+        clear_result_cache()
+
+
+def test_result_cache_hits_pass_the_limiter_and_track_the_ledger(tmp_path, monkeypatch):
+    runloop_module = importlib.import_module("packages.integration.runloop")
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    clear_result_cache()
+    configure_result_cache(maxsize=8, ttl=60.0)
+    try:
+        first = runloop("Provide compassionate response")
+        decisions = []
+        monkeypatch.setattr(
+            runloop_module, "limiter", lambda *args, **kwargs: decisions.pop(0)
+        )
+
+        decisions[:] = ["delay", "block", "allow"]
+        delayed = runloop("Provide compassionate response")
+        assert (delayed["status"], delayed["seal_id"]) == ("delay", None)
+        assert delayed["route_history"] == first["route_history"][:-1]
+        with pytest.raises(SABARPause) as blocked:
+            runloop("Provide compassionate response")
+        assert blocked.value.code == "limiter_block"
+        assert runloop("Provide compassionate response")["seal_id"] == first["seal_id"]
+        assert result_cache_info()["hits"] == 3
+        assert len(_load_entries(ledger_path)) == 2
+
+        ledger_path.unlink()
+        ledger_path.write_text("", encoding="utf-8")
+        decisions[:] = ["allow"]
+        fresh = runloop("Provide compassionate response")
+        assert fresh["seal_id"] != first["seal_id"]
+        assert result_cache_info()["stale"] == 1
+        assert len(_load_entries(ledger_path)) == 2
+    finally:
+        configure_result_cache(maxsize=0)
+        clear_result_cache()
+
+
+def test_runloop_coalesces_concurrent_identical_calls(tmp_path, monkeypatch):
+    runloop_module = importlib.import_module("packages.integration.runloop")
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    release = threading.Event()
+    drive = runloop_module.drive
+
+    def gated_drive(steps):
+        release.wait(5)
+        return drive(steps)
+
+    monkeypatch.setattr(runloop_module, "drive", gated_drive)
+    before = singleflight_stats()["integration.runloop"]
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(runloop("Provide compassionate response", coalesce=True))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    while singleflight_stats()["integration.runloop"]["coalesced"] - before["coalesced"] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 4 and all(result is results[0] for result in results)
+    assert results[0]["status"] == "sealed"
+    assert len(_load_entries(ledger_path)) == 2
+    after = singleflight_stats()["integration.runloop"]
+    assert after["executions"] - before["executions"] == 1
+
+    async def main():
+        calls = [
+            arunloop("Calm reply", initial_draft="This is angry and harsh.", coalesce=True)
+            for _ in range(3)
+        ]
+        return await asyncio.gather(*calls)
+
+    cooled = asyncio.run(main())
+    assert all(result is cooled[0] for result in cooled)
+    assert singleflight_stats()["integration.runloop"]["coalesced"] - after["coalesced"] == 2
+
+
+def test_runloop_coalesce_rejects_trace_and_keys_on_resolved_ledger(tmp_path, monkeypatch):
+    agent_module = importlib.import_module("packages.arif_agi.agent")
+    cache_module = importlib.import_module("packages.integration.cache")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", "ledger.jsonl")
+    with pytest.raises(ValueError):
+        runloop("Provide compassionate response", coalesce=True, trace=True)
+    with pytest.raises(ValueError):
+        asyncio.run(arunloop("Provide compassionate response", coalesce=True, trace=True))
+    assert not (tmp_path / "ledger.jsonl").exists()
+
+    relative = (agent_module._flight_key("task", True), cache_module.input_key("task", None, {}))
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "ledger.jsonl"))
+    absolute = (agent_module._flight_key("task", True), cache_module.input_key("task", None, {}))
+    assert relative == absolute
+
+
+def test_runloop_result_encodes_like_asdict(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "ledger.jsonl"))
+    sealed = runloop("Provide compassionate response")
+    expected = {**sealed, "metrics": asdict(sealed["metrics"])}
+    assert json.loads(encode_result(sealed)) == expected
+
+    fields = dict(sealed)
+    result = RunloopResult.trusted(**fields)
+    assert result.to_bytes() == encode_result(sealed)
+    assert json.loads(result.to_json()) == expected
+    assert result == RunloopResult(**fields)
+
+    with pytest.raises(TypeError):
+        RunloopResult.trusted(**{**fields, "extra": 1})
+    with pytest.raises(ValueError):
+        RunloopResult(**{**fields, "status": "bogus"})
+
+    refused = runloop(
+        "Plan harm", initial_draft="We plan harm and violence.", raise_on_refusal=False
+    )
+    assert json.loads(encode_result(refused)) == refused
+
+
+def test_runloop_computes_psi_and_floor_checks_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(tmp_path / "ledger.jsonl"))
+    judge_module = importlib.import_module("packages.apex_prime.judge")
+    agent_module = importlib.import_module("packages.arif_agi.agent")
+    judge_module._memo.clear()
+    calls = []
+    real_psi = judge_module.raw_psi
+    monkeypatch.setattr(
+        judge_module, "raw_psi", lambda metrics: calls.append(metrics) or real_psi(metrics)
+    )
+    monkeypatch.setattr(
+        agent_module, "psi_from", lambda *args, **kwargs: pytest.fail("Ψ recomputed")
+    )
+
+    result = runloop("Provide compassionate response")
+    assert result["status"] == "sealed"
+    assert result["route_history"][0] == "arif-agi"
+    assert len(calls) == 1
+
+
 def test_runloop_delay_then_success(tmp_path, monkeypatch):
     ledger_path = tmp_path / "ledger.jsonl"
     monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
@@ -86,3 +408,165 @@ def test_double_entry_invariant(tmp_path, monkeypatch):
     assert plan_ids[0] == plan_ids[1] == result["plan_id"]
     timestamps = [entry["ts"] for entry in entries]
     assert timestamps == sorted(timestamps)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_runloop_many_preserves_order_and_double_entries(tmp_path, monkeypatch, executor):
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    items = [f"Provide compassionate response {index}" for index in range(6)]
+    items.insert(2, {"task": "Plan harm", "initial_draft": "We plan harm and violence."})
+    items.insert(4, {"initial_draft": "missing task"})
+
+    results = runloop_many(items, workers=3, executor=executor)
+
+    assert [result["status"] for result in results] == (
+        ["sealed", "sealed", "refused", "sealed", "error"] + ["sealed"] * 3
+    )
+    assert results[2]["code"] == "seed_floor_breach"
+    assert results[4]["error_type"] == "KeyError"
+    sealed = [result for result in results if result["status"] == "sealed"]
+    assert all(item.split()[-1] in result["plan"]["task"] for item, result in zip(
+        [item for item in items if isinstance(item, str)], sealed
+    ))
+    entries = _load_entries(ledger_path)
+    assert len(entries) == 2 * len(sealed)
+    for result in sealed:
+        agents = [
+            entry["agent"]
+            for entry in entries
+            if entry["metadata"]["plan_id"] == result["plan_id"]
+        ]
+        assert agents == ["arif-agi", "integration"]
+    timestamps = [entry["ts"] for entry in entries]
+    assert timestamps == sorted(timestamps)
+
+
+class _CrashingStream(io.StringIO):
+    def __init__(self, text, crash_after):
+        super().__init__(text)
+        self.remaining = crash_after
+
+    def __next__(self):
+        if self.remaining == 0:
+            raise RuntimeError("simulated crash")
+        self.remaining -= 1
+        return super().__next__()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_stream_runloop_resumes_from_checkpoint(tmp_path, monkeypatch, workers):
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    records = [
+        {"task": f"Provide compassionate response {index}", "id": index} for index in range(7)
+    ]
+    records[1] = {"task": "Plan harm", "initial_draft": "We plan harm and violence.", "id": 1}
+    lines = [json.dumps(record) for record in records]
+    lines.insert(3, "{not json")
+    text = "\n".join(lines) + "\n"
+    output = tmp_path / "results.jsonl"
+    checkpoint = tmp_path / "checkpoint.json"
+
+    with pytest.raises(RuntimeError, match="simulated crash"):
+        stream_runloop(
+            _CrashingStream(text, crash_after=6),
+            output,
+            checkpoint=checkpoint,
+            checkpoint_every=4,
+            workers=workers,
+            max_in_flight=2,
+        )
+    saved = json.loads(checkpoint.read_text(encoding="utf-8"))
+    assert saved["lines"] == 4
+    assert len(_load_entries(output)) > 4
+
+    stats = stream_runloop(
+        io.StringIO(text), output, checkpoint=checkpoint, checkpoint_every=4, workers=workers
+    )
+    assert stats["skipped"] == saved["lines"]
+    results = _load_entries(output)
+    assert [result["line"] for result in results] == list(range(1, 9))
+    assert [result["status"] for result in results] == (
+        ["sealed", "refused", "sealed", "error"] + ["sealed"] * 4
+    )
+    assert results[3]["error_type"] == "JSONDecodeError"
+    assert [result["id"] for result in results if result["status"] != "error"] == list(range(7))
+    assert results[0]["metrics"]["truth"] >= 0.99
+    assert len(_load_entries(ledger_path)) == 2 * 6
+
+    again = stream_runloop(io.StringIO(text), output, checkpoint=checkpoint)
+    assert again == {"processed": 0, "skipped": 8}
+    assert len(_load_entries(output)) == 8
+
+
+def test_score_corpus_streams_results_in_order(tmp_path):
+    corpus = tmp_path / "drafts.jsonl"
+    drafts = [
+        {"id": f"d{index}", "task": "Calm reply", "draft": text}
+        for index, text in enumerate(
+            ["We respond with calm care.", "This is angry and harsh.", "Steps with evidence."] * 4
+        )
+    ]
+    corpus.write_text("\n".join(json.dumps(item) for item in drafts) + "\n", encoding="utf-8")
+
+    serial = list(score_corpus(corpus, workers=1, batch_size=5))
+    pooled = list(score_corpus(corpus, workers=2, batch_size=5, max_in_flight=2))
+    assert [item["id"] for item in serial] == [item["id"] for item in drafts]
+    assert pooled == serial
+    assert serial[0]["tone"]["peace2_hint"] > serial[1]["tone"]["peace2_hint"]
+    assert set(serial[2]["metrics"]) >= {"truth", "peace2", "kappa_r", "deltaS"}
+
+
+def test_runloop_server_spreads_connections_across_workers(tmp_path):
+    # The test process already runs thread pools, so fork the server from a fresh one.
+    ledger_path = tmp_path / "ledger.jsonl"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "packages.integration.server", "--listen", "127.0.0.1:0",
+         "--workers", "2"],
+        cwd=Path(__file__).resolve().parents[1],
+        env={**os.environ, "ARIFOS_LEDGER_PATH": str(ledger_path)},
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    tasks = [f"Provide compassionate response {index}" for index in range(6)]
+    clients = []
+    try:
+        address = server.stderr.readline().rsplit(" ", 1)[-1].strip()
+        pids = set()
+        while len(pids) < 2 and len(clients) < 64:
+            clients.append(RunloopClient(address))
+            pids.add(clients[-1].ping()["pid"])
+        client = clients[0]
+        sealed = client.runloop("Provide compassionate response")
+        refused = client.runloop("Plan harm", initial_draft="We plan harm and violence.")
+        unknown = client.request({"op": "reboot"})
+        many = client.runloop_many(tasks, window=4)
+    finally:
+        for client in clients:
+            client.close()
+        server.send_signal(signal.SIGTERM)
+        _, errors = server.communicate(timeout=30)
+
+    assert len(pids) == 2 and server.pid not in pids
+    assert sealed["status"] == "sealed" and sealed["seal_id"]
+    assert sealed["metrics"]["truth"] >= 0.99
+    assert refused["status"] == "refused"
+    assert unknown["status"] == "error"
+    assert [result["plan"]["task"] for result in many] == tasks
+    assert all(result["status"] == "sealed" for result in many)
+    entries = _load_entries(ledger_path)
+    assert len(entries) == 2 * 7
+    assert json.loads(errors.strip().splitlines()[-1])["entries"] == len(entries)
+
+
+def test_runloop_server_refuses_to_fork_a_threaded_process():
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        with pytest.raises(RuntimeError):
+            RunloopServer("127.0.0.1:0", workers=1).start()
+    finally:
+        stop.set()
+        thread.join()
@@ -2,7 +2,16 @@ import json
 
 import pytest
 
-from platform.cooling_ledger.sdk import seal, write_entry
+from platform.cooling_ledger.sdk import (
+    _prepare_entry,
+    add_write_listener,
+    append_entries,
+    remove_write_listener,
+    seal,
+    set_entry_appender,
+    write_entry,
+)
+from platform.cooling_ledger.writer import LedgerWriter, RemoteAppender
 
 
 def test_write_entry_creates_append_only_jsonl(tmp_path, monkeypatch):
@@ -102,3 +111,56 @@ def test_seal_returns_base58_identifier():
     assert isinstance(seal_id_one, str)
     assert len(seal_id_one) >= 10
     assert seal_id_one != seal_id_two
+
+
+def test_append_entries_group_commits_in_order(tmp_path):
+    ledger_path = tmp_path / "ledger.jsonl"
+    metrics = {
+        "truth": 1.0, "peace2": 1.1, "kappa_r": 1.0, "deltaS": 0.1, "rasa": 0.95, "amanah": 0.96
+    }
+    first = _prepare_entry("integration", metrics, "first", "key-1", None)
+    retry = _prepare_entry("integration", metrics, "retry", "key-1", None)
+    planned = _prepare_entry("integration", metrics, "plan", None, {"plan_id": "plan-1"})
+    other = _prepare_entry("arif-agi", metrics, "other", None, None)
+
+    outcomes = append_entries(ledger_path, [first, retry, planned, planned, other], fsync=True)
+
+    lines = ledger_path.read_bytes().splitlines(keepends=True)
+    assert [json.loads(line)["note"] for line in lines] == ["first", "plan", "other"]
+    assert outcomes[0][0] == first[1] and outcomes[0][2:] == (0, len(lines[0]))
+    assert outcomes[1] == (first[1], None, 0, 0)
+    assert outcomes[2][1]["note"] == "plan"
+    assert isinstance(outcomes[3], ValueError)
+    assert outcomes[4][2] == len(lines[0]) + len(lines[1])
+
+
+def test_ledger_writer_performs_remote_appends(tmp_path, monkeypatch):
+    ledger_path = tmp_path / "ledger.jsonl"
+    monkeypatch.setenv("ARIFOS_LEDGER_PATH", str(ledger_path))
+    metrics = {
+        "truth": 1.0, "peace2": 1.1, "kappa_r": 1.0, "deltaS": 0.1, "rasa": 0.95, "amanah": 0.96
+    }
+    seen = []
+
+    def listener(path, record, start, end):
+        seen.append((record["note"], start, end))
+
+    writer = LedgerWriter(1).start()
+    previous = set_entry_appender(RemoteAppender(writer.connections[0]))
+    add_write_listener(listener)
+    try:
+        first = write_entry("integration", metrics, "first", idempotency_key="k")
+        assert write_entry("integration", metrics, "retry", idempotency_key="k") == first
+        write_entry("integration", metrics, "plan", metadata={"plan_id": "p"})
+        with pytest.raises(ValueError):
+            write_entry("integration", metrics, "plan", metadata={"plan_id": "p"})
+    finally:
+        remove_write_listener(listener)
+        set_entry_appender(previous)
+        stats = writer.stop()
+
+    lines = ledger_path.read_bytes().splitlines(keepends=True)
+    assert [json.loads(line)["note"] for line in lines] == ["first", "plan"]
+    size = ledger_path.stat().st_size
+    assert seen == [("first", 0, len(lines[0])), ("plan", len(lines[0]), size)]
+    assert stats["entries"] == 4 and stats["batches"] == 4
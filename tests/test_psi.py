@@ -1,6 +1,13 @@
 import pytest
 
-from platform.psi.psi_score import Metrics, SABARPause, get_floors, meets_floors, psi_from
+from platform.psi.psi_score import (
+    Metrics,
+    Refusal,
+    SABARPause,
+    get_floors,
+    meets_floors,
+    psi_from,
+)
 
 
 def test_psi_happy_path():
@@ -56,3 +63,14 @@ def test_low_psi_triggers_pause_even_when_floors_met():
     assert meets_floors(metrics, floors)
     with pytest.raises(SABARPause):
         psi_from(metrics, floors)
+
+
+def test_psi_from_returns_refusal_without_raising():
+    metrics = Metrics(truth=0.90, peace2=1.02, kappa_r=0.97, deltaS=0.30, rasa=0.92, amanah=0.95)
+    outcome = psi_from(metrics, raise_on_refusal=False)
+    assert isinstance(outcome, Refusal)
+    assert outcome.code == "floors_breached"
+    assert outcome.to_dict()["status"] == "refused"
+    with pytest.raises(SABARPause) as excinfo:
+        psi_from(metrics)
+    assert excinfo.value.code == outcome.code